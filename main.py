@@ -3,14 +3,20 @@
 import typer
 
 from src.command.clear import command as clear_command
+from src.command.compact import command as compact_command
 from src.command.list import command as list_command
 from src.command.run import command as run_command
+from src.command.search import command as search_command
 from src.command.up import command as up_command
 
 app = typer.Typer()
 
 app.add_typer(run_command.app)
 
+app.add_typer(search_command.app)
+
+app.add_typer(compact_command.app)
+
 app.add_typer(up_command.app, name="up", help="Spin up the Bagel webapp or MCP server.")
 
 app.add_typer(list_command.app, name="list", help="List datasets, pipeline definitions, and more.")
@@ -1,11 +1,18 @@
 """Entry point for the Bagel MCP server."""
 
-from typing import Any
+import asyncio
+import concurrent.futures
+import functools
+import threading
+import weakref
+from collections.abc import Awaitable, Callable
+from typing import Any, ParamSpec, TypeVar
 
-from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp import Context, FastMCP
 
 from settings import settings
-from src.reader import factory
+from src import downsample, encoding, pagination, query, search
+from src.reader import factory, pool, statistics
 
 server = FastMCP(
     name="Bagel MCP Server",
@@ -13,8 +20,50 @@ server = FastMCP(
     port=settings.MCP_LOCAL_PORT,
 )
 
+P = ParamSpec("P")
+R = TypeVar("R")
+
+# Threads that read messages, and threads that serve metadata apart from them. Threads rather
+# than processes, so that all calls share open readers and cursors of this process
+heavy_executor = concurrent.futures.ThreadPoolExecutor(
+    settings.MCP_WORKER_COUNT, thread_name_prefix="mcp-heavy"
+)
+light_executor = concurrent.futures.ThreadPoolExecutor(
+    settings.MCP_LIGHT_WORKER_COUNT, thread_name_prefix="mcp-light"
+)
+
+paginator = pagination.Paginator()
+
+# DuckDB databases of client sessions, dropped when their session is
+query_sessions: weakref.WeakKeyDictionary[Any, query.QuerySession] = weakref.WeakKeyDictionary()
+query_sessions_lock = threading.Lock()
+
+
+def offload(
+    executor: concurrent.futures.Executor,
+) -> Callable[[Callable[P, R]], Callable[P, Awaitable[R]]]:
+    """Make a blocking tool asynchronous by running it on a pool of threads.
+
+    The server's event loop keeps serving other clients while the tool runs, and calls beyond
+    the pool's size wait for a thread.
+
+    """
+
+    def decorator(function: Callable[P, R]) -> Callable[P, Awaitable[R]]:
+        @functools.wraps(function)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                executor, functools.partial(function, *args, **kwargs)
+            )
+
+        return wrapper
+
+    return decorator
+
 
 @server.tool(title="Read Robolog Metadata")
+@offload(light_executor)
 def read_metadata(robolog_path: str) -> dict[str, Any]:
     """Return metadata of the robolog as a dictionary.
 
@@ -44,7 +93,7 @@ def read_metadata(robolog_path: str) -> dict[str, Any]:
         dict[str, Any]: A dictionary containing metadata extracted from the robolog.
 
     """
-    reader = factory.make_topic_frequency_reader(robolog_path)
+    reader = pool.readers.get(factory.make_topic_frequency_reader, robolog_path)
     return {
         "robolog_id": reader.robolog_id,
         "path": str(reader.path),
@@ -61,9 +110,21 @@ def read_metadata(robolog_path: str) -> dict[str, Any]:
 
 
 @server.tool(title="Read Logging Messages")
-def read_logging_messages(robolog_path: str) -> list[dict[str, Any]]:
+@offload(heavy_executor)
+def read_logging_messages(  # noqa: PLR0913
+    robolog_path: str,
+    start_seconds: float | None = None,
+    end_seconds: float | None = None,
+    min_level: str | None = None,
+    name_filter: str | None = None,
+    format: encoding.Format = "rows",  # noqa: A002
+) -> list[dict[str, Any]] | dict[str, Any]:
     """Return logging messages from the robolog as a list of JSON-serializable dictionaries.
 
+    With format "columns", a dictionary of lists, one per key below, is returned instead. It is
+    several times smaller for many messages. Lists of strings that repeat a lot, e.g., robolog_id
+    and level, are encoded as {"dictionary": [unique strings], "indices": [index per message]}.
+
     Each dictionary in the list represents a logging message with the following structure:
     - robolog_id: Unique identifier for the robolog, generated by reading the robolog content.
     - timestamp_seconds: Timestamp of the logging message in seconds. Please note that this is
@@ -78,16 +139,27 @@ def read_logging_messages(robolog_path: str) -> list[dict[str, Any]]:
 
     Args:
         robolog_path (str): Path to the robolog.
+        start_seconds (float | None, optional): When to start reading messages.
+        end_seconds (float | None, optional): When to stop reading messages.
+        min_level (str | None, optional): Only return messages at least as severe as this level,
+            e.g., "WARN". Messages with unrecognized levels are always returned.
+        name_filter (str | None, optional): Only return messages whose logger name contains this
+            substring. PX4 ULog messages have no logger name and are never returned.
+        format (str, optional): "rows" for a list of dictionaries, or "columns" for a
+            dictionary of lists.
 
     Returns:
-        list[dict[str, Any]]: A list of dictionaries, each representing a logging message.
+        list[dict[str, Any]] | dict[str, Any]: A list of dictionaries, each representing a logging
+            message, or a dictionary of lists with format "columns".
 
     """
-    reader = factory.make_topic_message_reader(robolog_path)
-    return [msg.to_dict() for msg in reader.logging_messages]
+    reader = pool.readers.get(factory.make_logging_message_reader, robolog_path)
+    dataset = reader.read(start_seconds, end_seconds, min_level, name_filter)
+    return encoding.Encoding(format=format).encode(dataset.to_table())
 
 
 @server.tool(title="Read Topic Messages")
+@offload(heavy_executor)
 def read_topic_messages(  # noqa: PLR0913
     robolog_path: str,
     topics: list[str] | None = None,
@@ -95,10 +167,24 @@ def read_topic_messages(  # noqa: PLR0913
     end_seconds: float | None = None,
     ffill: bool = False,
     peek: bool = False,
-) -> list[dict[str, Any]]:
-    """Return messages for the specified topics and time range as a list of dictionaries.
+    cursor: str | None = None,
+    limit: int = settings.MCP_PAGE_ROW_COUNT,
+    format: encoding.Format = "rows",  # noqa: A002
+    flatten: bool = False,
+    fields: list[str] | None = None,
+    filter: str | None = None,  # noqa: A002
+) -> dict[str, Any]:
+    """Return a page of messages for the specified topics and time range.
 
-    Each dictionary in the list represents a message with the following structure:
+    The returned dictionary has the following structure:
+    - messages: List of dictionaries, each representing a message (see below). With format
+        "columns", a dictionary of lists, one per key below, is returned instead. It is several
+        times smaller for many messages. Lists of strings that repeat a lot, e.g., robolog_id,
+        are encoded as {"dictionary": [unique strings], "indices": [index per message]}.
+    - next_cursor: Cursor to pass to get the next page, or None if this is the last page.
+    - total_message_count: Number of messages across all pages.
+
+    Each message dictionary has the following structure:
     - robolog_id: Unique identifier for the robolog, generated by reading the robolog content.
     - timestamp_seconds: Timestamp of the message in seconds. Please note that this is not always
         the Unix epoch seconds. For example, it can be the time when the robot sent or received
@@ -106,7 +192,7 @@ def read_topic_messages(  # noqa: PLR0913
 
     The rest of the keys in the dictionary are the topic names, and their values will be the
     corresponding message content. The structure of the message content will vary depending on the
-    topic message type. The values are JSON-serializable.
+    topic message type. The values are JSON-serializable, with bytes as base64 strings.
 
     Args:
         robolog_path (str): Path to the robolog.
@@ -115,16 +201,219 @@ def read_topic_messages(  # noqa: PLR0913
         end_seconds (float | None, optional): When to stop reading messages.
         ffill (bool, optional): If True, apply forward fill to the messages topics.
         peek (bool, optional): If True, only return the first record batch.
+        cursor (str | None, optional): Cursor returned as next_cursor by a previous call. If set,
+            the next page of that call is returned and arguments other than limit, format, and
+            flatten are ignored.
+        limit (int, optional): Maximum number of messages in the page, at least 1. Limits above
+            the server's maximum page size are capped to it.
+        format (str, optional): "rows" for a list of dictionaries, or "columns" for a
+            dictionary of lists.
+        flatten (bool, optional): If True, nested message fields become keys named by their
+            dotted paths, e.g., "/imu.linear_acceleration.z", rather than nested dictionaries.
+        fields (list[str] | None, optional): Dotted paths of fields to return, starting with their
+            topic, e.g., ["/odom.pose.pose.position", "/imu.angular_velocity.z"]. Topics without
+            paths are returned in full. Much faster than reading whole messages of large topics.
+            If None, all fields are returned.
+        filter (str | None, optional): SQL expression that returned messages must satisfy, over
+            the topic columns, e.g., '"/battery".percentage < 0.2'. Topic names must be double
+            quoted. Only fields in `fields`, if set, can be used. Rows where a topic has no
+            message have NULL in its column, so ffill is usually needed to compare topics.
+
+    Returns:
+        dict[str, Any]: A dictionary containing a page of topic messages.
+
+    """
+    limit = pagination.page_row_count(limit)
+    response_encoding = encoding.Encoding(format=format, flatten=flatten)
+    if cursor is not None:
+        page = paginator.page(cursor, limit, response_encoding)
+    else:
+        reader = pool.readers.get(factory.make_topic_message_reader, robolog_path)
+        dataset = reader.read(
+            topics=topics,
+            start_seconds=start_seconds,
+            end_seconds=end_seconds,
+            ffill=ffill,
+            peek=peek,
+            fields=fields,
+            filter=filter,
+        )
+        page = paginator.first_page(dataset.files[0], limit, response_encoding)
+    return {
+        "messages": page.data,
+        "next_cursor": page.next_cursor,
+        "total_message_count": page.total_row_count,
+    }
+
+
+@server.tool(title="Read Topic Statistics")
+@offload(heavy_executor)
+def read_topic_statistics(
+    robolog_path: str,
+    topic: str,
+    start_seconds: float | None = None,
+    end_seconds: float | None = None,
+) -> list[dict[str, Any]]:
+    """Return statistics of every numeric field of a topic as a list of dictionaries.
+
+    Prefer this over reading messages to learn the range and quality of a topic's fields. Field
+    paths can be passed to the downsampling tool, except those with "[*]".
+
+    Each dictionary in the list represents a numeric field with the following structure:
+    - field: Path of the field, e.g., "/imu.linear_acceleration.z". Elements of small fixed-size
+        arrays have their own paths, e.g., "vehicle_acceleration_0.xyz[2]". Elements of other
+        arrays are pooled, e.g., "/scan.ranges[*]".
+    - type: Arrow type of the field, e.g., float, int32.
+    - count: Number of values, excluding nulls and NaNs.
+    - null_count: Number of null values, e.g., missing fields.
+    - nan_count: Number of NaN values.
+    - min, max, mean, std: Minimum, maximum, mean, and standard deviation of the values.
+    - p01, p25, p50, p75, p99: Approximate 1st, 25th, 50th, 75th, and 99th percentiles.
+
+    Args:
+        robolog_path (str): Path to the robolog.
+        topic (str): Topic to compute statistics of.
+        start_seconds (float | None, optional): When to start reading messages.
+        end_seconds (float | None, optional): When to stop reading messages.
+
+    Returns:
+        list[dict[str, Any]]: A list of dictionaries, each representing a numeric field.
+
+    """
+    reader = pool.readers.get(factory.make_topic_message_reader, robolog_path)
+    return statistics.read(reader, topic, start_seconds, end_seconds).to_table().to_pylist()
+
+
+@server.tool(title="Downsample Topic Field")
+@offload(heavy_executor)
+def downsample_topic_field(  # noqa: PLR0913
+    robolog_path: str,
+    field_path: str,
+    points: int = 1000,
+    method: downsample.Method = "lttb",
+    start_seconds: float | None = None,
+    end_seconds: float | None = None,
+) -> list[dict[str, Any]]:
+    """Return a numeric field of a topic over a time range, reduced to a few points.
+
+    Prefer this over reading messages to see the shape of a signal, e.g., to find when a value
+    peaks or drifts. Then read messages of a narrow time range for details.
+
+    With method "lttb", each dictionary in the list has the following structure:
+    - timestamp_seconds: Timestamp of the message in seconds. Please note that this is not always
+        the Unix epoch seconds.
+    - value: Value of the field in the message.
+
+    With method "minmax", the time range is split into equal buckets, and each dictionary in the
+    list has the following structure:
+    - timestamp_seconds: Start of the bucket in seconds.
+    - min: Minimum value of the field in the bucket.
+    - max: Maximum value of the field in the bucket.
+    - mean: Mean value of the field in the bucket.
+    - count: Number of messages in the bucket.
+
+    Args:
+        robolog_path (str): Path to the robolog.
+        field_path (str): Topic name followed by field names and list indices, e.g.,
+            "vehicle_acceleration_0.xyz[2]" or "/imu.linear_acceleration.z".
+        points (int, optional): Maximum number of points (or buckets) to return.
+        method (str, optional): "lttb" (Largest-Triangle-Three-Buckets) keeps the messages that
+            best preserve the shape of the signal. "minmax" summarizes time buckets instead.
+        start_seconds (float | None, optional): When to start reading messages.
+        end_seconds (float | None, optional): When to stop reading messages.
+
+    Returns:
+        list[dict[str, Any]]: A list of dictionaries, each representing a point, ordered by time.
+
+    """
+    reader = pool.readers.get(factory.make_topic_message_reader, robolog_path)
+    table = downsample.downsample(reader, field_path, points, method, start_seconds, end_seconds)
+    return table.to_pylist()
+
+
+@server.tool(title="Query Robolog")
+@offload(heavy_executor)
+def query_robolog(  # noqa: PLR0913
+    robolog_path: str,
+    sql: str,
+    ctx: Context,
+    topics: list[str] | None = None,
+    start_seconds: float | None = None,
+    end_seconds: float | None = None,
+    limit: int = settings.MCP_PAGE_ROW_COUNT,
+) -> dict[str, Any]:
+    """Run a DuckDB SQL query over messages of the robolog and return its result.
+
+    Prefer this over reading messages when only an aggregate or a few rows are needed, e.g.,
+    the maximum of a field during a time range. Messages are in a view named "messages" with
+    one row per message and the following columns:
+    - robolog_id: Unique identifier for the robolog, generated by reading the robolog content.
+    - timestamp_seconds: Timestamp of the message in seconds. Please note that this is not always
+        the Unix epoch seconds.
+    - One STRUCT column per topic, named after the topic, e.g., "/imu". Quote topic names and
+        access fields with dots, e.g., SELECT MAX("/imu".linear_acceleration.z) FROM messages.
+        Only the topic of the message is set in a row; other topics are NULL.
+
+    The returned dictionary has the following structure:
+    - columns: Names of the result columns.
+    - rows: List of dictionaries, each representing a row of the result.
+    - truncated: True if the result had more rows than the limit.
+
+    Tables created by a query stay available to later queries of the same session. Queries cannot
+    read or write files, and are interrupted after a time limit.
+
+    Args:
+        robolog_path (str): Path to the robolog.
+        sql (str): A DuckDB SQL query that reads from the "messages" view.
+        ctx (Context): Context of the MCP request, used to find the session's database.
+        topics (list[str] | None, optional): Topics to read from. If None, all topics are read.
+        start_seconds (float | None, optional): When to start reading messages.
+        end_seconds (float | None, optional): When to stop reading messages.
+        limit (int, optional): Maximum number of rows to return.
+
+    Returns:
+        dict[str, Any]: A dictionary containing the query result.
+
+    """
+    reader = pool.readers.get(factory.make_topic_message_reader, robolog_path)
+    dataset = reader.read(topics=topics, start_seconds=start_seconds, end_seconds=end_seconds)
+    with query_sessions_lock:
+        if ctx.session not in query_sessions:
+            query_sessions[ctx.session] = query.QuerySession()
+        session = query_sessions[ctx.session]
+    return session.query(dataset, sql, limit, settings.MCP_QUERY_TIMEOUT_SECONDS).model_dump()
+
+
+@server.tool(title="Search Logs")
+@offload(heavy_executor)
+def search_logs(
+    query: str, robolog_paths: list[str] | None = None, limit: int = 100
+) -> list[dict[str, Any]]:
+    """Return logging messages that match a full-text query across robologs, best matches first.
+
+    Logging messages are indexed once per robolog, so repeated searches are fast. Each dictionary
+    in the list represents a hit with the following structure:
+    - robolog_id: Unique identifier for the robolog, generated by reading the robolog content.
+    - path: Path to the robolog.
+    - timestamp_milliseconds: Timestamp of the logging message in milliseconds. Please note that
+        this is not always the Unix epoch milliseconds.
+    - level: Logging level of the message (e.g., DEBUG, INFO, WARN, ERROR).
+    - name: Name of the logger (e.g., the ROS node name). None for PX4 ULog.
+    - message: The actual logging message content.
+
+    Args:
+        query (str): An SQLite FTS5 query over message text and logger names. Wrap words in
+            double quotes to match a phrase, e.g., '"EKF2 IMU stopped"'. Use AND, OR, NOT and
+            prefix queries like 'EKF*' to combine terms.
+        robolog_paths (list[str] | None, optional): Robologs to search. They are indexed first if
+            needed. If None, all previously indexed robologs are searched.
+        limit (int, optional): Maximum number of hits to return.
 
     Returns:
-        list[dict[str, Any]]: A list of dictionaries, each representing a topic message.
+        list[dict[str, Any]]: A list of dictionaries, each representing a hit.
 
     """
-    reader = factory.make_topic_message_reader(robolog_path)
-    dataset = reader.read(
-        topics=topics, start_seconds=start_seconds, end_seconds=end_seconds, ffill=ffill, peek=peek
-    )
-    return dataset.to_table().to_pylist()
+    return search.search_logs(query, robolog_paths, limit)
 
 
 if __name__ == "__main__":
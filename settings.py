@@ -1,6 +1,7 @@
 """Settings for the bagel application."""
 
 import logging
+import os
 import pathlib
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -30,15 +31,60 @@ class Settings(BaseSettings):
     # Directory for caching intermediate artifacts
     CACHE_DIRECTORY: str = str(pathlib.Path.home() / ".cache" / "bagel")
 
+    # SQLite full-text search index over logging messages of robologs
+    LOG_SEARCH_INDEX_FILE: str = str(pathlib.Path(CACHE_DIRECTORY) / "search" / "logs.sqlite3")
+
     # Directory for storing final artifacts
     STORAGE_DIRECTORY: str = str(pathlib.Path.home() / ".bagel")
 
     # Directory for datasets created by the pipelines
     DATASET_DIRECTORY: str = str(pathlib.Path(STORAGE_DIRECTORY) / "datasets")
 
+    # Compression codec of Parquet files in datasets
+    DATASET_PARQUET_COMPRESSION: str = "zstd"
+
+    # Target uncompressed size of row groups in Parquet files in datasets
+    DATASET_ROW_GROUP_SIZE_BYTES: int = 128 * MB
+
+    # Target uncompressed size of Parquet files in datasets
+    DATASET_FILE_SIZE_BYTES: int = 1 * GB
+
+    # SQLite ledger of pipeline operators that finished, used to skip them when unchanged
+    RUN_LEDGER_FILE: str = str(pathlib.Path(STORAGE_DIRECTORY) / "ledger.sqlite3")
+
     # Directory for pipeline definitions created by the users through the webapp
     PIPELINE_DEFINITION_DIRECTORY: str = str(pathlib.Path(STORAGE_DIRECTORY) / "pipelines")
 
+    # Maximum number of pipeline operators running at the same time
+    PIPELINE_WORKER_COUNT: int = min(8, os.cpu_count() or 1)
+
+    # Maximum memory of the DuckDB engine of a pipeline run, e.g., "48GB". If None, 80% of RAM
+    DUCKDB_MEMORY_LIMIT: str | None = None
+
+    # Number of threads of the DuckDB engine of a pipeline run. If None, one per CPU core
+    DUCKDB_THREADS: int | None = None
+
+    # Directory where the DuckDB engine of a pipeline run spills what does not fit in memory
+    DUCKDB_TEMP_DIRECTORY: str = str(pathlib.Path(CACHE_DIRECTORY) / "duckdb")
+
+    # Whether DuckDB results keep the order of their inputs, which limits spilling
+    DUCKDB_PRESERVE_INSERTION_ORDER: bool = False
+
+    # DuckDB database file of pipeline runs, which keeps views for follow-up queries. If None,
+    # the database is in memory
+    DUCKDB_DATABASE_FILE: str | None = None
+
+    # Maximum size of a transform view materialized in memory as Arrow. Larger ones become DuckDB
+    # tables, which DuckDB can spill to disk
+    MATERIALIZE_MAX_ARROW_BYTES: int = 256 * MB
+
+    # Maximum number of robolog readers kept open by the MCP server and the webapp
+    READER_POOL_MAX_COUNT: int = 16
+
+    # Maximum total size of robologs whose readers are kept open. A reader holds at most about
+    # as much memory as its robolog, e.g., PX4 ULog readers load the whole file
+    READER_POOL_MAX_BYTES: int = 8 * GB
+
     # Minimum number of records per batch in arrow files
     MIN_ARROW_RECORD_BATCH_SIZE_COUNT: int = 500
 
@@ -75,6 +121,24 @@ class Settings(BaseSettings):
     # MCP server entry point
     MCP_PATH: str = "server.py"
 
+    # Maximum number of MCP tool calls that read messages at the same time. Further calls wait
+    # without blocking the server
+    MCP_WORKER_COUNT: int = min(8, os.cpu_count() or 1)
+
+    # Number of MCP tool calls for metadata that run at the same time, apart from reads of
+    # messages, so that they never wait behind them
+    MCP_LIGHT_WORKER_COUNT: int = 2
+
+    # Default number of rows in a page of messages returned by the MCP server
+    MCP_PAGE_ROW_COUNT: int = 1000
+
+    # Maximum number of rows in a page of messages returned by the MCP server. Larger limits are
+    # capped to it
+    MCP_MAX_PAGE_ROW_COUNT: int = 10000
+
+    # Maximum time in seconds an SQL query of the MCP server runs before it is interrupted
+    MCP_QUERY_TIMEOUT_SECONDS: float = 60.0
+
 
 settings = Settings()
 
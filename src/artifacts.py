@@ -28,22 +28,48 @@ def topic_arrow_file(  # noqa: PLR0913
     end_seconds: float,
     ffill: bool,
     peek: bool,
+    fields: list[str] | None = None,
+    filter: str | None = None,  # noqa: A002
 ) -> pathlib.Path:
     """Generate an Arrow file path containing message time series of selected topics."""
     seeds = [str(sorted(topics)), str(ffill)]
+    if fields:  # unprojected and unfiltered reads keep their file names
+        seeds.append(str(sorted(fields)))
+    if filter:
+        seeds.append(f"WHERE {filter}")
     digest = _short_digest(seeds)
     file_name = f"topic_{digest}.arrow" if not peek else f"topic_{digest}_peek.arrow"
     return _snippet_path(robolog_path, start_seconds, end_seconds) / file_name
 
 
-def type_arrow_file(
+def statistics_arrow_file(
+    robolog_path: str | pathlib.Path,
+    topic: str,
+    start_seconds: float,
+    end_seconds: float,
+) -> pathlib.Path:
+    """Generate an Arrow file path containing statistics of numeric fields of a topic."""
+    seeds = [topic]
+    return (
+        _snippet_path(robolog_path, start_seconds, end_seconds)
+        / f"statistics_{_short_digest(seeds)}.arrow"
+    )
+
+
+def type_arrow_file(  # noqa: PLR0913
     robolog_path: str | pathlib.Path,
     type_name: str,
     start_seconds: float,
     end_seconds: float,
+    fields: list[str] | None = None,
+    filter: str | None = None,  # noqa: A002
 ) -> pathlib.Path:
     """Generate an Arrow file path containing message time series of a specific message type."""
     seeds = [type_name]
+    if fields:  # unprojected and unfiltered reads keep their file names
+        seeds.append(str(sorted(fields)))
+    if filter:
+        seeds.append(f"WHERE {filter}")
     return (
         _snippet_path(robolog_path, start_seconds, end_seconds)
         / f"type_{_short_digest(seeds)}.arrow"
@@ -62,3 +88,18 @@ def frequency_arrow_file(
         _snippet_path(robolog_path, start_seconds, end_seconds)
         / f"frequency_{_short_digest(seeds)}.arrow"
     )
+
+
+def logging_arrow_file(
+    robolog_path: str | pathlib.Path,
+    start_seconds: float,
+    end_seconds: float,
+    min_level: str | None,
+    name_filter: str | None,
+) -> pathlib.Path:
+    """Generate an Arrow file path containing logging messages that pass the filters."""
+    seeds = [str(min_level).upper(), str(name_filter)]
+    return (
+        _snippet_path(robolog_path, start_seconds, end_seconds)
+        / f"logging_{_short_digest(seeds)}.arrow"
+    )
@@ -1,10 +1,23 @@
 """Artifact cache management with deterministic file naming."""
 
+import contextlib
+import fcntl
+import os
 import pathlib
 import shutil
+import threading
+import uuid
+from collections.abc import Iterator
 
 from settings import settings
 
+# Suffix of lock files next to artifacts being created
+LOCK_FILE_SUFFIX = ".lock"
+
+# In-process locks of artifacts being created, with the number of threads holding or waiting
+_artifact_locks: dict[str, tuple[threading.Lock, int]] = {}
+_artifact_locks_lock = threading.Lock()
+
 
 def _clear_directory(directory: pathlib.Path) -> int:
     """Clear a directory and return the total bytes cleared."""
@@ -23,3 +36,64 @@ def clear_all_cache() -> int:
 def clear_all_storage() -> int:
     """Clear the entire storage directory and return the total bytes cleared."""
     return _clear_directory(pathlib.Path(settings.STORAGE_DIRECTORY))
+
+
+@contextlib.contextmanager
+def _artifact_lock(artifact: pathlib.Path) -> Iterator[None]:
+    """Hold the in-process lock of an artifact, dropping it when no thread needs it anymore."""
+    key = str(artifact)
+    with _artifact_locks_lock:
+        lock, count = _artifact_locks.get(key, (threading.Lock(), 0))
+        _artifact_locks[key] = (lock, count + 1)
+    try:
+        with lock:
+            yield
+    finally:
+        with _artifact_locks_lock:
+            lock, count = _artifact_locks[key]
+            if count == 1:
+                del _artifact_locks[key]
+            else:
+                _artifact_locks[key] = (lock, count - 1)
+
+
+@contextlib.contextmanager
+def single_flight(artifact: pathlib.Path) -> Iterator[None]:
+    """Hold an exclusive lock on creating an artifact, across threads and processes.
+
+    Callers that find an artifact missing create it while holding the lock, after checking again
+    that it is still missing. Concurrent callers wait for the first one and then find the artifact
+    in the cache, so it is created once rather than once per caller. Threads wait on an in-process
+    lock, so that only one of them waits on the lock file that other processes share.
+
+    """
+    artifact.parent.mkdir(parents=True, exist_ok=True)
+    lock_file = artifact.with_name(artifact.name + LOCK_FILE_SUFFIX)
+    with _artifact_lock(artifact), open(lock_file, "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def temporary_path(artifact: pathlib.Path) -> pathlib.Path:
+    """Return a unique path next to an artifact to write it to before moving it in place."""
+    artifact.parent.mkdir(parents=True, exist_ok=True)
+    return artifact.with_name(f".{artifact.name}.{uuid.uuid4().hex}.tmp")
+
+
+@contextlib.contextmanager
+def write_atomically(artifact: pathlib.Path) -> Iterator[pathlib.Path]:
+    """Yield a temporary path to write an artifact to, and move it in place once written.
+
+    Readers that check the cache without a lock never see a partially written artifact. If
+    writing fails, the temporary file is deleted and the artifact is left as it was.
+
+    """
+    temporary_file = temporary_path(artifact)
+    try:
+        yield temporary_file
+        os.replace(temporary_file, artifact)
+    finally:
+        temporary_file.unlink(missing_ok=True)
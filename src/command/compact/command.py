@@ -0,0 +1,70 @@
+"""Implementation of the compact command for Bagel CLI."""
+
+import pathlib
+from typing import Annotated
+
+import humanize
+import rich
+import typer
+from rich.table import Table
+
+from settings import settings
+from src import dataset
+
+app = typer.Typer()
+
+
+@app.command()
+def compact(
+    dataset_names: Annotated[
+        list[str] | None,
+        typer.Argument(help="Datasets to compact. If omitted, compact all datasets"),
+    ] = None,
+    file_size_bytes: Annotated[
+        int, typer.Option(help="Target uncompressed size of compacted files in bytes")
+    ] = settings.DATASET_FILE_SIZE_BYTES,
+    convert: Annotated[
+        bool, typer.Option(help="If true, also rewrite CSV and JSONL files into Parquet files")
+    ] = False,
+    min_age_seconds: Annotated[
+        float,
+        typer.Option(help="Skip partitions with a file that changed within this many seconds"),
+    ] = 600.0,
+    dry_run: Annotated[
+        bool, typer.Option(help="If true, show what would be compacted without compacting it")
+    ] = False,
+) -> None:
+    """Merge small files in partitions of datasets into target-sized, time-sorted Parquet files."""
+    dataset_directory = pathlib.Path(settings.DATASET_DIRECTORY)
+    names = dataset_names or sorted(
+        path.name
+        for path in dataset_directory.iterdir()
+        if path.is_dir() and not path.name.startswith((".", "_"))
+    )
+
+    table = Table("Partition", "Files", "Compacted files", "Size", "Compacted size")
+    for name in names:
+        if not (dataset_directory / name).is_dir():
+            raise FileNotFoundError(dataset_directory / name)
+
+        for partition in dataset.find_partitions(dataset_directory / name):
+            compaction = dataset.compact_partition(
+                partition,
+                file_size_bytes,
+                [settings.TIMESTAMP_SECONDS_COLUMN_NAME],
+                convert,
+                min_age_seconds,
+                dry_run,
+            )
+            if compaction is not None:
+                table.add_row(
+                    str(partition.relative_to(dataset_directory)),
+                    str(len(compaction.inputs)),
+                    str(len(compaction.outputs)),
+                    humanize.naturalsize(compaction.input_size_bytes),
+                    humanize.naturalsize(compaction.output_size_bytes),
+                )
+
+    rich.print(table)
+    partitions = f"[bold]{table.row_count}[/bold] partition{'s' if table.row_count != 1 else ''}"
+    rich.print(f"Found {partitions} to compact" if dry_run else f"Compacted {partitions}")
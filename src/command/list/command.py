@@ -15,13 +15,21 @@ MAX_PARTITIONS_DISPLAY: int = 5
 @app.command()
 def datasets() -> None:
     """List datasets in the Bagel storage directory."""
-    dataset_dirs = list(pathlib.Path(settings.DATASET_DIRECTORY).iterdir())
+    dataset_dirs = [
+        path
+        for path in pathlib.Path(settings.DATASET_DIRECTORY).iterdir()
+        if not path.name.startswith((".", "_"))
+    ]
     rich.print(
         f"Found [bold]{len(dataset_dirs)}[/bold] dataset{'s' if len(dataset_dirs) != 1 else ''} in {settings.DATASET_DIRECTORY}"  # noqa: E501
     )
     for dataset_dir in dataset_dirs:
         dataset = dataset_dir.name
-        partitions = [partition_dir.name for partition_dir in dataset_dir.iterdir()]
+        partitions = [
+            partition_dir.name
+            for partition_dir in dataset_dir.iterdir()
+            if not partition_dir.name.startswith((".", "_"))
+        ]
         partitions.sort(key=lambda s: s[-10:])
         n_parts = len(partitions)
         rich.print(f"[bold]{dataset}[/bold]: {n_parts} partition{'s' if n_parts != 1 else ''}")
@@ -0,0 +1,206 @@
+"""DuckDB views registered by pipeline operators, shared by all workers of a pipeline run."""
+
+import itertools
+import re
+import threading
+
+import duckdb
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+# Sources a view can be registered from. Strings are SQL queries over other views
+ViewSource = ds.Dataset | pa.Table | pd.DataFrame | str
+
+# Prefix of DuckDB tables that views are materialized into
+MATERIALIZED_TABLE_PREFIX = "_materialized_"
+
+
+def referenced_views(sql: str, view_names: set[str]) -> set[str]:
+    """Return the views, among `view_names`, that an SQL query reads from.
+
+    Raises:
+        duckdb.ParserException: If the SQL query cannot be parsed.
+
+    """
+    try:
+        table_names = duckdb.get_table_names(sql)
+    except duckdb.BinderException:
+        # Some valid queries (e.g., ASOF joins) only bind against existing tables, so fall back to
+        # matching identifiers. This may report extra views, but never misses one
+        table_names = set(re.findall(r"[A-Za-z_][A-Za-z0-9_]*", sql))
+    return table_names & view_names
+
+
+class Catalog:
+    """DuckDB views registered by pipeline operators, shared by all workers of a pipeline run.
+
+    DuckDB scopes registered objects to a single connection, so every worker thread queries through
+    its own cursor of a pipeline-wide connection. The catalog remembers what each view was
+    registered from and registers it lazily, dependencies first, on the cursors that need it.
+
+    """
+
+    def __init__(
+        self, connection: duckdb.DuckDBPyConnection | None = None, persist: bool = False
+    ) -> None:
+        """Initialize the catalog on top of a DuckDB connection, or an in-memory one if None.
+
+        If `persist` is True, closing the catalog keeps materialized tables and creates views in
+        the database for SQL views that only read from them, e.g., for follow-up queries on a
+        database file. Views over Arrow data are scoped to the catalog and are not kept.
+
+        """
+        self._connection = connection or duckdb.connect()
+        self._persist = persist
+        self._sources: dict[str, ViewSource] = {}
+        self._dependencies: dict[str, set[str]] = {}
+        self._versions: dict[str, int] = {}
+        self._tables: list[str] = []
+        self._cursors: list[duckdb.DuckDBPyConnection] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def __enter__(self) -> "Catalog":
+        """Return the catalog itself."""
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        """Close the catalog."""
+        self.close()
+
+    @property
+    def cursor(self) -> duckdb.DuckDBPyConnection:
+        """Return the DuckDB cursor of the calling thread."""
+        if not hasattr(self._local, "cursor"):
+            with self._lock:
+                self._local.cursor = self._connection.cursor()
+                self._cursors.append(self._local.cursor)
+            self._local.bound_versions = {}
+        return self._local.cursor
+
+    @property
+    def view_names(self) -> set[str]:
+        """Return names of all registered views."""
+        with self._lock:
+            return set(self._sources)
+
+    def register(self, name: str, source: ViewSource) -> None:
+        """Register a view from Arrow data, a pandas DataFrame, or an SQL query over other views.
+
+        The view is registered right away on the cursor of the calling thread, so invalid SQL
+        queries fail here rather than when the view is read.
+
+        """
+        dependencies = (
+            referenced_views(source, self.view_names - {name}) if isinstance(source, str) else set()
+        )
+        with self._lock:
+            self._sources[name] = source
+            self._dependencies[name] = dependencies
+            self._versions[name] = self._versions.get(name, 0) + 1
+
+        try:
+            self._bind(name)
+        except Exception as e:
+            with self._lock:
+                self._sources.pop(name, None)
+                self._dependencies.pop(name, None)
+            raise e
+
+    def source(self, name: str) -> ViewSource:
+        """Return what a view was registered from."""
+        with self._lock:
+            return self._sources[name]
+
+    def files(self, name: str) -> list[str]:
+        """Return files backing a view, if it was registered from a file-based Arrow dataset."""
+        with self._lock:
+            source = self._sources[name]
+        return list(source.files) if isinstance(source, ds.FileSystemDataset) else []
+
+    def view(self, name: str) -> duckdb.DuckDBPyRelation:
+        """Return a registered view as a relation on the cursor of the calling thread."""
+        self._bind(name)
+        return self.cursor.view(name)
+
+    def materialize(self, name: str, max_arrow_bytes: int) -> None:
+        """Compute a view once and register its result in place of it, so readers stop recomputing.
+
+        Results up to `max_arrow_bytes` are kept in memory as an Arrow table. Larger results are
+        streamed into a DuckDB table, which DuckDB can spill to disk.
+
+        """
+        reader = self.view(name).fetch_record_batch()
+        batches, nbytes = [], 0
+        for batch in reader:
+            batches.append(batch)
+            nbytes += batch.nbytes
+            if nbytes > max_arrow_bytes:
+                break
+        else:
+            self.register(name, pa.Table.from_batches(batches, schema=reader.schema))
+            return
+
+        self.register_batches(
+            name, pa.RecordBatchReader.from_batches(reader.schema, itertools.chain(batches, reader))
+        )
+
+    def register_batches(self, name: str, batches: pa.RecordBatchReader) -> None:
+        """Stream record batches into a DuckDB table and register a view over it.
+
+        A record batch reader can only be read once, while views are read by every query, so the
+        batches are written into a table of the pipeline's database, which all cursors can see.
+        The batches may stream from a query on the cursor of the calling thread, so the table is
+        written through another cursor.
+
+        """
+        table_name = f"{MATERIALIZED_TABLE_PREFIX}{name}"
+        with self._connection.cursor() as cursor:
+            cursor.register(f"{table_name}_stream", batches)
+            cursor.sql(f'CREATE OR REPLACE TABLE "{table_name}" AS FROM "{table_name}_stream"')
+        with self._lock:
+            self._tables.append(table_name)
+        self.register(name, f'SELECT * FROM "{table_name}"')  # noqa: S608
+
+    def close(self) -> None:
+        """Close cursors of all workers and the underlying connection."""
+        with self._lock:
+            for cursor in self._cursors:
+                cursor.close()
+            self._cursors.clear()
+            if self._persist:
+                self._persist_views()
+            else:
+                for table_name in self._tables:
+                    self._connection.execute(f'DROP TABLE IF EXISTS "{table_name}"')
+            self._tables.clear()
+        self._connection.close()
+
+    def _persist_views(self) -> None:
+        """Create views in the database for SQL views that only read from materialized tables."""
+        persisted = set()
+        for name, source in self._sources.items():  # views are registered after what they read
+            if isinstance(source, str) and self._dependencies[name] <= persisted:
+                self._connection.execute(f'CREATE OR REPLACE VIEW "{name}" AS {source}')
+                persisted.add(name)
+
+    def _bind(self, name: str) -> None:
+        """Register a view and its dependencies on the cursor of the calling thread if needed."""
+        cursor = self.cursor
+        with self._lock:
+            if name not in self._sources:
+                raise duckdb.CatalogException(f"View with name {name} does not exist!")
+            source = self._sources[name]
+            dependencies = self._dependencies[name]
+            version = self._versions[name]
+
+        if self._local.bound_versions.get(name) == version:
+            return
+
+        for dependency in dependencies:
+            self._bind(dependency)
+
+        relation = cursor.sql(source) if isinstance(source, str) else source
+        cursor.register(name, relation)
+        self._local.bound_versions[name] = version
@@ -1,103 +1,143 @@
 """Implementation of the run command."""
 
-import functools
 import pathlib
-from collections.abc import Callable, Iterator
-from typing import Annotated, Any
+from datetime import datetime
+from typing import Annotated
 
+import humanize
 import rich
 import typer
-import yaml
 from rich.emoji import Emoji
 from rich.markdown import Markdown
+from rich.table import Table
 
-from src.command.run import operator, validate
+from settings import settings
+from src import profiling, robolog
+from src.command.run import dag, fleet, pipeline
 from src.command.run.operator.base import Operator
 from src.command.run.operator.save import FileExtension
 
 SPINNER: str = "dots12"
 
+# Directory under the dataset directory where profiles of pipeline runs are written
+PROFILE_DIRECTORY_NAME: str = "_profiles"
+
 console = rich.console.Console()
 
 app = typer.Typer()
 
 
-def make_operators_and_tasks(  # noqa: C901, PLR0912, PLR0913
+def _run_robolog(  # noqa: PLR0913
     pipeline_path: pathlib.Path,
     robolog_path: pathlib.Path,
-    start_seconds: float | None = None,
-    end_seconds: float | None = None,
-    output: FileExtension = FileExtension.PARQUET,
-    dry_run: bool = False,
-) -> Iterator[Operator, Callable[[], Any]]:
-    """Parse the pipeline definition YAML file and return operators and their tasks."""
-    if not pipeline_path.exists():
-        raise FileNotFoundError(pipeline_path)
-
-    if not robolog_path.exists():
-        raise FileNotFoundError(robolog_path)
-
-    main_config = yaml.safe_load(pipeline_path.read_text().encode("utf-8"))
-
-    operators = []
-    tasks = []
-
-    for operator_type, configs in main_config.items():
-        match operator_type:
-            case operator.ExtractTopic.YAML_KEYWORD:
-                for op in [operator.ExtractTopic.from_dict(params) for params in configs]:
-                    operators.append(op)
-                    tasks.append(
-                        functools.partial(op.register, robolog_path, start_seconds, end_seconds)
-                    )
-
-            case operator.ExtractType.YAML_KEYWORD:
-                for op in [operator.ExtractType.from_dict(params) for params in configs]:
-                    operators.append(op)
-                    tasks.append(
-                        functools.partial(op.register, robolog_path, start_seconds, end_seconds)
-                    )
-
-            case operator.ExtractFrequency.YAML_KEYWORD:
-                for op in [operator.ExtractFrequency.from_dict(params) for params in configs]:
-                    operators.append(op)
-                    tasks.append(
-                        functools.partial(op.register, robolog_path, start_seconds, end_seconds)
-                    )
-
-            case operator.ExtractLogging.YAML_KEYWORD:
-                for op in [operator.ExtractLogging.from_dict(params) for params in configs]:
-                    operators.append(op)
-                    tasks.append(functools.partial(op.register, robolog_path))
-
-            case operator.ExtractMetadata.YAML_KEYWORD:
-                for op in [operator.ExtractMetadata.from_dict(params) for params in configs]:
-                    operators.append(op)
-                    tasks.append(functools.partial(op.register, robolog_path))
-
-            case operator.TransformDataFrame.YAML_KEYWORD:
-                for op in [operator.TransformDataFrame.from_dict(params) for params in configs]:
-                    operators.append(op)
-                    tasks.append(op.register)
-
-            case operator.SaveDataFrame.YAML_KEY:
-                for name in configs:
-                    op = operator.SaveDataFrame.from_name(name)
-                    operators.append(op)
-                    tasks.append(
-                        functools.partial(
-                            op.write, robolog_path, start_seconds, end_seconds, output, dry_run
-                        )
-                    )
-
-            case _:
-                raise ValueError(f"Unknown operator type: {operator_type}")
-
-    validate.validate_unique_dataframe_names(
-        [op.name for op in operators if not isinstance(op, operator.SaveDataFrame)]
+    start_seconds: float | None,
+    end_seconds: float | None,
+    output: FileExtension,
+    dry_run: bool,
+    workers: int,
+    fuse_scans: bool,
+    force: bool,
+    profiler: profiling.Profiler | None = None,
+) -> None:
+    """Run the pipeline on a single robolog, showing the status of each operator.
+
+    If a profiler is given, each operator adds its profile to it.
+
+    """
+    nodes, skipped, pruned = pipeline.make_nodes(
+        pipeline_path, robolog_path, start_seconds, end_seconds, output, dry_run, fuse_scans, force
     )
+    for op in pruned:
+        console.print(
+            Markdown(
+                Emoji.replace(f":scissors: Pruned **{op.name}**, which no saved DataFrame uses")
+            )
+        )
+    if profiler is not None:
+        nodes = [node._replace(task=node.operator.profiled(node.task, profiler)) for node in nodes]
+    for op in skipped:
+        console.print(Markdown(Emoji.replace(f":zzz: Skipped **{op.name}**, which is up to date")))
+
+    running: list[Operator] = []
+
+    engine = pipeline.make_engine(pipeline_path)
+    with console.status("", spinner=SPINNER) as status, engine.open_catalog() as catalog:
+
+        def update_status() -> None:
+            status.update(Markdown(Emoji.replace("\n\n".join(o.running_status for o in running))))
+
+        def on_start(op: Operator) -> None:
+            running.append(op)
+            update_status()
+
+        def on_finish(op: Operator) -> None:
+            running.remove(op)
+            update_status()
+            console.print(Markdown(Emoji.replace(f"{op.finished_status}")))
+
+        dag.execute(nodes, catalog, workers, on_start, on_finish)
+
+
+def _print_profiles(profiles: list[profiling.OperatorProfile]) -> None:
+    """Print a table of the resources each operator used."""
+
+    def naturalsize(value: int | None) -> str:
+        return "" if value is None else humanize.naturalsize(value)
+
+    def intcomma(value: int | None) -> str:
+        return "" if value is None else humanize.intcomma(value)
+
+    table = Table(title="Profile")
+    table.add_column("Operator")
+    for column in [
+        "Wall",
+        "Process CPU",
+        "Process peak RSS",
+        "Rows in",
+        "Bytes in",
+        "Rows out",
+        "Bytes out",
+    ]:
+        table.add_column(column, justify="right")
+    table.add_column("Cache hits/misses", justify="right")
 
-    yield from zip(operators, tasks, strict=True)
+    for profile in profiles:
+        table.add_row(
+            f"{profile.name} ({profile.operator_type})",
+            f"{profile.wall_seconds:.2f}s",
+            f"{profile.process_cpu_seconds:.2f}s",
+            naturalsize(profile.process_peak_rss_bytes),
+            intcomma(profile.rows_in),
+            naturalsize(profile.bytes_in),
+            intcomma(profile.rows_out),
+            naturalsize(profile.bytes_out),
+            f"{profile.cache_hits}/{profile.cache_misses}",
+        )
+    console.print(table)
+
+
+def _print_summary(results: list[fleet.RobologResult]) -> None:
+    """Print a table summarizing the run of each robolog."""
+    table = Table(title="Summary")
+    table.add_column("Robolog")
+    table.add_column("Status")
+    table.add_column("Finished", justify="right")
+    table.add_column("Skipped", justify="right")
+    table.add_column("Pruned", justify="right")
+    table.add_column("Duration", justify="right")
+    table.add_column("Error")
+
+    for result in sorted(results, key=lambda result: result.robolog_path):
+        table.add_row(
+            str(result.robolog_path),
+            Emoji.replace(":white_check_mark:" if result.succeeded else ":x:"),
+            str(len(result.finished)),
+            str(len(result.skipped)),
+            str(len(result.pruned)),
+            f"{result.duration_seconds:.1f}s",
+            result.error or "",
+        )
+    console.print(table)
 
 
 @app.command()
@@ -106,9 +146,13 @@ def run(  # noqa: PLR0913
         pathlib.Path,
         typer.Argument(help="Path to the pipeline definition YAML file", show_default=False),
     ],
-    robolog_path: Annotated[
-        pathlib.Path,
-        typer.Argument(help="Path to the robolog", show_default=False),
+    robolog_paths: Annotated[
+        list[str],
+        typer.Argument(
+            help="Robologs, directories to search for robologs, glob patterns, or manifest files "
+            "that list one of them per line",
+            show_default=False,
+        ),
     ],
     start_seconds: Annotated[float | None, typer.Option(help="Start time in seconds")] = None,
     end_seconds: Annotated[float | None, typer.Option(help="End time in seconds")] = None,
@@ -118,14 +162,111 @@ def run(  # noqa: PLR0913
     dry_run: Annotated[
         bool, typer.Option(help="If true, execute the pipeline without saving results")
     ] = False,
+    workers: Annotated[
+        int, typer.Option(help="Maximum number of operators running at the same time")
+    ] = settings.PIPELINE_WORKER_COUNT,
+    fuse_scans: Annotated[
+        bool, typer.Option(help="If true, extract operators share a single pass over the robolog")
+    ] = True,
+    force: Annotated[
+        bool, typer.Option(help="If true, run all operators even if they are up to date")
+    ] = False,
+    profile: Annotated[
+        bool,
+        typer.Option(
+            help="If true, report time, memory, data volume, and cache use of each operator"
+        ),
+    ] = False,
+    jobs: Annotated[
+        int, typer.Option(help="Maximum number of robologs processed at the same time")
+    ] = 1,
+    union: Annotated[
+        bool,
+        typer.Option(
+            help="If true, union extracted DataFrames of all robologs and transform and save "
+            "them once"
+        ),
+    ] = False,
 ) -> None:
-    """Run data pipeline defined in the YAML file on the provided robolog."""
-    for op, task in make_operators_and_tasks(
-        pipeline_path, robolog_path, start_seconds, end_seconds, output, dry_run
-    ):
-        with console.status(Markdown(Emoji.replace(f"{op.running_status}")), spinner=SPINNER):
-            task()
-        console.print(Markdown(Emoji.replace(f"{op.finished_status}")))
+    """Run data pipeline defined in the YAML file on the provided robologs."""
+    paths = robolog.find_robologs(robolog_paths)
+
+    if profile and (len(paths) > 1 or union):
+        raise typer.BadParameter("--profile only supports a single robolog without --union")
+
+    if len(paths) == 1 and not union:
+        profiler = profiling.Profiler() if profile else None
+        _run_robolog(
+            pipeline_path,
+            paths[0],
+            start_seconds,
+            end_seconds,
+            output,
+            dry_run,
+            workers,
+            fuse_scans,
+            force,
+            profiler,
+        )
+        if profiler is not None:
+            _print_profiles(profiler.profiles)
+            profile_file = profiler.write_json(
+                pathlib.Path(settings.DATASET_DIRECTORY)
+                / PROFILE_DIRECTORY_NAME
+                / f"{pipeline_path.stem}_{datetime.now():%Y%m%dT%H%M%S}.json"
+            )
+            console.print(f"Wrote profile to {profile_file}")
+        return
+
+    results: list[fleet.RobologResult] = []
+
+    try:  # results of robologs that finished are reported even if the union fails
+        with console.status("", spinner=SPINNER) as status:
+
+            def on_finish(result: fleet.RobologResult) -> None:
+                results.append(result)
+                status.update(f"Processed {len(results)} of {len(paths)} robologs")
+                emoji = ":white_check_mark:" if result.succeeded else ":x:"
+                console.print(Markdown(Emoji.replace(f"{emoji} Processed {result.robolog_path}")))
+
+            def on_finish_operator(op: Operator) -> None:
+                console.print(Markdown(Emoji.replace(f"{op.finished_status}")))
+
+            status.update(f"Processing {len(paths)} robologs")
+            if union:
+                fleet.run_union(
+                    pipeline_path,
+                    paths,
+                    start_seconds,
+                    end_seconds,
+                    output,
+                    dry_run,
+                    jobs,
+                    workers,
+                    fuse_scans,
+                    force,
+                    on_finish,
+                    on_finish_operator,
+                )
+            else:
+                fleet.run_fleet(
+                    pipeline_path,
+                    paths,
+                    start_seconds,
+                    end_seconds,
+                    output,
+                    dry_run,
+                    jobs,
+                    workers,
+                    fuse_scans,
+                    force,
+                    on_finish,
+                )
+    finally:
+        _print_summary(results)
+
+    if not all(result.succeeded for result in results):
+        raise typer.Exit(code=1)
 
 
 def run_webapp(  # noqa: PLR0913
@@ -139,8 +280,18 @@ def run_webapp(  # noqa: PLR0913
     """Run data pipeline defined in the YAML file on the provided robolog in the Bagel webapp."""
     import streamlit as st
 
-    for op, task in make_operators_and_tasks(
+    nodes, skipped, pruned = pipeline.make_nodes(
         pipeline_path, robolog_path, start_seconds, end_seconds, output, dry_run
-    ):
-        task()
-        st.success(op.finished_status)
+    )
+    for op in pruned:
+        st.info(f"Pruned **{op.name}**, which no saved DataFrame uses")
+    for op in skipped:
+        st.info(f"Skipped **{op.name}**, which is up to date")
+
+    with pipeline.make_engine(pipeline_path).open_catalog() as catalog:
+        dag.execute(
+            nodes,
+            catalog,
+            settings.PIPELINE_WORKER_COUNT,
+            on_finish=lambda op: st.success(op.finished_status),
+        )
@@ -0,0 +1,157 @@
+"""Compile pipeline operators into a dependency graph and run it on a pool of workers."""
+
+import concurrent.futures
+from collections.abc import Callable, Iterable
+from typing import Any, NamedTuple
+
+from src.command.run.catalog import Catalog
+from src.command.run.operator.base import Operator
+
+
+class UndefinedDataFrameError(Exception):
+    """Raised when an operator reads a DataFrame that no operator in the pipeline defines."""
+
+
+class CyclicDependencyError(Exception):
+    """Raised when operators in the pipeline depend on each other in a cycle."""
+
+
+class Node(NamedTuple):
+    """An operator in the pipeline graph and the nodes it depends on."""
+
+    # Operator of the node
+    operator: Operator
+
+    # Task that runs the operator, given the catalog of the pipeline run
+    task: Callable[[Catalog], Any]
+
+    # Indices of the nodes that must finish before this one starts
+    dependencies: frozenset[int]
+
+
+def compile_graph(
+    operators_and_tasks: Iterable[tuple[Operator, Callable[[Catalog], Any]]],
+) -> list[Node]:
+    """Return the dependency graph of operators, in the order they were defined.
+
+    Extract operators only depend on the robolog, so they are roots of the graph. Transform
+    operators depend on the views their SQL queries read, and save operators on the view they save.
+
+    Raises:
+        UndefinedDataFrameError: If an operator reads a DataFrame that is never defined.
+        CyclicDependencyError: If operators depend on each other in a cycle.
+
+    """
+    operators_and_tasks = list(operators_and_tasks)
+    producers = {
+        op.output: index
+        for index, (op, _) in enumerate(operators_and_tasks)
+        if op.output is not None
+    }
+
+    nodes = []
+    for op, task in operators_and_tasks:
+        inputs = op.inputs(set(producers) - {op.output})
+        undefined = inputs - set(producers)
+        if undefined:
+            raise UndefinedDataFrameError(", ".join(sorted(undefined)))
+        nodes.append(Node(op, task, frozenset(producers[name] for name in inputs)))
+
+    _validate_acyclic(nodes)
+    return nodes
+
+
+def prune(
+    operators_and_tasks: Iterable[tuple[Operator, Callable[[Catalog], Any]]],
+) -> tuple[list[tuple[Operator, Callable[[Catalog], Any]]], list[Operator]]:
+    """Drop operators whose views no save operator reads, directly or through other views.
+
+    Pipelines without save operators are left untouched, since nothing would run otherwise.
+
+    Returns:
+        tuple[list[tuple[Operator, Callable[[Catalog], Any]]], list[Operator]]: Operators and
+            tasks to keep, in the order they were defined, and operators that were dropped.
+
+    """
+    operators_and_tasks = list(operators_and_tasks)
+    nodes = compile_graph(operators_and_tasks)
+
+    frontier = [index for index, node in enumerate(nodes) if node.operator.output is None]
+    if not frontier:
+        return operators_and_tasks, []
+
+    reachable = set(frontier)
+    while frontier:
+        for dependency in nodes[frontier.pop()].dependencies - reachable:
+            reachable.add(dependency)
+            frontier.append(dependency)
+
+    kept = [item for index, item in enumerate(operators_and_tasks) if index in reachable]
+    pruned = [op for index, (op, _) in enumerate(operators_and_tasks) if index not in reachable]
+    return kept, pruned
+
+
+def _validate_acyclic(nodes: list[Node]) -> None:
+    """Raise if the graph has a cycle."""
+    visited = set()
+    frontier = [index for index, node in enumerate(nodes) if not node.dependencies]
+    while frontier:
+        visited.add(frontier.pop())
+        frontier += [
+            other
+            for other, node in enumerate(nodes)
+            if other not in visited and other not in frontier and node.dependencies <= visited
+        ]
+
+    if len(visited) < len(nodes):
+        cycle = [nodes[index].operator.name for index in range(len(nodes)) if index not in visited]
+        raise CyclicDependencyError(", ".join(cycle))
+
+
+def execute(
+    nodes: list[Node],
+    catalog: Catalog,
+    max_workers: int,
+    on_start: Callable[[Operator], None] | None = None,
+    on_finish: Callable[[Operator], None] | None = None,
+) -> None:
+    """Run nodes on a pool of worker threads, each node as soon as its dependencies finish.
+
+    Callbacks are invoked on the calling thread. If a node fails, nodes that have not started are
+    cancelled and the exception is raised once running nodes finish.
+
+    Args:
+        nodes (list[Node]): Dependency graph from `compile_graph`.
+        catalog (Catalog): Catalog where operators register and read views.
+        max_workers (int): Maximum number of nodes running at the same time.
+        on_start (Callable[[Operator], None] | None, optional): Called when a node starts.
+        on_finish (Callable[[Operator], None] | None, optional): Called when a node finishes.
+
+    """
+    pending = dict(enumerate(nodes))
+    finished = set()
+    running: dict[concurrent.futures.Future, int] = {}
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as pool:
+        try:
+            while pending or running:
+                for index, node in list(pending.items()):
+                    if node.dependencies <= finished and len(running) < max_workers:
+                        del pending[index]
+                        if on_start is not None:
+                            on_start(node.operator)
+                        running[pool.submit(node.task, catalog)] = index
+
+                done, _ = concurrent.futures.wait(
+                    running, return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                for future in done:
+                    index = running.pop(future)
+                    future.result()
+                    finished.add(index)
+                    if on_finish is not None:
+                        on_finish(nodes[index].operator)
+
+        except BaseException as e:
+            pool.shutdown(wait=True, cancel_futures=True)
+            raise e
@@ -0,0 +1,62 @@
+"""DuckDB engine of a pipeline run, configured from settings or the pipeline definition."""
+
+import pathlib
+from typing import Any, Final
+
+import duckdb
+from pydantic import BaseModel, Field
+
+from settings import settings
+from src.command.run.catalog import Catalog
+
+
+class Engine(BaseModel):
+    """Configuration of the DuckDB connection that all operators of a pipeline run share."""
+
+    # Maximum memory DuckDB uses before spilling to `temp_directory`, e.g., "48GB". If None,
+    # DuckDB's default of 80% of RAM applies
+    memory_limit: str | None = Field(default_factory=lambda: settings.DUCKDB_MEMORY_LIMIT)
+
+    # Number of DuckDB threads. If None, DuckDB uses one per CPU core
+    threads: int | None = Field(default_factory=lambda: settings.DUCKDB_THREADS)
+
+    # Directory where DuckDB spills intermediate results that do not fit in memory
+    temp_directory: str = Field(default_factory=lambda: settings.DUCKDB_TEMP_DIRECTORY)
+
+    # Whether results keep the order of their inputs. Disabling it lets DuckDB spill more
+    # operators, e.g., large joins and aggregations
+    preserve_insertion_order: bool = Field(
+        default_factory=lambda: settings.DUCKDB_PRESERVE_INSERTION_ORDER
+    )
+
+    # DuckDB database file. If set, views and materialized tables stay in it after the run for
+    # follow-up queries. If None, the database is in memory
+    database: str | None = Field(default_factory=lambda: settings.DUCKDB_DATABASE_FILE)
+
+    # Keyword used in YAML to identify the engine configuration
+    YAML_KEY: Final[str] = "engine"
+
+    @staticmethod
+    def from_dict(data: dict[str, Any] | None) -> "Engine":
+        """Return an Engine from a dictionary, with settings for the keys it does not have."""
+        return Engine(**(data or {}))
+
+    def connect(self) -> duckdb.DuckDBPyConnection:
+        """Open a DuckDB connection with this configuration."""
+        pathlib.Path(self.temp_directory).mkdir(parents=True, exist_ok=True)
+        config: dict[str, Any] = {
+            "temp_directory": self.temp_directory,
+            "preserve_insertion_order": self.preserve_insertion_order,
+        }
+        if self.memory_limit is not None:
+            config["memory_limit"] = self.memory_limit
+        if self.threads is not None:
+            config["threads"] = self.threads
+
+        if self.database is not None:
+            pathlib.Path(self.database).parent.mkdir(parents=True, exist_ok=True)
+        return duckdb.connect(self.database or ":memory:", config=config)
+
+    def open_catalog(self) -> Catalog:
+        """Open a catalog on a new connection, which keeps its views if the database is a file."""
+        return Catalog(self.connect(), persist=self.database is not None)
@@ -0,0 +1,407 @@
+"""Run a pipeline over a fleet of robologs on a pool of worker processes."""
+
+import concurrent.futures
+import functools
+import multiprocessing
+import pathlib
+import time
+from collections.abc import Callable
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+from pydantic import BaseModel, ConfigDict
+
+from settings import settings
+from src.command.run import dag, fusion, ledger, operator, pipeline
+from src.command.run.catalog import Catalog
+from src.command.run.operator.base import Operator
+from src.command.run.operator.save import FileExtension
+from src.reader import factory
+
+
+class RobologResult(BaseModel):
+    """Outcome of running a pipeline, or its extract operators, on one robolog."""
+
+    # Path to the robolog
+    robolog_path: pathlib.Path
+
+    # Names of the operators that finished
+    finished: list[str] = []
+
+    # Names of the operators that were skipped because they were up to date
+    skipped: list[str] = []
+
+    # Names of the operators that were pruned because no saved DataFrame uses them
+    pruned: list[str] = []
+
+    # Error message if the run failed
+    error: str | None = None
+
+    # Wall time of the run in seconds
+    duration_seconds: float = 0.0
+
+    @property
+    def succeeded(self) -> bool:
+        """Return True if the run did not fail."""
+        return self.error is None
+
+
+class ExtractedRobolog(RobologResult):
+    """Outcome of running extract operators on one robolog, along with the extracted data."""
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    # Robolog UUID
+    robolog_id: str | None = None
+
+    # Start time of the robolog in seconds
+    start_seconds: float | None = None
+
+    # Extracted data of each view, either Arrow files backing it or the data itself
+    sources: dict[str, list[str] | pa.Table] = {}
+
+
+def _open_worker_catalog(pipeline_path: pathlib.Path) -> Catalog:
+    """Open a catalog for a worker process, in memory since processes cannot share a database."""
+    engine = pipeline.make_engine(pipeline_path)
+    return engine.model_copy(update={"database": None}).open_catalog()
+
+
+def run_robolog(  # noqa: PLR0913
+    pipeline_path: pathlib.Path,
+    robolog_path: pathlib.Path,
+    start_seconds: float | None,
+    end_seconds: float | None,
+    output: FileExtension,
+    dry_run: bool,
+    workers: int,
+    fuse_scans: bool,
+    force: bool,
+) -> RobologResult:
+    """Run the pipeline on one robolog. Errors are caught and reported in the result."""
+    result = RobologResult(robolog_path=robolog_path)
+    started_at = time.perf_counter()
+    try:
+        nodes, skipped, pruned = pipeline.make_nodes(
+            pipeline_path,
+            robolog_path,
+            start_seconds,
+            end_seconds,
+            output,
+            dry_run,
+            fuse_scans,
+            force,
+        )
+        result.skipped = [op.name for op in skipped]
+        result.pruned = [op.name for op in pruned]
+        with _open_worker_catalog(pipeline_path) as catalog:
+            dag.execute(
+                nodes, catalog, workers, on_finish=lambda op: result.finished.append(op.name)
+            )
+    except Exception as e:
+        result.error = f"{type(e).__name__}: {e}"
+    result.duration_seconds = time.perf_counter() - started_at
+    return result
+
+
+def extract_robolog(  # noqa: PLR0913
+    pipeline_path: pathlib.Path,
+    robolog_path: pathlib.Path,
+    start_seconds: float | None,
+    end_seconds: float | None,
+    workers: int,
+    fuse_scans: bool,
+) -> ExtractedRobolog:
+    """Run extract operators of the pipeline on one robolog and return the extracted data.
+
+    Views backed by Arrow files are returned as their file paths, so that only the paths are sent
+    back to the parent process. Other views are returned as Arrow tables. Errors are caught and
+    reported in the result.
+
+    """
+    result = ExtractedRobolog(robolog_path=robolog_path)
+    started_at = time.perf_counter()
+    try:
+        operators_and_tasks, pruned = dag.prune(
+            (op, pipeline.make_task(op, robolog_path, start_seconds, end_seconds))
+            for op in pipeline.make_operators(pipeline_path)
+        )
+        result.pruned = [op.name for op in pruned]
+        operators_and_tasks = [
+            (op, task)
+            for op, task in operators_and_tasks
+            if isinstance(op, pipeline.EXTRACT_OPERATORS)
+        ]
+        extracts = [op for op, _ in operators_and_tasks]
+        if fuse_scans:
+            operators_and_tasks = fusion.fuse_extracts(
+                operators_and_tasks, robolog_path, start_seconds, end_seconds
+            )
+
+        with _open_worker_catalog(pipeline_path) as catalog:
+            dag.execute(
+                dag.compile_graph(operators_and_tasks),
+                catalog,
+                workers,
+                on_finish=lambda op: result.finished.append(op.name),
+            )
+            result.sources = {
+                op.name: catalog.files(op.name) or catalog.view(op.name).arrow() for op in extracts
+            }
+
+        reader = factory.make_topic_message_reader(robolog_path)
+        result.robolog_id = reader.robolog_id
+        result.start_seconds = reader.start_seconds
+    except Exception as e:
+        result.error = f"{type(e).__name__}: {e}"
+    result.duration_seconds = time.perf_counter() - started_at
+    return result
+
+
+def _call_isolated(
+    function: Callable[[pathlib.Path], RobologResult],
+    robolog_path: pathlib.Path,
+    context: multiprocessing.context.BaseContext,
+) -> RobologResult:
+    """Call a function on a robolog in a process of its own."""
+    with concurrent.futures.ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+        return pool.submit(function, robolog_path).result()
+
+
+def _map(
+    function: Callable[[pathlib.Path], RobologResult],
+    robolog_paths: list[pathlib.Path],
+    jobs: int,
+    on_finish: Callable[[RobologResult], None] | None = None,
+) -> list[RobologResult]:
+    """Call a function on each robolog on a pool of `jobs` processes, in the order they finish.
+
+    A process that crashes, e.g., runs out of memory, breaks the pool and fails every robolog
+    that has not finished. Those robologs run again, each in a process of its own, so that only
+    the robolog that crashes its process fails.
+
+    """
+    results = []
+
+    def finish(robolog_path: pathlib.Path, future: concurrent.futures.Future) -> None:
+        try:
+            result = future.result()
+        except Exception as e:
+            result = RobologResult(robolog_path=robolog_path, error=f"{type(e).__name__}: {e}")
+        results.append(result)
+        if on_finish:
+            on_finish(result)
+
+    unfinished = []
+    context = multiprocessing.get_context("spawn")
+    with concurrent.futures.ProcessPoolExecutor(max_workers=jobs, mp_context=context) as pool:
+        futures = {pool.submit(function, path): path for path in robolog_paths}
+        for future in concurrent.futures.as_completed(futures):
+            if isinstance(future.exception(), concurrent.futures.process.BrokenProcessPool):
+                unfinished.append(futures[future])
+            else:
+                finish(futures[future], future)
+
+    if unfinished:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=jobs) as pool:
+            futures = {
+                pool.submit(_call_isolated, function, path, context): path for path in unfinished
+            }
+            for future in concurrent.futures.as_completed(futures):
+                finish(futures[future], future)
+    return results
+
+
+def run_fleet(  # noqa: PLR0913
+    pipeline_path: pathlib.Path,
+    robolog_paths: list[pathlib.Path],
+    start_seconds: float | None = None,
+    end_seconds: float | None = None,
+    output: FileExtension = FileExtension.PARQUET,
+    dry_run: bool = False,
+    jobs: int = 1,
+    workers: int = 1,
+    fuse_scans: bool = True,
+    force: bool = False,
+    on_finish: Callable[[RobologResult], None] | None = None,
+) -> list[RobologResult]:
+    """Run the pipeline on each robolog on its own, `jobs` robologs at the same time.
+
+    Args:
+        pipeline_path (pathlib.Path): Path to the pipeline definition YAML file.
+        robolog_paths (list[pathlib.Path]): Paths to the robologs.
+        start_seconds (float | None, optional): Start time in seconds.
+        end_seconds (float | None, optional): End time in seconds.
+        output (FileExtension, optional): Output file format for saved DataFrames.
+        dry_run (bool, optional): If True, execute the pipelines without saving results.
+        jobs (int, optional): Maximum number of robologs processed at the same time.
+        workers (int, optional): Maximum number of operators running at the same time per robolog.
+        fuse_scans (bool, optional): If True, extract operators share a single pass over a robolog.
+        force (bool, optional): If True, run all operators even if they are up to date.
+        on_finish (Callable[[RobologResult], None] | None, optional): Called with the result of
+            each robolog as it finishes.
+
+    Returns:
+        list[RobologResult]: Result of each robolog, in the order they finished.
+
+    """
+    function = functools.partial(
+        _run_robolog,
+        pipeline_path=pipeline_path,
+        start_seconds=start_seconds,
+        end_seconds=end_seconds,
+        output=output,
+        dry_run=dry_run,
+        workers=workers,
+        fuse_scans=fuse_scans,
+        force=force,
+    )
+    return _map(function, robolog_paths, jobs, on_finish)
+
+
+def _run_robolog(robolog_path: pathlib.Path, **kwargs: object) -> RobologResult:
+    """Call `run_robolog` with the robolog path first, so that it can be mapped over robologs."""
+    return run_robolog(robolog_path=robolog_path, **kwargs)
+
+
+def _extract_robolog(robolog_path: pathlib.Path, **kwargs: object) -> ExtractedRobolog:
+    """Call `extract_robolog` with the robolog path first, so it can be mapped over robologs."""
+    return extract_robolog(robolog_path=robolog_path, **kwargs)
+
+
+def register_union(name: str, extracted: list[ExtractedRobolog], catalog: Catalog) -> None:
+    """Register a view that unions the data a view was extracted into from each robolog.
+
+    The data of each robolog is registered as a view of its own, and the union view adds a
+    `robolog_id` column unless the data already has one. Columns are matched by name, so robologs
+    missing some columns, e.g., topics, still union.
+
+    """
+    selects = []
+    for index, robolog_ in enumerate(extracted):
+        source = robolog_.sources[name]
+        if isinstance(source, list):
+            source = ds.dataset(source, format="arrow")
+
+        robolog_view_name = f"{name}__robolog_{index}"
+        catalog.register(robolog_view_name, source)
+        if settings.ROBOLOG_ID_COLUMN_NAME in source.schema.names:
+            selects.append(f"SELECT * FROM {robolog_view_name}")  # noqa: S608
+        else:
+            column = f"'{robolog_.robolog_id}' AS {settings.ROBOLOG_ID_COLUMN_NAME}"
+            selects.append(f"SELECT {column}, * FROM {robolog_view_name}")  # noqa: S608
+    catalog.register(name, " UNION ALL BY NAME ".join(selects))
+
+
+def make_union_nodes(  # noqa: PLR0913
+    pipeline_path: pathlib.Path,
+    extracted: list[ExtractedRobolog],
+    start_seconds: float | None = None,
+    end_seconds: float | None = None,
+    output: FileExtension = FileExtension.PARQUET,
+    dry_run: bool = False,
+) -> list[dag.Node]:
+    """Compile the pipeline into a dependency graph over data extracted from many robologs.
+
+    Extract operators register views that union their data from all robologs, and save operators
+    write each view once for the whole fleet. Operators whose views are never saved are pruned,
+    as they are when extracting.
+
+    """
+    robolog_start_seconds = {robolog_.robolog_id: robolog_.start_seconds for robolog_ in extracted}
+
+    operators_and_tasks: list[tuple[Operator, Callable[[Catalog], object]]] = []
+    for op in pipeline.make_operators(pipeline_path):
+        match op:
+            case operator.TransformDataFrame():
+                operators_and_tasks.append((op, op.register))
+            case operator.SaveDataFrame():
+                task = functools.partial(
+                    op.write_fleet,
+                    robolog_start_seconds=robolog_start_seconds,
+                    start_seconds=start_seconds,
+                    end_seconds=end_seconds,
+                    ext=output,
+                    dry_run=dry_run,
+                )
+                operators_and_tasks.append((op, task))
+            case _:
+                operators_and_tasks.append(
+                    (op, functools.partial(register_union, op.name, extracted))
+                )
+    operators_and_tasks, _ = dag.prune(operators_and_tasks)
+    return dag.compile_graph(pipeline.materialize_shared_views(operators_and_tasks))
+
+
+def run_union(  # noqa: PLR0913
+    pipeline_path: pathlib.Path,
+    robolog_paths: list[pathlib.Path],
+    start_seconds: float | None = None,
+    end_seconds: float | None = None,
+    output: FileExtension = FileExtension.PARQUET,
+    dry_run: bool = False,
+    jobs: int = 1,
+    workers: int = 1,
+    fuse_scans: bool = True,
+    force: bool = False,
+    on_finish: Callable[[RobologResult], None] | None = None,
+    on_finish_operator: Callable[[Operator], None] | None = None,
+) -> list[RobologResult]:
+    """Extract data from each robolog, then run the rest of the pipeline once over their union.
+
+    Extract operators run on each robolog, `jobs` robologs at the same time. Their views are then
+    unioned across robologs in a single DuckDB session, where transform and save operators run.
+    Robologs that fail to extract are left out of the union. Unless `dry_run` is True, operators
+    that are up to date for the same robologs according to the run ledger are skipped.
+
+    Args:
+        pipeline_path (pathlib.Path): Path to the pipeline definition YAML file.
+        robolog_paths (list[pathlib.Path]): Paths to the robologs.
+        start_seconds (float | None, optional): Start time in seconds.
+        end_seconds (float | None, optional): End time in seconds.
+        output (FileExtension, optional): Output file format for saved DataFrames.
+        dry_run (bool, optional): If True, execute the pipeline without saving results.
+        jobs (int, optional): Maximum number of robologs processed at the same time.
+        workers (int, optional): Maximum number of operators running at the same time.
+        fuse_scans (bool, optional): If True, extract operators share a single pass over a robolog.
+        force (bool, optional): If True, run all operators over the union even if they are up to
+            date.
+        on_finish (Callable[[RobologResult], None] | None, optional): Called with the result of
+            each robolog as it finishes.
+        on_finish_operator (Callable[[Operator], None] | None, optional): Called with each
+            operator that finishes over the union.
+
+    Returns:
+        list[RobologResult]: Result of each robolog, in the order they finished.
+
+    """
+    function = functools.partial(
+        _extract_robolog,
+        pipeline_path=pipeline_path,
+        start_seconds=start_seconds,
+        end_seconds=end_seconds,
+        workers=workers,
+        fuse_scans=fuse_scans,
+    )
+    results = _map(function, robolog_paths, jobs, on_finish)
+
+    extracted = sorted(
+        (result for result in results if isinstance(result, ExtractedRobolog) and result.succeeded),
+        key=lambda result: result.robolog_path,
+    )
+    if extracted:
+        nodes = make_union_nodes(
+            pipeline_path, extracted, start_seconds, end_seconds, output, dry_run
+        )
+        if not dry_run:
+            seeds = [
+                *sorted(result.robolog_id for result in extracted),
+                str(start_seconds),
+                str(end_seconds),
+                output.value,
+            ]
+            operators_and_tasks, _ = ledger.plan_incremental(nodes, seeds, force)
+            nodes = dag.compile_graph(operators_and_tasks)
+        with pipeline.make_engine(pipeline_path).open_catalog() as catalog:
+            dag.execute(nodes, catalog, workers, on_finish=on_finish_operator)
+    return results
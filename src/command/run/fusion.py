@@ -0,0 +1,91 @@
+"""Fuse extract operators so that they share a single pass over the robolog."""
+
+import functools
+import pathlib
+import threading
+from collections.abc import Callable, Iterable
+from typing import Any
+
+import pyarrow.dataset as ds
+
+from src.command.run import operator
+from src.command.run.catalog import Catalog
+from src.command.run.operator.base import Operator
+from src.reader import factory
+from src.reader.scan import Scan
+
+# Operators that can share a pass over the robolog
+FUSIBLE_OPERATORS = (operator.ExtractTopic, operator.ExtractType, operator.ExtractFrequency)
+
+
+class SharedScan:
+    """A single pass over a robolog that serves several extract operators.
+
+    The first operator to read runs the pass for all of them, while the others wait for it.
+
+    """
+
+    def __init__(
+        self,
+        robolog_path: str | pathlib.Path,
+        scans: list[Scan],
+        start_seconds: float | None,
+        end_seconds: float | None,
+    ) -> None:
+        """Initialize the SharedScan."""
+        self._robolog_path = robolog_path
+        self._scans = scans
+        self._start_seconds = start_seconds
+        self._end_seconds = end_seconds
+        self._datasets: list[ds.Dataset] | None = None
+        self._error: Exception | None = None
+        self._lock = threading.Lock()
+
+    def read(self, index: int) -> ds.Dataset:
+        """Return the dataset of the scan at `index`, running the pass if it has not run yet."""
+        with self._lock:
+            if self._error is not None:
+                raise self._error
+
+            if self._datasets is None:
+                try:
+                    reader = factory.make_scan_reader(self._robolog_path)
+                    self._datasets = reader.read(
+                        self._scans, self._start_seconds, self._end_seconds
+                    )
+                except Exception as e:
+                    self._error = e
+                    raise e
+
+        return self._datasets[index]
+
+
+def _register(op: Operator, shared_scan: SharedScan, index: int, catalog: Catalog) -> None:
+    """Register the dataset of an operator from a shared scan as a DuckDB view."""
+    catalog.register(op.name, shared_scan.read(index))
+
+
+def fuse_extracts(
+    operators_and_tasks: Iterable[tuple[Operator, Callable[[Catalog], Any]]],
+    robolog_path: str | pathlib.Path,
+    start_seconds: float | None,
+    end_seconds: float | None,
+) -> list[tuple[Operator, Callable[[Catalog], Any]]]:
+    """Replace tasks of extract operators with tasks that share a single pass over the robolog.
+
+    Operators are left untouched if fewer than two of them can share a pass.
+
+    """
+    operators_and_tasks = list(operators_and_tasks)
+    fusible = [op for op, _ in operators_and_tasks if isinstance(op, FUSIBLE_OPERATORS)]
+    if len(fusible) < 2:  # noqa: PLR2004
+        return operators_and_tasks
+
+    shared_scan = SharedScan(robolog_path, [op.scan for op in fusible], start_seconds, end_seconds)
+    indices = {id(op): index for index, op in enumerate(fusible)}
+    return [
+        (op, functools.partial(_register, op, shared_scan, indices[id(op)]))
+        if id(op) in indices
+        else (op, task)
+        for op, task in operators_and_tasks
+    ]
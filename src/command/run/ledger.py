@@ -0,0 +1,166 @@
+"""Ledger of pipeline operators that finished, used to skip work in later runs when unchanged."""
+
+import contextlib
+import functools
+import hashlib
+import json
+import pathlib
+import sqlite3
+import time
+from collections.abc import Callable, Iterator
+from typing import Any
+
+import pyarrow.dataset as ds
+
+from settings import settings
+from src import dataset
+from src.command.run.catalog import Catalog
+from src.command.run.dag import Node
+from src.command.run.operator.base import Operator
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS ledger (
+    fingerprint TEXT PRIMARY KEY,
+    operator TEXT NOT NULL,
+    outputs TEXT NOT NULL,
+    finished_at REAL NOT NULL
+);
+"""
+
+
+@contextlib.contextmanager
+def _connect() -> Iterator[sqlite3.Connection]:
+    """Open the ledger, creating it if needed."""
+    path = pathlib.Path(settings.RUN_LEDGER_FILE)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(path, timeout=60)
+    try:
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.executescript(SCHEMA)
+        yield connection
+    finally:
+        connection.close()
+
+
+def fingerprint_nodes(nodes: list[Node], seeds: list[str]) -> list[str]:
+    """Return a fingerprint of each node.
+
+    A fingerprint covers the operator's definition, fingerprints of the nodes it depends on, and
+    seeds shared by the whole run, e.g., robolog identity and time window. So editing an operator
+    changes fingerprints of the operator and everything downstream of it.
+
+    """
+    fingerprints: dict[int, str] = {}
+
+    def fingerprint(index: int) -> str:
+        if index not in fingerprints:
+            op = nodes[index].operator
+            seed = [
+                type(op).__name__,
+                op.model_dump(mode="json"),
+                sorted(fingerprint(dependency) for dependency in nodes[index].dependencies),
+                seeds,
+            ]
+            fingerprints[index] = hashlib.sha256(json.dumps(seed).encode("utf8")).hexdigest()
+        return fingerprints[index]
+
+    return [fingerprint(index) for index in range(len(nodes))]
+
+
+def lookup(fingerprint: str) -> list[str] | None:
+    """Return output files of a finished operator, or None if it never finished or they are gone.
+
+    Output files that were compacted into other files count as existing.
+
+    """
+    with _connect() as connection:
+        row = connection.execute(
+            "SELECT outputs FROM ledger WHERE fingerprint = ?", (fingerprint,)
+        ).fetchone()
+
+    if row is None:
+        return None
+    outputs = json.loads(row[0])
+    exists = all(
+        pathlib.Path(output).exists() or dataset.is_compacted(output) for output in outputs
+    )
+    return outputs if exists else None
+
+
+def record(fingerprint: str, op: Operator, outputs: list[str]) -> None:
+    """Record that an operator finished along with its output files."""
+    with _connect() as connection:
+        connection.execute(
+            "INSERT OR REPLACE INTO ledger (fingerprint, operator, outputs, finished_at) "
+            "VALUES (?, ?, ?, ?)",
+            (fingerprint, op.name, json.dumps(outputs), time.time()),
+        )
+        connection.commit()
+
+
+def _run_and_record(
+    fingerprint: str, op: Operator, task: Callable[[Catalog], Any], catalog: Catalog
+) -> Any:  # noqa: ANN401
+    """Run a task and record it in the ledger."""
+    result = task(catalog)
+    outputs = catalog.files(op.output) if op.output is not None else [str(path) for path in result]
+    record(fingerprint, op, outputs)
+    return result
+
+
+def _reuse(op: Operator, outputs: list[str], catalog: Catalog) -> None:
+    """Register output files of a previous run as the view of an operator."""
+    catalog.register(op.output, ds.dataset(outputs, format="arrow"))
+
+
+def plan_incremental(
+    nodes: list[Node], seeds: list[str], force: bool = False
+) -> tuple[list[tuple[Operator, Callable[[Catalog], Any]]], list[Operator]]:
+    """Return operators and tasks to run so that outputs of unchanged operators are reused.
+
+    An operator is up to date if the ledger has its fingerprint and its output files still exist.
+    Operators that are not up to date run and are recorded. Up-to-date operators that they read
+    from register their previous output files, or run again if they have none, e.g., SQL
+    transforms whose views are lazy. All other up-to-date operators are skipped.
+
+    Args:
+        nodes (list[Node]): Dependency graph of the pipeline.
+        seeds (list[str]): Values that identify the run, e.g., robolog ID and time window.
+        force (bool, optional): If True, consider no operator up to date, but still record them.
+
+    Returns:
+        tuple[list[tuple[Operator, Callable[[Catalog], Any]]], list[Operator]]: Operators and
+            tasks to run, in the order they were defined, and operators that are skipped.
+
+    """
+    fingerprints = fingerprint_nodes(nodes, seeds)
+    outputs = [None if force else lookup(fingerprint) for fingerprint in fingerprints]
+
+    needed = {index for index, output in enumerate(outputs) if output is None}
+    frontier = list(needed)
+    while frontier:
+        for dependency in nodes[frontier.pop()].dependencies:
+            if dependency not in needed:
+                needed.add(dependency)
+                if not outputs[dependency]:  # no files to reuse, so it runs and needs its inputs
+                    frontier.append(dependency)
+
+    operators_and_tasks, skipped = [], []
+    for index, node in enumerate(nodes):
+        if index not in needed:
+            skipped.append(node.operator)
+        elif outputs[index]:
+            operators_and_tasks.append(
+                (node.operator, functools.partial(_reuse, node.operator, outputs[index]))
+            )
+        else:
+            operators_and_tasks.append(
+                (
+                    node.operator,
+                    functools.partial(
+                        _run_and_record, fingerprints[index], node.operator, node.task
+                    ),
+                )
+            )
+
+    return operators_and_tasks, skipped
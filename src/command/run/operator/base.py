@@ -1,7 +1,62 @@
 """Base class for all operators in the pipeline."""
 
+import functools
+from collections.abc import Callable
+from typing import Any
+
 from pydantic import BaseModel
 
+from src import profiling
+from src.command.run.catalog import Catalog
+
 
 class Operator(BaseModel):
     """Base class for all operators in the pipeline."""
+
+    # Name of the DuckDB view the operator registers or reads
+    name: str
+
+    @property
+    def output(self) -> str | None:
+        """Return the name of the DuckDB view the operator registers, if any."""
+        return self.name
+
+    def inputs(self, view_names: set[str]) -> set[str]:
+        """Return the views, among `view_names`, that the operator reads."""
+        return set()
+
+    def profiled(
+        self, task: Callable[[Catalog], Any], profiler: profiling.Profiler
+    ) -> Callable[[Catalog], Any]:
+        """Return the task of the operator wrapped to add a profile of each run to the profiler."""
+        return functools.partial(self._run_profiled, task, profiler)
+
+    def _run_profiled(
+        self, task: Callable[[Catalog], Any], profiler: profiling.Profiler, catalog: Catalog
+    ) -> Any:  # noqa: ANN401
+        """Run the task of the operator and add its profile to the profiler.
+
+        Profiling the output is measured too, since it runs the statements of lazy views.
+
+        """
+        profile = profiling.OperatorProfile(
+            name=self.name,
+            operator_type=type(self).__name__,
+            output=self.output,
+            inputs=sorted(self.inputs(catalog.view_names)),
+        )
+        with profiling.measure(profile):
+            result = task(catalog)
+            self._profile_output(catalog, result, profile)
+        profiler.add(profile)
+        return result
+
+    def _profile_output(
+        self,
+        catalog: Catalog,
+        result: Any,  # noqa: ANN401
+        profile: profiling.OperatorProfile,
+    ) -> None:
+        """Record rows and bytes of the view the operator registered in its profile."""
+        if self.output is not None:
+            profile.rows_out, profile.bytes_out = profiling.size_of(catalog.source(self.output))
@@ -3,11 +3,11 @@
 import pathlib
 from typing import Any, Final
 
-import duckdb
-
 from src.command.run import validate
+from src.command.run.catalog import Catalog
 from src.command.run.operator.base import Operator
 from src.reader import factory
+from src.reader.scan import FrequencyScan
 
 
 class ExtractFrequency(Operator):
@@ -32,6 +32,11 @@ class ExtractFrequency(Operator):
         """Return the finished status of the operator."""
         return f":white_check_mark: Extracted frequencies of {len(self.topics)} topics into **{self.name}**"  # noqa: E501
 
+    @property
+    def scan(self) -> FrequencyScan:
+        """Return what the operator reads, so that it can share a pass over the robolog."""
+        return FrequencyScan(topics=self.topics)
+
     @staticmethod
     def from_dict(data: dict[str, Any]) -> "ExtractFrequency":
         """Return an ExtractFrequency instance from a dictionary."""
@@ -43,6 +48,7 @@ class ExtractFrequency(Operator):
 
     def register(
         self,
+        catalog: Catalog,
         robolog_path: str | pathlib.Path,
         start_seconds: float | None,
         end_seconds: float | None,
@@ -50,6 +56,7 @@ class ExtractFrequency(Operator):
         """Extract frequency of messages from topics and register the result as a DuckDB view.
 
         Args:
+            catalog (Catalog): Catalog to register the view in.
             robolog_path (str | pathlib.Path): Path to the robolog file or directory.
             start_seconds (float | None): When to start reading messages.
             end_seconds (float | None): When to stop reading messages.
@@ -57,5 +64,4 @@ class ExtractFrequency(Operator):
         """
         reader = factory.make_topic_frequency_reader(robolog_path)
         dataset = reader.read(self.topics, start_seconds, end_seconds)
-        relation = duckdb.from_arrow(dataset)
-        duckdb.register(self.name, relation)
+        catalog.register(self.name, dataset)
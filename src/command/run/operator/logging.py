@@ -3,10 +3,8 @@
 import pathlib
 from typing import Any, Final
 
-import duckdb
-import pandas as pd
-
 from src.command.run import validate
+from src.command.run.catalog import Catalog
 from src.command.run.operator.base import Operator
 from src.reader import factory
 
@@ -17,6 +15,12 @@ class ExtractLogging(Operator):
     # Name of the DuckDB view to register
     name: str
 
+    # Minimum logging level to extract, e.g., "WARN". If None, all levels are extracted
+    min_level: str | None
+
+    # Substring that logger names must contain. If None, all loggers are extracted
+    name_filter: str | None
+
     # Keyword used in YAML to identify the operator
     YAML_KEYWORD: Final[str] = "extract_logging"
 
@@ -34,20 +38,28 @@ class ExtractLogging(Operator):
     def from_dict(data: dict[str, Any]) -> "ExtractLogging":
         """Return an ExtractLogging instance from a dictionary."""
         validate.validate_snake_case(data["name"])
-        return ExtractLogging(name=data["name"])
+        return ExtractLogging(
+            name=data["name"],
+            min_level=data.get("min_level"),
+            name_filter=data.get("name_filter"),
+        )
 
     def register(
         self,
+        catalog: Catalog,
         robolog_path: str | pathlib.Path,
+        start_seconds: float | None,
+        end_seconds: float | None,
     ) -> None:
         """Extract logging messages and register the result as a DuckDB view.
 
         Args:
+            catalog (Catalog): Catalog to register the view in.
             robolog_path (str | pathlib.Path): Path to the robolog file or directory.
+            start_seconds (float | None): When to start reading messages.
+            end_seconds (float | None): When to stop reading messages.
 
         """
-        reader = factory.make_topic_message_reader(robolog_path)
-        relation = duckdb.from_df(
-            pd.DataFrame([message.to_dict() for message in reader.logging_messages])
-        )
-        duckdb.register(self.name, relation)
+        reader = factory.make_logging_message_reader(robolog_path)
+        dataset = reader.read(start_seconds, end_seconds, self.min_level, self.name_filter)
+        catalog.register(self.name, dataset)
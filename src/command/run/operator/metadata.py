@@ -3,10 +3,10 @@
 import pathlib
 from typing import Any, Final
 
-import duckdb
 import pandas as pd
 
 from src.command.run import validate
+from src.command.run.catalog import Catalog
 from src.command.run.operator.base import Operator
 from src.reader import factory
 
@@ -38,11 +38,13 @@ class ExtractMetadata(Operator):
 
     def register(
         self,
+        catalog: Catalog,
         robolog_path: str | pathlib.Path,
     ) -> None:
         """Extract metadata and register the result as a DuckDB view.
 
         Args:
+            catalog (Catalog): Catalog to register the view in.
             robolog_path (str | pathlib.Path): Path to the robolog file or directory.
 
         """
@@ -58,5 +60,4 @@ class ExtractMetadata(Operator):
             "topics": reader.topics,
             "metadata": reader.metadata,
         }
-        relation = duckdb.from_df(pd.DataFrame([record]))
-        duckdb.register(self.name, relation)
+        catalog.register(self.name, pd.DataFrame([record]))
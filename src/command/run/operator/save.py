@@ -1,18 +1,24 @@
 """An operator that saves a DuckDB view to disk."""
 
+import hashlib
 import pathlib
 from datetime import datetime
 from enum import Enum
-from typing import Final
+from typing import Any, Final
 
-import duckdb
+import pyarrow.parquet as pq
+from pydantic import Field
 
 from settings import settings
-from src import robolog
+from src import dataset, profiling, robolog
 from src.command.run import validate
+from src.command.run.catalog import Catalog
 from src.command.run.operator.base import Operator
 from src.reader import factory
 
+# Partition column for the date a robolog started, which datasets are partitioned by by default
+DATESTR_COLUMN_NAME = "datestr"
+
 
 class FileExtension(Enum):
     """Enum for supported file extensions."""
@@ -28,10 +34,23 @@ class SaveDataFrame(Operator):
     # Name of the DuckDB view to save
     name: str
 
+    # Columns to partition Parquet datasets by. Besides columns of the view, "datestr" and
+    # "robolog_id" partition by the date and UUID of the robolog
+    partition_by: list[str] = Field(default_factory=lambda: [DATESTR_COLUMN_NAME])
+
+    # Columns to sort rows by within each Parquet file, if the view has them
+    sort_by: list[str] = Field(default_factory=lambda: [settings.TIMESTAMP_SECONDS_COLUMN_NAME])
+
+    # Target uncompressed size of row groups in Parquet files. Defaults to the setting if None
+    row_group_size_bytes: int | None = None
+
+    # Target uncompressed size of Parquet files. Defaults to the setting if None
+    file_size_bytes: int | None = None
+
     # Keyword used in YAML to identify the operator
     YAML_KEY: Final[str] = "save_dataframe"
 
-    # Path to the saved file. Used for status messages
+    # Path to the saved file or dataset. Used for status messages
     _saved_file_path: pathlib.Path
 
     @property
@@ -44,50 +63,152 @@ class SaveDataFrame(Operator):
         """Return the finished status of the operator."""
         return f":floppy_disk: Saved **{self.name}** to {self._saved_file_path}"
 
+    @property
+    def output(self) -> None:
+        """Return None, since the operator does not register a view."""
+        return None
+
+    def inputs(self, view_names: set[str]) -> set[str]:
+        """Return the view to save."""
+        return {self.name}
+
     @staticmethod
     def from_name(data: str) -> "SaveDataFrame":
         """Return a SaveDataFrame instance from a DataFrame name."""
         validate.validate_snake_case(data)
         return SaveDataFrame(name=data)
 
-    def write(
+    @staticmethod
+    def from_dict(data: dict[str, Any]) -> "SaveDataFrame":
+        """Return a SaveDataFrame instance from a dictionary with the name and write options."""
+        validate.validate_snake_case(data["name"])
+        return SaveDataFrame(**data)
+
+    def write(  # noqa: PLR0913
         self,
+        catalog: Catalog,
         robolog_path: str | pathlib.Path,
         start_seconds: float | None,
         end_seconds: float | None,
         ext: FileExtension = FileExtension.PARQUET,
         dry_run: bool = False,
-    ) -> pathlib.Path:
-        """Write the DuckDB view to disk and return the file path."""
+    ) -> list[pathlib.Path]:
+        """Write the DuckDB view from the catalog to disk and return paths to the written files."""
         reader = factory.make_topic_message_reader(robolog_path)
         datestr = datetime.fromtimestamp(reader.start_seconds).strftime("%Y-%m-%d")
         start_seconds = start_seconds or reader.start_seconds
         end_seconds = end_seconds or reader.end_seconds
 
+        basename = robolog.snippet_name(robolog_path, start_seconds, end_seconds)
+        constants = {
+            DATESTR_COLUMN_NAME: datestr,
+            settings.ROBOLOG_ID_COLUMN_NAME: reader.robolog_id,
+        }
+        return self._write(catalog, basename, constants, ext, dry_run)
+
+    def write_fleet(  # noqa: PLR0913
+        self,
+        catalog: Catalog,
+        robolog_start_seconds: dict[str, float],
+        start_seconds: float | None,
+        end_seconds: float | None,
+        ext: FileExtension = FileExtension.PARQUET,
+        dry_run: bool = False,
+    ) -> list[pathlib.Path]:
+        """Write a DuckDB view unioned over many robologs to disk and return the written files.
+
+        Args:
+            catalog (Catalog): Catalog to read the view from.
+            robolog_start_seconds (dict[str, float]): Start time in seconds of each robolog, keyed
+                by robolog ID. The earliest one decides the date partition.
+            start_seconds (float | None): Start time in seconds the robologs were read from.
+            end_seconds (float | None): End time in seconds the robologs were read until.
+            ext (FileExtension, optional): Output file format.
+            dry_run (bool, optional): If True, read the view without writing it.
+
+        Returns:
+            list[pathlib.Path]: Paths to the written files.
+
+        """
+        datestr = datetime.fromtimestamp(min(robolog_start_seconds.values())).strftime("%Y-%m-%d")
+        seed = "_".join([*sorted(robolog_start_seconds), str(start_seconds), str(end_seconds)])
+        digest = hashlib.sha256(seed.encode("utf8")).hexdigest()[:8]
+
+        basename = f"fleet_{digest}_{len(robolog_start_seconds)}"
+        return self._write(catalog, basename, {DATESTR_COLUMN_NAME: datestr}, ext, dry_run)
+
+    def _write(
+        self,
+        catalog: Catalog,
+        basename: str,
+        constants: dict[str, str],
+        ext: FileExtension,
+        dry_run: bool,
+    ) -> list[pathlib.Path]:
+        """Write the DuckDB view from the catalog to disk and return paths to the written files.
+
+        Parquet files are streamed into a dataset partitioned by `partition_by`, where `constants`
+        provide partition columns the view does not have. Other formats are written to a single
+        file partitioned by date. Rows of a previous write that were compacted are removed.
+
+        """
+        directory = pathlib.Path(settings.DATASET_DIRECTORY) / self.name
+        if ext == FileExtension.PARQUET:
+            self._saved_file_path = directory
+            relation = catalog.view(self.name)
+            if dry_run:
+                return []
+
+            extra_columns = [
+                f"'{constants[column]}' AS {column}"
+                for column in self.partition_by
+                if column in constants and column not in relation.columns
+            ]
+            if extra_columns:
+                relation = relation.project(", ".join(["*", *extra_columns]))
+            return dataset.write_parquet_dataset(
+                relation,
+                directory,
+                basename,
+                self.partition_by,
+                self.sort_by,
+                self.row_group_size_bytes,
+                self.file_size_bytes,
+            )
+
         file_path = (
-            pathlib.Path(settings.DATASET_DIRECTORY)
-            / self.name
-            / f"datestr={datestr}"
-            / f"{robolog.snippet_name(robolog_path, start_seconds, end_seconds)}.{ext.value}"
+            directory
+            / f"{DATESTR_COLUMN_NAME}={constants[DATESTR_COLUMN_NAME]}"
+            / f"{basename}.{ext.value}"
         )
-
         try:
-            relation = duckdb.view(self.name)
+            relation = catalog.view(self.name)
             if not dry_run:
                 file_path.parent.mkdir(parents=True, exist_ok=True)
                 match ext:
-                    case FileExtension.PARQUET:
-                        relation.write_parquet(str(file_path))
                     case FileExtension.CSV:
                         relation.write_csv(str(file_path))
                     case FileExtension.JSONL:
-                        duckdb.sql(f"COPY relation TO '{file_path!s}' (FORMAT 'JSON')")
+                        catalog.cursor.sql(f"COPY {self.name} TO '{file_path!s}' (FORMAT 'JSON')")
                     case _:
                         raise ValueError(f"Unsupported disk format: {ext}")
+                dataset.remove_compacted_rows(directory, basename)
             self._saved_file_path = file_path
+            return [] if dry_run else [file_path]
 
         except Exception as e:
             self._saved_file_path = None
             if not dry_run:
                 file_path.unlink(missing_ok=True)
             raise e
+
+    def _profile_output(
+        self,
+        catalog: Catalog,
+        result: list[pathlib.Path],
+        profile: profiling.OperatorProfile,
+    ) -> None:
+        """Record rows and bytes of the saved files in the profile."""
+        profile.bytes_out = sum(file.stat().st_size for file in result)
+        if all(file.suffix == ".parquet" for file in result):
+            profile.rows_out = sum(pq.read_metadata(file).num_rows for file in result)
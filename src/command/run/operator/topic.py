@@ -3,11 +3,11 @@
 import pathlib
 from typing import Any, Final
 
-import duckdb
-
 from src.command.run import validate
+from src.command.run.catalog import Catalog
 from src.command.run.operator.base import Operator
 from src.reader import factory
+from src.reader.scan import TopicScan
 
 
 class ExtractTopic(Operator):
@@ -22,6 +22,15 @@ class ExtractTopic(Operator):
     # Whether to perform a forward fill on the topics
     ffill: bool
 
+    # Dotted paths of fields to extract, starting with their topic. If None, all fields are
+    # extracted
+    fields: list[str] | None = None
+
+    # SQL expression that messages must satisfy, e.g., `"/battery".percentage < 0.2`. Evaluated
+    # before messages are cached, so rare events take little disk and memory. If None, all
+    # messages are extracted
+    filter: str | None = None
+
     # Keyword used in YAML to identify the operator
     YAML_KEYWORD: Final[str] = "extract_topic"
 
@@ -35,18 +44,30 @@ class ExtractTopic(Operator):
         """Return the finished status of the operator."""
         return f":white_check_mark: Extracted messages from {len(self.topics)} topics into **{self.name}**"  # noqa: E501
 
+    @property
+    def scan(self) -> TopicScan:
+        """Return what the operator reads, so that it can share a pass over the robolog."""
+        return TopicScan(
+            topics=self.topics, ffill=self.ffill, fields=self.fields, filter=self.filter
+        )
+
     @staticmethod
     def from_dict(data: dict[str, Any]) -> "ExtractTopic":
         """Return an ExtractTopic instance from a dictionary."""
         validate.validate_snake_case(data["name"])
+        if "filter" in data:
+            validate.validate_filter(data["filter"])
         return ExtractTopic(
             name=data["name"],
             topics=data["topics"],
             ffill=data.get("ffill", False),
+            fields=data.get("fields"),
+            filter=data.get("filter"),
         )
 
     def register(
         self,
+        catalog: Catalog,
         robolog_path: str | pathlib.Path,
         start_seconds: float | None,
         end_seconds: float | None,
@@ -54,12 +75,19 @@ class ExtractTopic(Operator):
         """Extract messages from topics and register the result as a DuckDB view.
 
         Args:
+            catalog (Catalog): Catalog to register the view in.
             robolog_path (str | pathlib.Path): Path to the robolog file or directory.
             start_seconds (float | None): When to start reading messages.
             end_seconds (float | None): When to stop reading messages.
 
         """
         reader = factory.make_topic_message_reader(robolog_path)
-        dataset = reader.read(self.topics, start_seconds, end_seconds, self.ffill)
-        relation = duckdb.from_arrow(dataset)
-        duckdb.register(self.name, relation)
+        dataset = reader.read(
+            self.topics,
+            start_seconds,
+            end_seconds,
+            self.ffill,
+            fields=self.fields,
+            filter=self.filter,
+        )
+        catalog.register(self.name, dataset)
@@ -1,10 +1,24 @@
 """An operator that applies a transformation on DuckDB views and return a new view."""
 
-from typing import Any, Final
+import collections
+import concurrent.futures
+import functools
+import hashlib
+import importlib
+import inspect
+import itertools
+import json
+import multiprocessing
+from collections.abc import Callable, Iterator
+from typing import Any, Final, Literal
 
-import duckdb
+import pyarrow as pa
+from pydantic import computed_field
 
+from settings import settings
+from src import profiling
 from src.command.run import validate
+from src.command.run.catalog import Catalog, referenced_views
 from src.command.run.operator.base import Operator
 
 
@@ -23,7 +37,17 @@ class TransformDataFrame(Operator):
         validate.validate_snake_case(data["name"])
         match data:
             case {"name": name, "sql": sql}:
-                return SqlTransformDataFrame(name=name, sql=sql)
+                return SqlTransformDataFrame(
+                    name=name, sql=sql, materialize=data.get("materialize", "auto")
+                )
+            case {"name": name, "input": input_name, "function": function}:
+                validate.validate_function_path(function)
+                return PythonTransformDataFrame(
+                    name=name,
+                    input=input_name,
+                    function=function,
+                    processes=data.get("processes", 1),
+                )
             case _:
                 raise ValueError(f"Failed to identify TransformDataFrame type: {data}")
 
@@ -34,6 +58,10 @@ class SqlTransformDataFrame(TransformDataFrame):
     # SQL statement to apply
     sql: str
 
+    # Whether to compute the view once rather than every time it is read. If "auto", views read
+    # by more than one operator are materialized
+    materialize: bool | Literal["auto"] = "auto"
+
     @property
     def running_status(self) -> str:
         """Return the running status of the operator."""
@@ -44,7 +72,162 @@ class SqlTransformDataFrame(TransformDataFrame):
         """Return the finished status of the operator."""
         return f":white_check_mark: Wrote SQL query result into **{self.name}**"
 
-    def register(self) -> None:
-        """Apply SQL statement and register the result as a DuckDB view."""
-        relation = duckdb.sql(self.sql)
-        duckdb.register(self.name, relation)
+    def inputs(self, view_names: set[str]) -> set[str]:
+        """Return the views, among `view_names`, that the SQL statement reads."""
+        return referenced_views(self.sql, view_names)
+
+    def should_materialize(self, consumer_count: int) -> bool:
+        """Return True if the view should be materialized, given how many operators read it."""
+        return consumer_count > 1 if self.materialize == "auto" else self.materialize
+
+    def register(self, catalog: Catalog, materialize: bool = False) -> None:
+        """Apply SQL statement and register the result as a DuckDB view.
+
+        If `materialize` is True, the statement runs right away and its result is registered
+        instead, so that operators reading the view do not run the statement again.
+
+        """
+        catalog.register(self.name, self.sql)
+        if materialize:
+            catalog.materialize(self.name, settings.MATERIALIZE_MAX_ARROW_BYTES)
+
+    def _profile_output(
+        self,
+        catalog: Catalog,
+        result: None,
+        profile: profiling.OperatorProfile,
+    ) -> None:
+        """Record rows of the view, running the SQL statement with EXPLAIN ANALYZE if it is lazy.
+
+        A lazy view has not run yet, so this is where the statement actually runs, once, within
+        the measured time of the operator, and the row count is taken from the plan. A materialized
+        view already ran the statement, so its rows are counted from the materialized result.
+
+        """
+        source = catalog.source(self.name)
+        if not isinstance(source, str):  # materialized into an Arrow table
+            super()._profile_output(catalog, result, profile)
+            return
+        if source != self.sql:  # materialized into a DuckDB table
+            profile.rows_out = catalog.view(self.name).count("*").fetchone()[0]
+            return
+
+        catalog.view(self.name)  # registers the views the statement reads on this cursor
+        plan = catalog.cursor.sql(f"EXPLAIN (ANALYZE, FORMAT JSON) {self.sql}").fetchone()[-1]
+        profile.explain_analyze = plan
+        profile.rows_out = _returned_row_count(json.loads(plan))
+
+
+def _returned_row_count(plan: dict[str, Any]) -> int | None:
+    """Return the number of rows the top operator of a JSON query plan returned."""
+    node = plan
+    while node.get("children") and node.get("operator_type") in (None, "EXPLAIN_ANALYZE"):
+        node = node["children"][0]
+    return node.get("operator_cardinality")
+
+
+@functools.cache
+def load_function(function_path: str) -> Callable[[pa.RecordBatch], pa.RecordBatch | pa.Table]:
+    """Import a function from a path in the "module:function" format."""
+    module_name, function_name = function_path.split(":")
+    return getattr(importlib.import_module(module_name), function_name)
+
+
+def _apply(function_path: str, batch: pa.RecordBatch) -> list[pa.RecordBatch]:
+    """Apply a function to a record batch and return the resulting record batches."""
+    result = load_function(function_path)(batch)
+    return result.to_batches() if isinstance(result, pa.Table) else [result]
+
+
+def _map_in_order(
+    function: Callable[[pa.RecordBatch], list[pa.RecordBatch]],
+    batches: Iterator[pa.RecordBatch],
+    pool: concurrent.futures.Executor,
+    max_pending: int,
+) -> Iterator[pa.RecordBatch]:
+    """Map a function over record batches on a pool, in order, with a bounded number in flight."""
+    pending: collections.deque[concurrent.futures.Future] = collections.deque()
+    for batch in batches:
+        pending.append(pool.submit(function, batch))
+        if len(pending) >= max_pending:
+            yield from pending.popleft().result()
+    while pending:
+        yield from pending.popleft().result()
+
+
+class PythonTransformDataFrame(TransformDataFrame):
+    """An operator that applies a Python function to record batches of a DuckDB view.
+
+    The function takes a `pa.RecordBatch` and returns a `pa.RecordBatch` or `pa.Table`, and must
+    be importable, e.g., from a module on the PYTHONPATH. The input view is streamed through the
+    function batch by batch, so only a few batches are in memory at a time, and the results are
+    streamed into a DuckDB table.
+
+    """
+
+    # Name of the DuckDB view to read
+    input: str
+
+    # Function to apply, in the "module:function" format
+    function: str
+
+    # Number of processes to apply the function in. Only for functions that keep no state
+    # across batches. If 1, the function is applied on the worker thread of the operator
+    processes: int = 1
+
+    @computed_field
+    @property
+    def function_digest(self) -> str:
+        """Return a digest of the function's source code, so that the run ledger notices edits."""
+        try:
+            source = inspect.getsource(load_function(self.function))
+        except (OSError, TypeError, ImportError, AttributeError):
+            source = ""
+        return hashlib.sha256(source.encode("utf8")).hexdigest()
+
+    @property
+    def running_status(self) -> str:
+        """Return the running status of the operator."""
+        return f"Applying {self.function} to **{self.input}** into **{self.name}**"
+
+    @property
+    def finished_status(self) -> str:
+        """Return the finished status of the operator."""
+        return f":white_check_mark: Applied {self.function} into **{self.name}**"
+
+    def inputs(self, view_names: set[str]) -> set[str]:
+        """Return the view the function is applied to."""
+        return {self.input}
+
+    def register(self, catalog: Catalog) -> None:
+        """Apply the function to record batches of the input view and register the result."""
+        reader = catalog.view(self.input).fetch_record_batch()
+
+        if self.processes > 1:
+            context = multiprocessing.get_context("spawn")
+            with concurrent.futures.ProcessPoolExecutor(self.processes, mp_context=context) as pool:
+                batches = _map_in_order(
+                    functools.partial(_apply, self.function), reader, pool, 2 * self.processes
+                )
+                self._register_batches(catalog, reader.schema, batches)
+        else:
+            batches = itertools.chain.from_iterable(
+                _apply(self.function, batch) for batch in reader
+            )
+            self._register_batches(catalog, reader.schema, batches)
+
+    def _register_batches(
+        self, catalog: Catalog, input_schema: pa.Schema, batches: Iterator[pa.RecordBatch]
+    ) -> None:
+        """Register resulting record batches, taking their schema from the first one."""
+        first_batches = list(itertools.islice(batches, 1))
+        if not first_batches:  # empty input, so apply the function to an empty batch for a schema
+            first_batches = _apply(
+                self.function, pa.RecordBatch.from_pylist([], schema=input_schema)
+            )
+        catalog.register_batches(
+            self.name,
+            pa.RecordBatchReader.from_batches(
+                first_batches[0].schema, itertools.chain(first_batches, batches)
+            ),
+        )
@@ -3,11 +3,11 @@
 import pathlib
 from typing import Any, Final
 
-import duckdb
-
 from src.command.run import validate
+from src.command.run.catalog import Catalog
 from src.command.run.operator.base import Operator
 from src.reader import factory
+from src.reader.scan import TypeScan
 
 
 class ExtractType(Operator):
@@ -22,6 +22,13 @@ class ExtractType(Operator):
     # List of topics to exclude from the extraction
     exclude_topics: list[str]
 
+    # Dotted paths of message fields to extract. If None, all fields are extracted
+    fields: list[str] | None = None
+
+    # SQL expression that messages must satisfy, e.g., `message.percentage < 0.2`. Evaluated
+    # before messages are cached. If None, all messages are extracted
+    filter: str | None = None
+
     # Keyword used in YAML to identify the operator
     YAML_KEYWORD: Final[str] = "extract_type"
 
@@ -35,18 +42,33 @@ class ExtractType(Operator):
         """Return the finished status of the operator."""
         return f":white_check_mark: Extracted messages of '{self.type_name}' into **{self.name}**"
 
+    @property
+    def scan(self) -> TypeScan:
+        """Return what the operator reads, so that it can share a pass over the robolog."""
+        return TypeScan(
+            type_name=self.type_name,
+            exclude_topics=self.exclude_topics,
+            fields=self.fields,
+            filter=self.filter,
+        )
+
     @staticmethod
     def from_dict(data: dict[str, Any]) -> "ExtractType":
         """Return an ExtractType instance from a dictionary."""
         validate.validate_snake_case(data["name"])
+        if "filter" in data:
+            validate.validate_filter(data["filter"])
         return ExtractType(
             name=data["name"],
             type_name=data["type_name"],
             exclude_topics=data.get("exclude_topics", []),
+            fields=data.get("fields"),
+            filter=data.get("filter"),
         )
 
     def register(
         self,
+        catalog: Catalog,
         robolog_path: str | pathlib.Path,
         start_seconds: float | None,
         end_seconds: float | None,
@@ -54,6 +76,7 @@ class ExtractType(Operator):
         """Extract messages of a particular type and register the result as a DuckDB view.
 
         Args:
+            catalog (Catalog): Catalog to register the view in.
             robolog_path (str | pathlib.Path): Path to the robolog file or directory.
             start_seconds (float | None): When to start reading messages.
             end_seconds (float | None): When to stop reading messages.
@@ -61,7 +84,11 @@ class ExtractType(Operator):
         """
         reader = factory.make_type_message_reader(robolog_path)
         dataset = reader.read(
-            self.type_name, start_seconds, end_seconds, exclude_topics=self.exclude_topics
+            self.type_name,
+            start_seconds,
+            end_seconds,
+            exclude_topics=self.exclude_topics,
+            fields=self.fields,
+            filter=self.filter,
         )
-        relation = duckdb.from_arrow(dataset)
-        duckdb.register(self.name, relation)
+        catalog.register(self.name, dataset)
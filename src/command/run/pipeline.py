@@ -0,0 +1,211 @@
+"""Build pipelines of operators and their tasks from pipeline definition YAML files."""
+
+import functools
+import pathlib
+from collections import Counter
+from collections.abc import Callable
+from typing import Any
+
+import yaml
+
+from src import robolog
+from src.command.run import dag, fusion, ledger, operator, validate
+from src.command.run.catalog import Catalog
+from src.command.run.engine import Engine
+from src.command.run.operator.base import Operator
+from src.command.run.operator.save import FileExtension
+from src.command.run.operator.transform import SqlTransformDataFrame
+
+# Operators that extract data from a robolog
+EXTRACT_OPERATORS = (
+    operator.ExtractTopic,
+    operator.ExtractType,
+    operator.ExtractFrequency,
+    operator.ExtractLogging,
+    operator.ExtractMetadata,
+)
+
+
+def make_operators(pipeline_path: pathlib.Path) -> list[Operator]:
+    """Parse the pipeline definition YAML file and return its operators in definition order."""
+    if not pipeline_path.exists():
+        raise FileNotFoundError(pipeline_path)
+
+    main_config = yaml.safe_load(pipeline_path.read_text().encode("utf-8"))
+    main_config.pop(Engine.YAML_KEY, None)
+
+    operators = []
+    for operator_type, configs in main_config.items():
+        match operator_type:
+            case operator.ExtractTopic.YAML_KEYWORD:
+                operators += [operator.ExtractTopic.from_dict(params) for params in configs]
+
+            case operator.ExtractType.YAML_KEYWORD:
+                operators += [operator.ExtractType.from_dict(params) for params in configs]
+
+            case operator.ExtractFrequency.YAML_KEYWORD:
+                operators += [operator.ExtractFrequency.from_dict(params) for params in configs]
+
+            case operator.ExtractLogging.YAML_KEYWORD:
+                operators += [operator.ExtractLogging.from_dict(params) for params in configs]
+
+            case operator.ExtractMetadata.YAML_KEYWORD:
+                operators += [operator.ExtractMetadata.from_dict(params) for params in configs]
+
+            case operator.TransformDataFrame.YAML_KEYWORD:
+                operators += [operator.TransformDataFrame.from_dict(params) for params in configs]
+
+            case operator.SaveDataFrame.YAML_KEY:
+                operators += [
+                    operator.SaveDataFrame.from_dict(config)
+                    if isinstance(config, dict)
+                    else operator.SaveDataFrame.from_name(config)
+                    for config in configs
+                ]
+
+            case _:
+                raise ValueError(f"Unknown operator type: {operator_type}")
+
+    validate.validate_unique_dataframe_names(
+        [op.name for op in operators if not isinstance(op, operator.SaveDataFrame)]
+    )
+    return operators
+
+
+def make_engine(pipeline_path: pathlib.Path) -> Engine:
+    """Return the DuckDB engine configured in the pipeline definition YAML file, or by settings."""
+    if not pipeline_path.exists():
+        raise FileNotFoundError(pipeline_path)
+
+    main_config = yaml.safe_load(pipeline_path.read_text().encode("utf-8"))
+    return Engine.from_dict(main_config.get(Engine.YAML_KEY))
+
+
+def make_task(  # noqa: PLR0913
+    op: Operator,
+    robolog_path: pathlib.Path,
+    start_seconds: float | None = None,
+    end_seconds: float | None = None,
+    output: FileExtension = FileExtension.PARQUET,
+    dry_run: bool = False,
+) -> Callable[[Catalog], Any]:
+    """Return the task of an operator, which takes the catalog of the pipeline run."""
+    match op:
+        case operator.ExtractMetadata():
+            return functools.partial(op.register, robolog_path=robolog_path)
+
+        case operator.TransformDataFrame():
+            return op.register
+
+        case operator.SaveDataFrame():
+            return functools.partial(
+                op.write,
+                robolog_path=robolog_path,
+                start_seconds=start_seconds,
+                end_seconds=end_seconds,
+                ext=output,
+                dry_run=dry_run,
+            )
+
+        case _:
+            return functools.partial(
+                op.register,
+                robolog_path=robolog_path,
+                start_seconds=start_seconds,
+                end_seconds=end_seconds,
+            )
+
+
+def materialize_shared_views(
+    operators_and_tasks: list[tuple[Operator, Callable[[Catalog], Any]]],
+) -> list[tuple[Operator, Callable[[Catalog], Any]]]:
+    """Make SQL transforms materialize their views when their policy asks for it.
+
+    By default, views that more than one operator reads, including save operators, are
+    materialized, so that their SQL statements and everything upstream run once.
+
+    """
+    nodes = dag.compile_graph(operators_and_tasks)
+    consumer_counts = Counter(dependency for node in nodes for dependency in node.dependencies)
+    return [
+        (op, functools.partial(op.register, materialize=True))
+        if isinstance(op, SqlTransformDataFrame) and op.should_materialize(consumer_counts[index])
+        else (op, task)
+        for index, (op, task) in enumerate(operators_and_tasks)
+    ]
+
+
+def make_operators_and_tasks(  # noqa: PLR0913
+    pipeline_path: pathlib.Path,
+    robolog_path: pathlib.Path,
+    start_seconds: float | None = None,
+    end_seconds: float | None = None,
+    output: FileExtension = FileExtension.PARQUET,
+    dry_run: bool = False,
+    fuse_scans: bool = True,
+    prune: bool = True,
+) -> tuple[list[tuple[Operator, Callable[[Catalog], Any]]], list[Operator]]:
+    """Parse the pipeline definition YAML file and return operators and their tasks.
+
+    Each task takes the catalog of the pipeline run as its only argument. If `prune` is True,
+    operators whose views are never saved are dropped. If `fuse_scans` is True, the remaining
+    extract operators share a single pass over the robolog. SQL transforms materialize their
+    views according to their policy.
+
+    Returns:
+        tuple[list[tuple[Operator, Callable[[Catalog], Any]]], list[Operator]]: Operators and
+            their tasks, and operators that were pruned.
+
+    """
+    if not robolog_path.exists():
+        raise FileNotFoundError(robolog_path)
+
+    operators_and_tasks = [
+        (op, make_task(op, robolog_path, start_seconds, end_seconds, output, dry_run))
+        for op in make_operators(pipeline_path)
+    ]
+
+    pruned = []
+    if prune:
+        operators_and_tasks, pruned = dag.prune(operators_and_tasks)
+
+    operators_and_tasks = materialize_shared_views(operators_and_tasks)
+    if fuse_scans:
+        operators_and_tasks = fusion.fuse_extracts(
+            operators_and_tasks, robolog_path, start_seconds, end_seconds
+        )
+    return operators_and_tasks, pruned
+
+
+def make_nodes(  # noqa: PLR0913
+    pipeline_path: pathlib.Path,
+    robolog_path: pathlib.Path,
+    start_seconds: float | None = None,
+    end_seconds: float | None = None,
+    output: FileExtension = FileExtension.PARQUET,
+    dry_run: bool = False,
+    fuse_scans: bool = True,
+    force: bool = False,
+    prune: bool = True,
+) -> tuple[list[dag.Node], list[Operator], list[Operator]]:
+    """Compile the pipeline into a dependency graph and return it with operators not to run.
+
+    Unless `dry_run` is True, operators that are up to date according to the run ledger are
+    skipped or reuse their previous outputs. If `force` is True, all operators run again. If
+    `prune` is True, operators whose views are never saved are pruned.
+
+    Returns:
+        tuple[list[dag.Node], list[Operator], list[Operator]]: Dependency graph, operators that
+            are skipped because they are up to date, and operators that are pruned.
+
+    """
+    operators_and_tasks, pruned = make_operators_and_tasks(
+        pipeline_path, robolog_path, start_seconds, end_seconds, output, dry_run, fuse_scans, prune
+    )
+    nodes = dag.compile_graph(operators_and_tasks)
+    if dry_run:
+        return nodes, [], pruned
+
+    seeds = [robolog.generate_id(robolog_path), str(start_seconds), str(end_seconds), output.value]
+    operators_and_tasks, skipped = ledger.plan_incremental(nodes, seeds, force)
+    return dag.compile_graph(operators_and_tasks), skipped, pruned
@@ -3,6 +3,8 @@
 import re
 from collections import Counter
 
+from src import predicate
+
 
 class DataFrameAlreadyDefinedError(Exception):
     """Raised when a DataFrame with the same name is already defined."""
@@ -23,6 +25,17 @@ def validate_snake_case(s: str) -> None:
         raise ValueError(f"'{s}' is not in snake_case format.")
 
 
+def validate_function_path(s: str) -> None:
+    """Raise if a string is not a path to a Python function in the "module:function" format."""
+    if re.fullmatch(r"[A-Za-z_][\w.]*:[A-Za-z_]\w*", s or "") is None:
+        raise ValueError(f"'{s}' is not in module:function format.")
+
+
+def validate_filter(s: str) -> None:
+    """Raise if a string is not a single SQL expression to filter messages with."""
+    predicate.MessageFilter(s)
+
+
 def validate_unique_dataframe_names(names: list[str]) -> None:
     """Raise if there are duplicate DataFrame names."""
     name_counts = Counter(names)
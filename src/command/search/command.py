@@ -0,0 +1,42 @@
+"""Implementation of the search-logs command for Bagel CLI."""
+
+import pathlib
+from typing import Annotated
+
+import rich
+import typer
+from rich.table import Table
+
+from src import search
+
+app = typer.Typer()
+
+
+@app.command()
+def search_logs(
+    query: Annotated[
+        str,
+        typer.Argument(
+            help="Full-text query, e.g., '\"EKF2 IMU stopped\"' for a phrase", show_default=False
+        ),
+    ],
+    robolog_paths: Annotated[
+        list[pathlib.Path] | None,
+        typer.Argument(help="Robologs to search. If omitted, search all indexed robologs"),
+    ] = None,
+    limit: Annotated[int, typer.Option(help="Maximum number of hits to show")] = 100,
+) -> None:
+    """Search logging messages of robologs, indexing them first if needed."""
+    hits = search.search_logs(query, robolog_paths or None, limit)
+
+    table = Table("Robolog", "Timestamp (ms)", "Level", "Name", "Message")
+    for hit in hits:
+        table.add_row(
+            hit["path"],
+            str(hit["timestamp_milliseconds"]),
+            hit["level"],
+            hit["name"] or "",
+            hit["message"],
+        )
+    rich.print(table)
+    rich.print(f"Found [bold]{len(hits)}[/bold] hit{'s' if len(hits) != 1 else ''}")
@@ -1,12 +1,147 @@
-"""Base class for converting messages into JSON-serializable dictionaries."""
+"""Base class for converting messages into JSON-serializable dictionaries and Arrow arrays."""
 
 import abc
-from typing import Any
+import copy
+from collections.abc import Callable, Sequence
+from typing import Any, TypeVar
+
+import pyarrow as pa
+
+T = TypeVar("T")
+
+
+class SchemaMismatchError(TypeError):
+    """Raised when a converted Arrow array does not conform to the converter's `pa_struct`."""
+
+
+class FieldsNotFoundError(ValueError):
+    """Raised when fields to project are not found in a message schema."""
+
+
+# Fields to keep under a struct, by name. None keeps a field with everything under it
+FieldTree = dict[str, "FieldTree | None"]
+
+
+def field_tree(fields: list[str]) -> FieldTree:
+    """Return a tree of fields to keep from dotted paths, e.g., "pose.position" and "header".
+
+    A path keeps everything under it, so it takes precedence over longer paths it starts.
+
+    """
+    tree: FieldTree = {}
+    for path in sorted(fields, key=len):
+        node: FieldTree | None = tree
+        *parents, leaf = path.split(".")
+        for name in parents:
+            node = node.setdefault(name, {})
+            if node is None:  # a shorter path already keeps everything under it
+                break
+        else:
+            node[leaf] = None
+    return tree
+
+
+def _project_type(pa_type: pa.DataType, tree: FieldTree | None, path: str) -> pa.DataType:
+    """Return a type with only the fields of a tree, looking through lists of structs."""
+    if tree is None:
+        return pa_type
+
+    if pa.types.is_struct(pa_type):
+        missing = set(tree) - {field.name for field in pa_type}
+        if missing:
+            raise FieldsNotFoundError(sorted(f"{path}{name}" for name in missing))
+        return pa.struct(
+            [
+                field.with_type(_project_type(field.type, tree[field.name], f"{path}{field.name}."))
+                for field in pa_type
+                if field.name in tree
+            ]
+        )
+
+    if pa.types.is_fixed_size_list(pa_type) or pa.types.is_list(pa_type):
+        value_field = pa_type.value_field
+        value_field = value_field.with_type(_project_type(value_field.type, tree, path))
+        return pa.list_(
+            value_field, pa_type.list_size if pa.types.is_fixed_size_list(pa_type) else -1
+        )
+
+    raise FieldsNotFoundError(sorted(f"{path}{name}" for name in tree))
+
+
+def project_struct(pa_struct: pa.StructType, fields: list[str]) -> pa.StructType:
+    """Return a struct type with only the fields at dotted paths, in their original order.
+
+    Paths go through lists of structs, e.g., "markers.pose" keeps the pose of every marker.
+
+    Raises:
+        FieldsNotFoundError: If a path does not exist in the struct type.
+
+    """
+    return _project_type(pa_struct, field_tree(fields), "")
+
+
+def with_nulls(values: Sequence[T | None], build: Callable[[list[T]], pa.Array]) -> pa.Array:
+    """Build an Arrow array from values where None entries become null slots.
+
+    `build` is only called with the non-null values, so it never has to deal with None.
+
+    """
+    present = [value for value in values if value is not None]
+    array = build(present)
+    if len(present) == len(values):
+        return array
+
+    positions, indices = iter(range(len(present))), []
+    for value in values:
+        indices.append(next(positions) if value is not None else None)
+    return array.take(pa.array(indices, type=pa.int64()))
 
 
 class MessageConverter(abc.ABC):
-    """Abstract base class for converting messages into dictionaries."""
+    """Abstract base class for converting messages into dictionaries and Arrow arrays."""
+
+    @property
+    @abc.abstractmethod
+    def pa_struct(self) -> pa.StructType:
+        """Return the pyarrow StructType that represents the message schema."""
 
     @abc.abstractmethod
     def to_dict(self, message: object) -> dict[str, Any]:
         """Convert a message to a JSON-serializable dictionary."""
+
+    def to_arrow(self, messages: Sequence[object | None]) -> pa.StructArray:
+        """Convert a batch of messages to a StructArray of type `pa_struct`.
+
+        None entries in `messages` become null rows.
+
+        Raises:
+            SchemaMismatchError: If the converted array does not conform to `pa_struct`.
+
+        """
+        array = with_nulls(messages, self._to_arrow)
+        if not array.type.equals(self.pa_struct):
+            raise SchemaMismatchError(f"Expected {self.pa_struct}, got {array.type}")
+        return array
+
+    def project(self, fields: list[str]) -> "MessageConverter":
+        """Return a converter of only the fields at dotted paths, e.g., "pose.pose.position".
+
+        Subclasses keep their schema in `_pa_struct` and convert the fields of it by name, so
+        the returned converter skips fields that are not projected, and everything under them.
+
+        Raises:
+            FieldsNotFoundError: If a path does not exist in the message schema.
+
+        """
+        projected = copy.copy(self)
+        projected._pa_struct = project_struct(self.pa_struct, fields)
+        return projected
+
+    def _to_arrow(self, messages: list[object]) -> pa.StructArray:
+        """Convert a batch of non-null messages to a StructArray.
+
+        Subclasses should override this to fill columnar buffers directly. The default
+        implementation goes through `to_dict`.
+
+        """
+        return pa.array([self.to_dict(message) for message in messages], type=self.pa_struct)
@@ -3,6 +3,10 @@
 import pyarrow as pa
 from google.protobuf.descriptor import Descriptor, FieldDescriptor
 
+# Well-known types that are cast to Arrow temporal types instead of structs
+TIMESTAMP_TYPE_NAME = "google.protobuf.Timestamp"
+DURATION_TYPE_NAME = "google.protobuf.Duration"
+
 
 def cast_field_descriptor(descriptor: FieldDescriptor) -> pa.DataType:  # noqa: C901, PLR0912
     """Cast a Protobuf FieldDescriptor to its corresponding PyArrow DataType."""
@@ -32,13 +36,10 @@ def cast_field_descriptor(descriptor: FieldDescriptor) -> pa.DataType:  # noqa:
         case FieldDescriptor.TYPE_STRING:
             pa_type = pa.string()
         case FieldDescriptor.TYPE_MESSAGE:
-            if descriptor.message_type.full_name in (
-                "google.protobuf.Timestamp",  # '2018-07-11T03:58:12.813431Z'
-                "google.protobuf.Duration",  # '93784.500600s'
-            ):
-                # The underlying data is a struct, but json_format.MessageToDict translates
-                # these two types into special strings.
-                pa_type = pa.string()
+            if descriptor.message_type.full_name == TIMESTAMP_TYPE_NAME:
+                pa_type = pa.timestamp("ns", tz="UTC")
+            elif descriptor.message_type.full_name == DURATION_TYPE_NAME:
+                pa_type = pa.duration("ns")
             else:
                 pa_type = cast_message_descriptor(descriptor.message_type)
         case _:
@@ -3,7 +3,8 @@
 from typing import Any
 
 import pyarrow as pa
-from google.protobuf import descriptor_pb2, json_format
+from google.protobuf import descriptor_pb2
+from google.protobuf.descriptor import Descriptor, FieldDescriptor
 from google.protobuf.descriptor_pool import DescriptorPool
 from google.protobuf.message import Message
 
@@ -16,7 +17,13 @@ class TypeNameNotFoundError(Exception):
 
 
 class MessageConverter(converter.MessageConverter):
-    """Convert Protobuf messages to JSON-serializable dictionaries."""
+    """Convert Protobuf messages to dictionaries and Arrow arrays by walking their descriptors.
+
+    Fields are read natively rather than through `json_format`, so dictionaries and Arrow arrays
+    both agree with `pa_struct`: 64-bit integers stay integers, bytes stay binary, and
+    Timestamp/Duration become Arrow temporal types, or integer nanoseconds in dictionaries.
+
+    """
 
     def __init__(self, type_name: str, file_descriptor_set_bytes: bytes) -> None:
         """Initialize a Protobuf MessageConverter.
@@ -39,6 +46,7 @@ class MessageConverter(converter.MessageConverter):
             pool.Add(file_descriptor)
 
         if message_descriptor := pool.FindMessageTypeByName(type_name):
+            self._descriptor = message_descriptor
             self._pa_struct = cast.cast_message_descriptor(message_descriptor)
         else:
             raise TypeNameNotFoundError(type_name)
@@ -59,9 +67,116 @@ class MessageConverter(converter.MessageConverter):
         return self._pa_struct
 
     def to_dict(self, message: Message) -> dict[str, Any]:
-        """Convert a Protobuf message to a JSON-serializable dictionary."""
-        return json_format.MessageToDict(
-            message,
-            preserving_proto_field_name=True,
-            use_integers_for_enums=True,
-        )
+        """Convert a Protobuf message to a dictionary that Arrow reads as a value of `pa_struct`."""
+        return self._message_dict(self._descriptor, self._pa_struct, message)
+
+    def _message_dict(
+        self, descriptor: Descriptor, pa_struct: pa.StructType, message: Message
+    ) -> dict[str, Any]:
+        return {  # only fields of a projected struct are converted
+            pa_field.name: self._field_value(
+                descriptor.fields_by_name[pa_field.name], pa_field.type, message
+            )
+            for pa_field in pa_struct
+        }
+
+    def _field_value(
+        self, field: FieldDescriptor, pa_type: pa.DataType, message: Message
+    ) -> object:
+        if field.label != FieldDescriptor.LABEL_REPEATED:
+            if field.has_presence and not message.HasField(field.name):
+                return None
+            return self._value(field, pa_type, getattr(message, field.name))
+
+        container = getattr(message, field.name)
+        if field.message_type is not None and field.message_type.GetOptions().map_entry:
+            # Map fields are cast to a list of key-value structs, like their wire format.
+            return [
+                {
+                    pa_field.name: self._value(
+                        field.message_type.fields_by_name[pa_field.name],
+                        pa_field.type,
+                        {"key": key, "value": value}[pa_field.name],
+                    )
+                    for pa_field in pa_type.value_type
+                }
+                for key, value in container.items()
+            ]
+        return [self._value(field, pa_type.value_type, item) for item in container]
+
+    def _value(self, field: FieldDescriptor, pa_type: pa.DataType, value: object) -> object:
+        """Convert a non-repeated value of a field to a value that Arrow reads as `pa_type`."""
+        if field.type != FieldDescriptor.TYPE_MESSAGE:
+            return value
+        if field.message_type.full_name in (cast.TIMESTAMP_TYPE_NAME, cast.DURATION_TYPE_NAME):
+            return value.ToNanoseconds()
+        return self._message_dict(field.message_type, pa_type, value)
+
+    def _to_arrow(self, messages: list[Message]) -> pa.StructArray:
+        """Convert a batch of Protobuf messages to a StructArray by walking their descriptors."""
+        return self._message_array(self._descriptor, self._pa_struct, messages)
+
+    def _message_array(
+        self, descriptor: Descriptor, pa_struct: pa.StructType, messages: list[Message]
+    ) -> pa.StructArray:
+        children = [  # only fields of a projected struct are converted
+            self._field_array(descriptor.fields_by_name[pa_field.name], pa_field.type, messages)
+            for pa_field in pa_struct
+        ]
+        if not children:  # empty messages have no child to infer the length from
+            return pa.array([{}] * len(messages), type=pa_struct)
+        return pa.StructArray.from_arrays(children, fields=list(pa_struct))
+
+    def _field_array(
+        self, field: FieldDescriptor, pa_type: pa.DataType, messages: list[Message]
+    ) -> pa.Array:
+        if field.label != FieldDescriptor.LABEL_REPEATED:
+            if not field.has_presence:
+                return self._values_array(
+                    field, pa_type, [getattr(m, field.name) for m in messages]
+                )
+            # Unset fields with presence (messages, oneofs, proto3 optionals) become nulls.
+            return converter.with_nulls(
+                [getattr(m, field.name) if m.HasField(field.name) else None for m in messages],
+                lambda values: self._values_array(field, pa_type, values),
+            )
+
+        containers = [getattr(m, field.name) for m in messages]
+        if field.message_type is not None and field.message_type.GetOptions().map_entry:
+            # Map fields are cast to a list of key-value structs, like their wire format.
+            items = [item for container in containers for item in container.items()]
+            entries = {  # projections may keep only the key or the value
+                "key": [k for k, _ in items],
+                "value": [v for _, v in items],
+            }
+            entry = pa_type.value_type
+            children = pa.StructArray.from_arrays(
+                [
+                    self._values_array(
+                        field.message_type.fields_by_name[pa_field.name],
+                        pa_field.type,
+                        entries[pa_field.name],
+                    )
+                    for pa_field in entry
+                ],
+                fields=list(entry),
+            )
+        else:
+            children = self._values_array(
+                field, pa_type.value_type, [item for container in containers for item in container]
+            )
+
+        offsets = [0]
+        for container in containers:
+            offsets.append(offsets[-1] + len(container))
+        return pa.ListArray.from_arrays(pa.array(offsets, type=pa.int32()), children, type=pa_type)
+
+    def _values_array(
+        self, field: FieldDescriptor, pa_type: pa.DataType, values: list[Any]
+    ) -> pa.Array:
+        """Convert non-repeated values of a field to an Arrow array."""
+        if field.type != FieldDescriptor.TYPE_MESSAGE:
+            return pa.array(values, type=pa_type)
+        if field.message_type.full_name in (cast.TIMESTAMP_TYPE_NAME, cast.DURATION_TYPE_NAME):
+            return pa.array([value.ToNanoseconds() for value in values], type=pa_type)
+        return self._message_array(field.message_type, pa_type, values)
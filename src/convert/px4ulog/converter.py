@@ -45,3 +45,11 @@ class MessageConverter(converter.MessageConverter):
 
         """
         return message
+
+    def _to_arrow(self, messages: list[dict[str, Any]]) -> pa.StructArray:
+        """Convert a batch of ULog messages to a StructArray, one field at a time."""
+        children = [
+            pa.array([message[pa_field.name] for message in messages], type=pa_field.type)
+            for pa_field in self._pa_struct
+        ]
+        return pa.StructArray.from_arrays(children, fields=list(self._pa_struct))
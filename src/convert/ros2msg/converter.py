@@ -56,6 +56,63 @@ class MessageConverter(converter.MessageConverter):
                 )
         return fields
 
+    def _to_arrow(self, messages: list[object]) -> pa.StructArray:
+        """Convert a batch of ROS2 messages to a StructArray, one leaf field at a time."""
+        return self._struct_array(self._main.fields, self._pa_struct, messages)
+
+    def _struct_array(
+        self, fields: list[definition.Field], pa_struct: pa.StructType, values: list[Any]
+    ) -> pa.StructArray:
+        fields_by_name = {field.name: field for field in fields}
+        children = []
+        for pa_field in pa_struct:  # only fields of a projected struct are converted
+            field = fields_by_name[pa_field.name]
+            if isinstance(field, definition.Constant):
+                children.append(pa.array([field.value] * len(values), type=pa_field.type))
+            else:
+                children.append(
+                    self._field_array(
+                        field, pa_field.type, [getattr(value, field.name) for value in values]
+                    )
+                )
+        if not children:  # empty messages have no child to infer the length from
+            return pa.array([{}] * len(values), type=pa_struct)
+        return pa.StructArray.from_arrays(children, fields=list(pa_struct))
+
+    def _field_array(
+        self, field: definition.Field, pa_type: pa.DataType, values: list[FIELD_TYPE]
+    ) -> pa.Array:
+        match field:
+            case definition.BuiltInField():
+                return pa.array(values, type=pa_type)
+
+            case definition.ComplexField(is_array=False):
+                return self._struct_array(self._dependencies[field.type_].fields, pa_type, values)
+
+            case definition.ComplexField(is_array=True):
+                flattened = [item for value in values for item in value]
+                children = self._struct_array(
+                    self._dependencies[field.type_].fields, pa_type.value_type, flattened
+                )
+                return self._list_array(field, pa_type, values, children)
+
+            case _:
+                raise ValueError(f"Unsupported field type: {field.type_}")
+
+    def _list_array(
+        self,
+        field: definition.ComplexField,
+        pa_type: pa.DataType,
+        values: list[list[object]],
+        children: pa.Array,
+    ) -> pa.Array:
+        if field.array_size is not None:
+            return pa.FixedSizeListArray.from_arrays(children, type=pa_type)
+        offsets = [0]
+        for value in values:
+            offsets.append(offsets[-1] + len(value))
+        return pa.ListArray.from_arrays(pa.array(offsets, type=pa.int32()), children, type=pa_type)
+
     def _field_to_json_serializable(
         self,
         field_value: FIELD_TYPE | list[FIELD_TYPE],
@@ -0,0 +1,384 @@
+"""Write and compact partitioned Parquet datasets."""
+
+import itertools
+import os
+import pathlib
+import re
+import shutil
+import time
+import uuid
+
+import duckdb
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from pydantic import BaseModel
+
+from settings import settings
+
+# File in each partition directory recording which files were compacted into which
+COMPACTION_MANIFEST_FILE_NAME = "_compaction.jsonl"
+
+# Suffixes of data files in datasets
+DATA_FILE_SUFFIXES = (".parquet", ".csv", ".jsonl")
+
+# Suffix that writes append to the basename of a file, e.g., a robolog snippet
+_BASENAME_SUFFIX_PATTERN = re.compile(r"-\d+$")
+
+# Column of compacted files holding the basename each row was written with
+BASENAME_COLUMN_NAME = "_basename"
+
+# Prefix of the basename of compacted files
+COMPACTED_BASENAME_PREFIX = "compacted_"
+
+
+class Compaction(BaseModel):
+    """Files of a partition directory that were merged into fewer, larger Parquet files."""
+
+    # Partition directory
+    partition: pathlib.Path
+
+    # Names of the merged files
+    inputs: list[str]
+
+    # Names of the files they were merged into
+    outputs: list[str]
+
+    # Basenames of the rows of the merged files, e.g., robolog snippets
+    basenames: list[str] = []
+
+    # Total size of the merged files in bytes
+    input_size_bytes: int
+
+    # Total size of the files they were merged into in bytes
+    output_size_bytes: int
+
+    # When the compaction finished, in seconds since the epoch
+    compacted_at: float
+
+
+def _rows_per_size(batch: pa.RecordBatch, size_bytes: int) -> int:
+    """Estimate how many rows take `size_bytes`, based on the in-memory size of a record batch."""
+    if batch.num_rows == 0 or batch.nbytes == 0:
+        return settings.MIN_ARROW_RECORD_BATCH_SIZE_COUNT
+    return max(1, size_bytes * batch.num_rows // batch.nbytes)
+
+
+def _commit(
+    temp_directory: pathlib.Path, directory: pathlib.Path, basename: str
+) -> list[pathlib.Path]:
+    """Replace files of a previous write with the same basename by files in the temp directory.
+
+    The new files are moved in with atomic renames before the files of the previous write that
+    they did not overwrite are removed. Readers may briefly see the rows of both writes, but never
+    a partially written file or a basename without any rows.
+
+    """
+    stale = {
+        file
+        for file in directory.rglob(f"{basename}*.parquet")
+        if basename_of(file) == basename
+        and not any(_is_hidden(pathlib.Path(part)) for part in file.relative_to(directory).parts)
+    }
+
+    files = []
+    for file in sorted(temp_directory.rglob("*.parquet")):
+        destination = directory / file.relative_to(temp_directory)
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(file, destination)
+        files.append(destination)
+
+    for file in stale - set(files):
+        file.unlink(missing_ok=True)
+
+    remove_compacted_rows(directory, basename)
+    return files
+
+
+def write_parquet_dataset(  # noqa: PLR0913
+    relation: duckdb.DuckDBPyRelation,
+    directory: str | pathlib.Path,
+    basename: str,
+    partition_by: list[str] | None = None,
+    sort_by: list[str] | None = None,
+    row_group_size_bytes: int | None = None,
+    file_size_bytes: int | None = None,
+) -> list[pathlib.Path]:
+    """Stream a DuckDB relation into a Hive-partitioned Parquet dataset.
+
+    Rows are streamed in record batches rather than materialized, and files are written to a temp
+    directory first. Only once all files are written do they replace files of a previous write
+    with the same basename, e.g., the same robolog snippet, and its rows in compacted files.
+
+    Args:
+        relation (duckdb.DuckDBPyRelation): Relation to write.
+        directory (str | pathlib.Path): Root directory of the dataset.
+        basename (str): Prefix of the written file names.
+        partition_by (list[str] | None, optional): Columns to partition by, in directory order.
+        sort_by (list[str] | None, optional): Columns to sort rows by within each file.
+        row_group_size_bytes (int | None, optional): Target uncompressed size of row groups.
+        file_size_bytes (int | None, optional): Target uncompressed size of files.
+
+    Returns:
+        list[pathlib.Path]: Paths to the written files.
+
+    Raises:
+        ValueError: If a partition column is not in the relation.
+
+    """
+    directory = pathlib.Path(directory)
+    partition_by = partition_by or []
+    row_group_size_bytes = row_group_size_bytes or settings.DATASET_ROW_GROUP_SIZE_BYTES
+    file_size_bytes = file_size_bytes or settings.DATASET_FILE_SIZE_BYTES
+
+    missing = set(partition_by) - set(relation.columns)
+    if missing:
+        raise ValueError(f"Partition columns not found: {', '.join(sorted(missing))}")
+
+    sort_by = [column for column in sort_by or [] if column in relation.columns]
+    if sort_by:
+        relation = relation.order(", ".join(f'"{column}"' for column in sort_by))
+
+    reader = relation.fetch_record_batch()
+    try:
+        first_batch = reader.read_next_batch()
+    except StopIteration:
+        return []
+    rows_per_group = _rows_per_size(first_batch, row_group_size_bytes)
+    rows_per_file = max(rows_per_group, _rows_per_size(first_batch, file_size_bytes))
+    batches = pa.RecordBatchReader.from_batches(
+        reader.schema, itertools.chain([first_batch], reader)
+    )
+
+    temp_directory = directory / f".tmp-{uuid.uuid4().hex}"
+    try:
+        ds.write_dataset(
+            batches,
+            temp_directory,
+            format="parquet",
+            partitioning=partition_by or None,
+            partitioning_flavor="hive",
+            basename_template=f"{basename}-{{i}}.parquet",
+            file_options=ds.ParquetFileFormat().make_write_options(
+                compression=settings.DATASET_PARQUET_COMPRESSION
+            ),
+            max_rows_per_file=rows_per_file,
+            max_rows_per_group=rows_per_group,
+            min_rows_per_group=rows_per_group,
+            use_threads=not sort_by,  # writing with threads may reorder rows
+        )
+        return _commit(temp_directory, directory, basename)
+    finally:
+        shutil.rmtree(temp_directory, ignore_errors=True)
+
+
+def _is_hidden(path: pathlib.Path) -> bool:
+    """Return True if a file or directory is hidden from dataset readers, e.g., temp files."""
+    return path.name.startswith((".", "_"))
+
+
+def find_partitions(directory: str | pathlib.Path) -> list[pathlib.Path]:
+    """Return directories under a dataset directory that directly hold data files."""
+    partitions = []
+    for root, dirnames, filenames in os.walk(directory):
+        dirnames[:] = [name for name in dirnames if not _is_hidden(pathlib.Path(name))]
+        if any(name.endswith(DATA_FILE_SUFFIXES) for name in filenames):
+            partitions.append(pathlib.Path(root))
+    return sorted(partitions)
+
+
+def _read_manifest(partition: pathlib.Path) -> list[Compaction]:
+    """Return compactions recorded in the manifest of a partition directory, oldest first."""
+    manifest = partition / COMPACTION_MANIFEST_FILE_NAME
+    if not manifest.exists():
+        return []
+    return [Compaction.model_validate_json(line) for line in manifest.read_text().splitlines()]
+
+
+def is_compacted(file: str | pathlib.Path) -> bool:
+    """Return True if a file was compacted into other files that still exist."""
+    file = pathlib.Path(file)
+    for compaction in reversed(_read_manifest(file.parent)):
+        if file.name in compaction.inputs:
+            return all(
+                (file.parent / output).exists() or is_compacted(file.parent / output)
+                for output in compaction.outputs
+            )
+    return False
+
+
+def _remove_rows(file: pathlib.Path, basename: str) -> None:
+    """Rewrite a compacted Parquet file without the rows written with a basename."""
+    if not file.exists():
+        return
+    column = pq.read_table(file, columns=[BASENAME_COLUMN_NAME])[BASENAME_COLUMN_NAME]
+    if not pc.any(pc.equal(column, basename)).as_py():
+        return
+
+    temp_file = file.with_name(f".tmp-{uuid.uuid4().hex}.parquet")
+    try:
+        with (
+            pq.ParquetFile(file) as parquet_file,
+            pq.ParquetWriter(
+                temp_file,
+                parquet_file.schema_arrow,
+                compression=settings.DATASET_PARQUET_COMPRESSION,
+            ) as writer,
+        ):
+            for i in range(parquet_file.num_row_groups):
+                row_group = parquet_file.read_row_group(i)
+                kept = row_group.filter(
+                    pc.fill_null(pc.not_equal(row_group[BASENAME_COLUMN_NAME], basename), True)
+                )
+                if kept.num_rows > 0:
+                    writer.write_table(kept, row_group_size=kept.num_rows)
+        os.replace(temp_file, file)
+    finally:
+        temp_file.unlink(missing_ok=True)
+
+
+def remove_compacted_rows(directory: str | pathlib.Path, basename: str) -> None:
+    """Remove rows written with a basename from compacted files under a dataset directory.
+
+    Compaction merges files of many basenames, e.g., robolog snippets, into the same files, so
+    writing a basename again must also remove its rows from them. Each compacted file holding the
+    basename is rewritten to a temp file, which then replaces it with an atomic rename.
+
+    """
+    directory = pathlib.Path(directory)
+    for manifest in sorted(directory.rglob(COMPACTION_MANIFEST_FILE_NAME)):
+        if any(
+            _is_hidden(pathlib.Path(part)) for part in manifest.relative_to(directory).parts[:-1]
+        ):
+            continue
+        for compaction in _read_manifest(manifest.parent):
+            if basename in compaction.basenames:
+                for output in compaction.outputs:
+                    _remove_rows(manifest.parent / output, basename)
+
+
+def basename_of(file: str | pathlib.Path) -> str:
+    """Return the basename a data file was written with, e.g., "snippet" for "snippet-0.parquet"."""
+    return _BASENAME_SUFFIX_PATTERN.sub("", pathlib.Path(file).stem, count=1)
+
+
+def _quote(value: str) -> str:
+    """Return a string as an SQL string literal."""
+    return "'" + value.replace("'", "''") + "'"
+
+
+def _read_sql(files: list[pathlib.Path], basenames: dict[str, list[str]]) -> str:
+    """Return an SQL query that reads data files of any supported format, unioned by name.
+
+    Rows get the basename of their file in BASENAME_COLUMN_NAME, unless the file is a compacted
+    file that already has the column.
+
+    """
+    readers = {
+        ".parquet": "read_parquet({}, hive_partitioning = false)",
+        ".csv": "read_csv({}, hive_partitioning = false)",
+        ".jsonl": "read_json({}, format = 'newline_delimited', hive_partitioning = false)",
+    }
+    selects = []
+    for file in files:
+        source = readers[file.suffix].format(_quote(str(file)))
+        if file.suffix == ".parquet" and BASENAME_COLUMN_NAME in pq.read_schema(file).names:
+            selects.append(f"SELECT * FROM {source}")  # noqa: S608
+        else:
+            basename = (basenames.get(file.name) or [basename_of(file)])[0]
+            selects.append(
+                f'SELECT *, {_quote(basename)} AS "{BASENAME_COLUMN_NAME}" FROM {source}'  # noqa: S608
+            )
+    return " UNION ALL BY NAME ".join(selects)
+
+
+def compact_partition(  # noqa: PLR0913
+    partition: str | pathlib.Path,
+    file_size_bytes: int | None = None,
+    sort_by: list[str] | None = None,
+    convert: bool = False,
+    min_age_seconds: float = 0.0,
+    dry_run: bool = False,
+) -> Compaction | None:
+    """Merge small data files of a partition directory into target-sized, sorted Parquet files.
+
+    Parquet files under half the target size are merged, along with CSV and JSONL files if
+    `convert` is True. Each row of the merged files keeps the basename it was written with, e.g.,
+    its robolog snippet, in BASENAME_COLUMN_NAME, so that writing the basename again removes its
+    rows rather than duplicating them. Partitions with a file modified within the last
+    `min_age_seconds` are left alone, so that partitions pipelines are writing to are not
+    compacted. New files are written before merged files are removed, and the compaction is
+    recorded in a manifest in the partition directory, which the run ledger reads to tell that
+    merged files are still saved.
+
+    Args:
+        partition (str | pathlib.Path): Partition directory.
+        file_size_bytes (int | None, optional): Target uncompressed size of the merged files.
+            Defaults to the setting if None.
+        sort_by (list[str] | None, optional): Columns to sort rows by, if the files have them.
+        convert (bool, optional): If True, also merge CSV and JSONL files into Parquet files.
+        min_age_seconds (float, optional): Minimum time since any file in the partition changed.
+        dry_run (bool, optional): If True, return what would be compacted without compacting it.
+
+    Returns:
+        Compaction | None: The compaction, or None if there is nothing to compact.
+
+    """
+    partition = pathlib.Path(partition)
+    file_size_bytes = file_size_bytes or settings.DATASET_FILE_SIZE_BYTES
+
+    files = [
+        file for file in sorted(partition.iterdir()) if file.is_file() and not _is_hidden(file)
+    ]
+    if any(time.time() - file.stat().st_mtime < min_age_seconds for file in files):
+        return None
+
+    candidates = [
+        file
+        for file in files
+        if (file.suffix == ".parquet" and file.stat().st_size < file_size_bytes // 2)
+        or (convert and file.suffix in (".csv", ".jsonl"))
+    ]
+    if not any(file.suffix != ".parquet" for file in candidates) and len(candidates) < 2:  # noqa: PLR2004
+        return None
+
+    compacted_basenames = {
+        output: compaction.basenames
+        for compaction in _read_manifest(partition)
+        for output in compaction.outputs
+    }
+    basenames = sorted(
+        {
+            basename
+            for file in candidates
+            for basename in compacted_basenames.get(file.name) or [basename_of(file)]
+        }
+    )
+
+    outputs = []
+    if not dry_run:
+        relation = duckdb.sql(_read_sql(candidates, compacted_basenames))
+        outputs = write_parquet_dataset(
+            relation,
+            partition,
+            f"{COMPACTED_BASENAME_PREFIX}{uuid.uuid4().hex[:8]}",
+            sort_by=sort_by,
+            file_size_bytes=file_size_bytes,
+        )
+
+    compaction = Compaction(
+        partition=partition,
+        inputs=[file.name for file in candidates],
+        outputs=[file.name for file in outputs],
+        basenames=basenames,
+        input_size_bytes=sum(file.stat().st_size for file in candidates),
+        output_size_bytes=sum(file.stat().st_size for file in outputs),
+        compacted_at=time.time(),
+    )
+    if not dry_run:
+        with (partition / COMPACTION_MANIFEST_FILE_NAME).open("a") as manifest:
+            manifest.write(compaction.model_dump_json() + "\n")
+        for file in candidates:
+            file.unlink()
+    return compaction
@@ -0,0 +1,176 @@
+"""Downsampling of numeric fields of topic messages to a few representative points."""
+
+import re
+from typing import Literal
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from settings import settings
+from src.reader.topic import TopicMessageReader
+
+# Downsampling methods: Largest-Triangle-Three-Buckets, or min, max, and mean per time bucket
+Method = Literal["lttb", "minmax"]
+
+# A struct field name like ".xyz", or a list index like "[2]"
+_PATH_STEP = re.compile(r"\.([^.\[\]]+)|\[(\d+)\]")
+
+
+class InvalidFieldPathError(ValueError):
+    """Raised when a field path does not point to a numeric field of a topic."""
+
+
+def split_field_path(field_path: str, topics: list[str]) -> tuple[str, list[str | int]]:
+    """Split a field path like "vehicle_acceleration_0.xyz[2]" into a topic and its steps.
+
+    Topic names may contain dots, so the longest topic that the path starts with is chosen.
+
+    Returns:
+        tuple[str, list[str | int]]: The topic, and struct field names and list indices in it.
+
+    Raises:
+        InvalidFieldPathError: If the path does not start with a topic or is malformed.
+
+    """
+    for topic in sorted(topics, key=len, reverse=True):
+        rest = field_path[len(topic) :]
+        if field_path.startswith(topic) and (not rest or rest[0] in ".["):
+            matches = list(_PATH_STEP.finditer(rest))
+            if "".join(match.group(0) for match in matches) != rest:
+                raise InvalidFieldPathError(field_path)
+            return topic, [
+                match.group(1) if match.group(1) is not None else int(match.group(2))
+                for match in matches
+            ]
+    raise InvalidFieldPathError(f"{field_path} does not start with a topic of the robolog.")
+
+
+def select_field(column: pa.ChunkedArray, steps: list[str | int]) -> pa.ChunkedArray:
+    """Return values of a nested field of a column, following struct field names and list indices.
+
+    Raises:
+        InvalidFieldPathError: If a step does not exist or the field is not numeric.
+
+    """
+    for step in steps:
+        try:
+            if isinstance(step, str):
+                column = pc.struct_field(column, step)
+            else:
+                column = pc.list_element(column, step)
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError, KeyError, TypeError) as e:
+            raise InvalidFieldPathError(f"No field {step!r} in {column.type}") from e
+
+    if not (pa.types.is_integer(column.type) or pa.types.is_floating(column.type)):
+        raise InvalidFieldPathError(f"Field of type {column.type} is not numeric.")
+    return column
+
+
+def lttb(x: np.ndarray, y: np.ndarray, points: int) -> np.ndarray:
+    """Return indices of the points that Largest-Triangle-Three-Buckets keeps.
+
+    The first and last points are always kept. Each bucket in between keeps the point forming
+    the largest triangle with the point kept in the previous bucket and the mean of the next.
+
+    """
+    if points >= len(x):
+        return np.arange(len(x))
+    if points < 3:  # noqa: PLR2004
+        return np.array([0, len(x) - 1])[:points]
+
+    edges = np.linspace(1, len(x) - 1, points - 1).astype(int)
+    indices = np.empty(points, dtype=int)
+    indices[0], indices[-1] = 0, len(x) - 1
+    for i in range(points - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else len(x)
+        next_x, next_y = x[end:next_end].mean(), y[end:next_end].mean()
+        previous_x, previous_y = x[indices[i]], y[indices[i]]
+        areas = np.abs(
+            (previous_x - next_x) * (y[start:end] - previous_y)
+            - (previous_x - x[start:end]) * (next_y - previous_y)
+        )
+        indices[i + 1] = start + int(np.argmax(areas))
+    return indices
+
+
+def bucket_min_max_mean(x: np.ndarray, y: np.ndarray, points: int) -> pa.Table:
+    """Return the min, max, mean, and count of values in each of `points` equal time buckets.
+
+    Buckets without values are left out.
+
+    """
+    if not len(x):
+        x = y = np.array([], dtype=np.float64)
+        return pa.table(
+            {
+                settings.TIMESTAMP_SECONDS_COLUMN_NAME: x,
+                "min": y,
+                "max": y,
+                "mean": y,
+                "count": np.array([], dtype=np.int64),
+            }
+        )
+
+    edges = np.linspace(x[0], x[-1], points + 1)
+    buckets = np.clip(np.searchsorted(edges, x, side="right") - 1, 0, points - 1)
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    counts = np.diff(np.r_[starts, len(x)])
+    return pa.table(
+        {
+            settings.TIMESTAMP_SECONDS_COLUMN_NAME: edges[buckets[starts]],
+            "min": np.minimum.reduceat(y, starts),
+            "max": np.maximum.reduceat(y, starts),
+            "mean": np.add.reduceat(y, starts) / counts,
+            "count": counts,
+        }
+    )
+
+
+def downsample(  # noqa: PLR0913
+    reader: TopicMessageReader,
+    field_path: str,
+    points: int,
+    method: Method = "lttb",
+    start_seconds: float | None = None,
+    end_seconds: float | None = None,
+) -> pa.Table:
+    """Return a numeric field of a topic over a time range, reduced to at most `points` rows.
+
+    Only the timestamp and topic columns of the cached Arrow file are read, and the reduction is
+    vectorized over them, so it takes milliseconds even for hours of high-rate messages.
+
+    Args:
+        reader (TopicMessageReader): Reader of the robolog.
+        field_path (str): Topic followed by struct field names and list indices, e.g.,
+            "vehicle_acceleration_0.xyz[2]" or "/imu.linear_acceleration.z".
+        points (int): Maximum number of rows to return.
+        method (Method, optional): "lttb" keeps the points that best preserve the shape of the
+            signal, with columns timestamp_seconds and value. "minmax" returns min, max, mean,
+            and count of values in equal time buckets, starting at timestamp_seconds.
+        start_seconds (float | None, optional): When to start reading messages.
+        end_seconds (float | None, optional): When to stop reading messages.
+
+    Returns:
+        pa.Table: The downsampled field, ordered by time.
+
+    Raises:
+        InvalidFieldPathError: If the field path does not point to a numeric field of a topic.
+
+    """
+    topic, steps = split_field_path(field_path, reader.topics)
+    dataset = reader.read([topic], start_seconds, end_seconds)
+    table = dataset.to_table(columns=[settings.TIMESTAMP_SECONDS_COLUMN_NAME, topic])
+
+    values = select_field(table[topic], steps)
+    valid = pc.is_valid(values)
+    x = table[settings.TIMESTAMP_SECONDS_COLUMN_NAME].filter(valid).to_numpy()
+    y = values.filter(valid).to_numpy().astype(np.float64)
+    order = np.argsort(x, kind="stable")
+    x, y = x[order], y[order]
+
+    if method == "minmax":
+        return bucket_min_max_mean(x, y, points)
+    indices = lttb(x, y, points)
+    return pa.table({settings.TIMESTAMP_SECONDS_COLUMN_NAME: x[indices], "value": y[indices]})
@@ -0,0 +1,120 @@
+"""JSON-serializable encodings of Arrow tables, e.g., for responses of the MCP server."""
+
+import base64
+from typing import Any, Literal
+
+import pyarrow as pa
+import pyarrow.compute as pc
+from pydantic import BaseModel
+
+# Layouts of encoded tables: a list of dictionaries, one per row, or a dictionary of lists, one
+# per column
+Format = Literal["rows", "columns"]
+
+
+def _is_binary(type_: pa.DataType) -> bool:
+    """Return True if a type holds raw bytes."""
+    return (
+        pa.types.is_binary(type_)
+        or pa.types.is_large_binary(type_)
+        or pa.types.is_fixed_size_binary(type_)
+    )
+
+
+def _has_binary(type_: pa.DataType) -> bool:
+    """Return True if a type is binary or nests binary values, e.g., in struct fields or lists."""
+    return _is_binary(type_) or any(
+        _has_binary(type_.field(i).type) for i in range(type_.num_fields)
+    )
+
+
+def _base64_encode(values: pa.Array) -> pa.Array:
+    """Replace binary values of an array, also in struct fields and lists, by base64 strings."""
+    if not _has_binary(values.type):
+        return values
+
+    if _is_binary(values.type):
+        return pa.array(
+            [
+                None if value is None else base64.b64encode(value).decode("ascii")
+                for value in values.to_pylist()
+            ],
+            pa.string(),
+        )
+
+    if pa.types.is_struct(values.type):
+        children = [_base64_encode(child) for child in values.flatten()]
+        fields = [
+            pa.field(field.name, child.type, field.nullable)
+            for field, child in zip(values.type, children, strict=True)
+        ]
+        return pa.StructArray.from_arrays(children, fields=fields, mask=values.is_null())
+
+    if pa.types.is_list(values.type) or pa.types.is_large_list(values.type):
+        offsets = pc.subtract(values.offsets, values.offsets[0])
+        array_type = pa.ListArray if pa.types.is_list(values.type) else pa.LargeListArray
+        return array_type.from_arrays(
+            offsets, _base64_encode(values.flatten()), mask=values.is_null()
+        )
+    return values
+
+
+def base64_encode_binary(table: pa.Table) -> pa.Table:
+    """Return a table whose binary values, also in struct fields and lists, are base64 strings.
+
+    JSON has no binary type, so binary values, e.g., compressed images, must be text to be
+    serialized.
+
+    """
+    if not any(_has_binary(field.type) for field in table.schema):
+        return table
+    return pa.Table.from_arrays(
+        [_base64_encode(column.combine_chunks()) for column in table.columns],
+        names=table.column_names,
+    )
+
+
+def _to_list(values: pa.Array) -> list:
+    """Convert an array to a list, through NumPy for numbers without nulls, which is faster."""
+    is_number = pa.types.is_integer(values.type) or pa.types.is_floating(values.type)
+    if values.null_count == 0 and (is_number or pa.types.is_boolean(values.type)):
+        return values.to_numpy(zero_copy_only=False).tolist()
+    return values.to_pylist()
+
+
+def _encode_column(values: pa.Array) -> list | dict[str, list]:
+    """Encode a column as a list, or strings that repeat a lot as a dictionary and indices."""
+    if pa.types.is_string(values.type) or pa.types.is_large_string(values.type):
+        encoded = pc.dictionary_encode(values)
+        if 2 * len(encoded.dictionary) <= len(encoded):
+            return {
+                "dictionary": encoded.dictionary.to_pylist(),
+                "indices": _to_list(encoded.indices),
+            }
+    return _to_list(values)
+
+
+class Encoding(BaseModel, frozen=True):
+    """How an Arrow table is encoded as JSON-serializable data."""
+
+    # "rows" for a list of dictionaries, one per row, or "columns" for a dictionary of lists,
+    # one per column, where strings that repeat a lot are a dictionary of unique strings and a
+    # list of indices into it
+    format: Format = "rows"
+
+    # Whether to flatten struct columns into columns named by dotted paths, e.g., "/imu.x"
+    flatten: bool = False
+
+    def encode(self, table: pa.Table) -> list[dict[str, Any]] | dict[str, Any]:
+        """Encode an Arrow table, with binary values as base64 strings."""
+        if self.flatten:
+            while any(pa.types.is_struct(field.type) for field in table.schema):
+                table = table.flatten()
+        table = base64_encode_binary(table)
+
+        if self.format == "rows":
+            return table.to_pylist()
+        return {
+            name: _encode_column(column.combine_chunks())
+            for name, column in zip(table.column_names, table.columns, strict=True)
+        }
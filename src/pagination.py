@@ -0,0 +1,204 @@
+"""Pages of rows from cached Arrow files, addressed by opaque cursors."""
+
+import base64
+import collections
+import concurrent.futures
+import json
+import logging
+import pathlib
+import threading
+from typing import Any
+
+import pyarrow as pa
+from pydantic import BaseModel
+
+from settings import settings
+from src.encoding import Encoding
+
+logger = logging.getLogger(__name__)
+logger.setLevel(settings.LOG_LEVEL)
+
+# Maximum number of prefetched pages kept in memory
+PREFETCH_MAX_PAGES = 8
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a cursor cannot be decoded or no longer points to a cached Arrow file."""
+
+
+class InvalidRowCountError(ValueError):
+    """Raised when a page is asked for fewer than one row, which would never reach the end."""
+
+
+class Cursor(BaseModel):
+    """Position of the first row of a page in a cached Arrow file."""
+
+    # Path of the cached Arrow file
+    arrow_file: str
+
+    # Index of the record batch the page starts in
+    batch_index: int = 0
+
+    # Offset of the first row of the page within the record batch
+    row_offset: int = 0
+
+    # Number of rows in the whole Arrow file, or None if it has not been counted yet
+    total_row_count: int | None = None
+
+    def encode(self) -> str:
+        """Return the cursor as an opaque URL-safe string."""
+        return base64.urlsafe_b64encode(self.model_dump_json().encode("utf8")).decode("ascii")
+
+    @staticmethod
+    def decode(cursor: str) -> "Cursor":
+        """Return a cursor from a string returned by `encode`.
+
+        Raises:
+            InvalidCursorError: If the string is not a cursor or points outside of the cache.
+
+        """
+        try:
+            decoded = Cursor.model_validate(json.loads(base64.urlsafe_b64decode(cursor)))
+        except ValueError as e:
+            raise InvalidCursorError(cursor) from e
+
+        cache_directory = pathlib.Path(settings.CACHE_DIRECTORY).resolve()
+        if not pathlib.Path(decoded.arrow_file).resolve().is_relative_to(cache_directory):
+            raise InvalidCursorError(cursor)
+        if not pathlib.Path(decoded.arrow_file).exists():
+            raise InvalidCursorError(f"{cursor} points to a cleared cache, please read again.")
+        return decoded
+
+
+class Page(BaseModel):
+    """Rows of a page and the cursor of the next page, if any."""
+
+    # Rows of the page, encoded as JSON-serializable data
+    data: list[dict[str, Any]] | dict[str, Any]
+
+    # Cursor of the next page, or None if this is the last page
+    next_cursor: str | None
+
+    # Number of rows in the whole Arrow file
+    total_row_count: int
+
+
+def page_row_count(row_count: int) -> int:
+    """Return the number of rows of a page asked for `row_count` rows, at most the maximum.
+
+    Raises:
+        InvalidRowCountError: If `row_count` is less than 1.
+
+    """
+    if row_count < 1:
+        raise InvalidRowCountError(f"Pages must have at least 1 row, got {row_count}.")
+    return min(row_count, settings.MCP_MAX_PAGE_ROW_COUNT)
+
+
+def read_page(cursor: Cursor, row_count: int, encoding: Encoding) -> Page:
+    """Read a page of up to `row_count` rows from a cached Arrow file, starting at a cursor.
+
+    The file is memory-mapped, so only the record batches the page spans are read from disk,
+    however large the file is. Rows of the whole file are counted when the first page is read, and
+    the count is carried in the cursors of the next pages.
+
+    Raises:
+        InvalidRowCountError: If `row_count` is less than 1.
+
+    """
+    if row_count < 1:
+        raise InvalidRowCountError(f"Pages must have at least 1 row, got {row_count}.")
+
+    with pa.memory_map(cursor.arrow_file) as source:
+        reader = pa.ipc.open_file(source)
+        slices: list[pa.RecordBatch] = []
+        batch_index, row_offset = cursor.batch_index, cursor.row_offset
+        remaining = row_count
+        while remaining > 0 and batch_index < reader.num_record_batches:
+            batch = reader.get_batch(batch_index)
+            slices.append(batch.slice(row_offset, remaining))
+            remaining -= slices[-1].num_rows
+            row_offset += slices[-1].num_rows
+            if row_offset >= batch.num_rows:
+                batch_index, row_offset = batch_index + 1, 0
+
+        data = encoding.encode(pa.Table.from_batches(slices, schema=reader.schema))
+        total_row_count = cursor.total_row_count
+        if total_row_count is None:
+            total_row_count = sum(
+                reader.get_batch(i).num_rows for i in range(reader.num_record_batches)
+            )
+        has_next = batch_index < reader.num_record_batches
+
+    next_cursor = (
+        Cursor(
+            arrow_file=cursor.arrow_file,
+            batch_index=batch_index,
+            row_offset=row_offset,
+            total_row_count=total_row_count,
+        )
+        if has_next
+        else None
+    )
+    return Page(
+        data=data,
+        next_cursor=next_cursor.encode() if next_cursor else None,
+        total_row_count=total_row_count,
+    )
+
+
+class Paginator:
+    """Read pages of cached Arrow files, prefetching the next page in the background.
+
+    Clients usually page through a file in order, so the page after each one that is read is
+    converted ahead of time on a background thread and handed out when it is asked for.
+
+    """
+
+    def __init__(self, max_prefetched_pages: int = PREFETCH_MAX_PAGES) -> None:
+        """Initialize the Paginator."""
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="prefetch"
+        )
+        self._prefetched: collections.OrderedDict[
+            tuple[str, int, Encoding], concurrent.futures.Future[Page]
+        ] = collections.OrderedDict()
+        self._max_prefetched_pages = max_prefetched_pages
+        self._lock = threading.Lock()
+
+    def first_page(
+        self, arrow_file: str | pathlib.Path, row_count: int, encoding: Encoding
+    ) -> Page:
+        """Return the first page of an Arrow file and prefetch the next one."""
+        return self.page(Cursor(arrow_file=str(arrow_file)).encode(), row_count, encoding)
+
+    def page(self, cursor: str, row_count: int, encoding: Encoding) -> Page:
+        """Return the page at a cursor and prefetch the next one.
+
+        Pages have at most `settings.MCP_MAX_PAGE_ROW_COUNT` rows, whatever `row_count` is.
+
+        Raises:
+            InvalidCursorError: If the cursor cannot be decoded or its file was cleared.
+            InvalidRowCountError: If `row_count` is less than 1.
+
+        """
+        row_count = page_row_count(row_count)
+        decoded = Cursor.decode(cursor)
+        with self._lock:
+            future = self._prefetched.pop((cursor, row_count, encoding), None)
+
+        page = future.result() if future is not None else read_page(decoded, row_count, encoding)
+        if page.next_cursor is not None:
+            self._prefetch(page.next_cursor, row_count, encoding)
+        return page
+
+    def _prefetch(self, cursor: str, row_count: int, encoding: Encoding) -> None:
+        """Read a page on the background thread, evicting the oldest prefetched pages."""
+        with self._lock:
+            if (cursor, row_count, encoding) in self._prefetched:
+                return
+            self._prefetched[(cursor, row_count, encoding)] = self._executor.submit(
+                read_page, Cursor.decode(cursor), row_count, encoding
+            )
+            while len(self._prefetched) > self._max_prefetched_pages:
+                self._prefetched.popitem(last=False)
@@ -0,0 +1,73 @@
+"""Filters of messages by value, evaluated on record batches before they are cached."""
+
+import threading
+from collections.abc import Iterable, Iterator
+
+import duckdb
+import pyarrow as pa
+
+# Name of the view that filter expressions read a record batch from
+BATCH_VIEW_NAME = "batch"
+
+
+class InvalidFilterError(ValueError):
+    """Raised when a filter is not a single SQL expression over the columns of a record batch."""
+
+
+class MessageFilter:
+    """An SQL boolean expression that rows must satisfy, e.g., `"/battery".percentage < 0.2`.
+
+    DuckDB evaluates the expression into a mask of each record batch, and Arrow keeps the rows of
+    the mask, so the batch keeps its schema. Like in a WHERE clause, rows where the expression is
+    NULL are dropped. Expressions cannot access files.
+
+    """
+
+    def __init__(self, expression: str) -> None:
+        """Initialize the MessageFilter with an SQL expression.
+
+        Raises:
+            InvalidFilterError: If the expression is not a single SQL expression.
+
+        """
+        self.expression = expression
+        self._sql = f"SELECT CAST(({expression}) AS BOOLEAN) FROM {BATCH_VIEW_NAME}"  # noqa: S608
+        try:
+            statement_count = len(duckdb.extract_statements(self._sql))
+        except duckdb.Error as e:
+            raise InvalidFilterError(f"Failed to parse filter '{expression}': {e}") from e
+        if statement_count != 1:
+            raise InvalidFilterError(f"Filter '{expression}' is not a single expression.")
+
+        self._connection = duckdb.connect()
+        self._connection.execute("SET enable_external_access = false")
+        self._connection.execute("SET lock_configuration = true")
+        self._lock = threading.Lock()
+
+    def apply(self, record_batch: pa.RecordBatch) -> pa.RecordBatch:
+        """Return rows of a record batch that satisfy the expression.
+
+        Raises:
+            InvalidFilterError: If the expression does not evaluate to a value per row, e.g., it
+                refers to a column that does not exist.
+
+        """
+        with self._lock:
+            try:
+                self._connection.register(BATCH_VIEW_NAME, record_batch)
+                mask = self._connection.sql(self._sql).fetch_arrow_table().column(0)
+            except duckdb.Error as e:
+                raise InvalidFilterError(f"Failed to apply filter '{self.expression}': {e}") from e
+            finally:
+                self._connection.unregister(BATCH_VIEW_NAME)
+
+        if len(mask) != record_batch.num_rows:
+            raise InvalidFilterError(f"Filter '{self.expression}' is not a single expression.")
+        return record_batch.filter(mask)
+
+    def apply_all(self, record_batches: Iterable[pa.RecordBatch]) -> Iterator[pa.RecordBatch]:
+        """Yield rows of record batches that satisfy the expression, skipping empty batches."""
+        for record_batch in record_batches:
+            filtered_batch = self.apply(record_batch)
+            if filtered_batch.num_rows > 0:
+                yield filtered_batch
@@ -0,0 +1,168 @@
+"""Profiles of pipeline operators: time, memory, data volume, and cache use."""
+
+import contextlib
+import contextvars
+import json
+import pathlib
+import resource
+import sys
+import threading
+import time
+from collections.abc import Iterator
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+from pydantic import BaseModel
+
+# ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+_MAXRSS_UNIT_BYTES = 1 if sys.platform == "darwin" else 1024
+
+
+class OperatorProfile(BaseModel):
+    """Resources an operator used while it ran."""
+
+    # Name of the operator
+    name: str
+
+    # Type of the operator, e.g., ExtractTopic
+    operator_type: str
+
+    # Wall time in seconds
+    wall_seconds: float = 0.0
+
+    # CPU time in seconds of the whole process while the operator ran, including DuckDB's own
+    # threads. It covers operators running at the same time, so it is not the operator's own
+    process_cpu_seconds: float = 0.0
+
+    # Peak resident set size of the whole process in bytes when the operator finished. It never
+    # goes down and covers operators running at the same time, so it is not the operator's own
+    process_peak_rss_bytes: int = 0
+
+    # Name of the view the operator registered, if any
+    output: str | None = None
+
+    # Names of the views the operator read
+    inputs: list[str] = []
+
+    # Rows and bytes the operator read, from robologs or from the views it depends on
+    rows_in: int | None = None
+    bytes_in: int | None = None
+
+    # Rows and bytes of the view the operator registered or the files it saved
+    rows_out: int | None = None
+    bytes_out: int | None = None
+
+    # Number of reads served from cached Arrow files, and number of reads that wrote them
+    cache_hits: int = 0
+    cache_misses: int = 0
+
+    # Output of DuckDB's EXPLAIN ANALYZE in JSON format, for operators that run SQL queries
+    explain_analyze: str | None = None
+
+
+# Profile of the operator running on the current thread, if profiling
+_current_profile: contextvars.ContextVar[OperatorProfile | None] = contextvars.ContextVar(
+    "current_profile", default=None
+)
+
+
+def _peak_rss_bytes() -> int:
+    """Return the peak resident set size of the process in bytes."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * _MAXRSS_UNIT_BYTES
+
+
+def size_of(data: ds.Dataset | pa.Table | pd.DataFrame) -> tuple[int | None, int | None]:
+    """Return number of rows and bytes of Arrow or pandas data, or None if unknown."""
+    match data:
+        case ds.FileSystemDataset():
+            return data.count_rows(), sum(pathlib.Path(file).stat().st_size for file in data.files)
+        case ds.Dataset():
+            return data.count_rows(), None
+        case pa.Table():
+            return data.num_rows, data.nbytes
+        case pd.DataFrame():
+            return len(data), int(data.memory_usage(deep=True).sum())
+        case _:
+            return None, None
+
+
+def _add(total: int | None, value: int | None) -> int | None:
+    """Add two counts, either of which may be unknown."""
+    return value if total is None else total + (value or 0)
+
+
+def record_read(dataset: ds.Dataset, cache_hit: bool) -> ds.Dataset:
+    """Record a dataset a reader returned in the profile of the running operator, if any.
+
+    Readers call this on every dataset they return, so that each operator's profile covers the
+    data it read and whether it came from the cache, without the operator doing anything.
+
+    """
+    profile = _current_profile.get()
+    if profile is not None:
+        rows, bytes_ = size_of(dataset)
+        profile.rows_in = _add(profile.rows_in, rows)
+        profile.bytes_in = _add(profile.bytes_in, bytes_)
+        if cache_hit:
+            profile.cache_hits += 1
+        else:
+            profile.cache_misses += 1
+    return dataset
+
+
+@contextlib.contextmanager
+def measure(profile: OperatorProfile) -> Iterator[OperatorProfile]:
+    """Measure wall time of the code in the context, and CPU time and peak memory of the process."""
+    token = _current_profile.set(profile)
+    wall_started_at, cpu_started_at = time.perf_counter(), time.process_time()
+    try:
+        yield profile
+    finally:
+        profile.wall_seconds = time.perf_counter() - wall_started_at
+        profile.process_cpu_seconds = time.process_time() - cpu_started_at
+        profile.process_peak_rss_bytes = _peak_rss_bytes()
+        _current_profile.reset(token)
+
+
+class Profiler:
+    """Profiles of all operators of a pipeline run, collected from worker threads."""
+
+    def __init__(self) -> None:
+        """Initialize the Profiler."""
+        self._profiles: list[OperatorProfile] = []
+        self._lock = threading.Lock()
+
+    def add(self, profile: OperatorProfile) -> None:
+        """Add the profile of an operator that finished."""
+        with self._lock:
+            self._profiles.append(profile)
+
+    @property
+    def profiles(self) -> list[OperatorProfile]:
+        """Return profiles in the order operators finished.
+
+        Operators that read views rather than robologs have the total rows and bytes of those
+        views as their input.
+
+        """
+        with self._lock:
+            profiles = list(self._profiles)
+
+        outputs = {profile.output: profile for profile in profiles if profile.output is not None}
+        for profile in profiles:
+            if profile.rows_in is None and profile.inputs:
+                for name in profile.inputs:
+                    if name in outputs:
+                        profile.rows_in = _add(profile.rows_in, outputs[name].rows_out)
+                        profile.bytes_in = _add(profile.bytes_in, outputs[name].bytes_out)
+        return profiles
+
+    def write_json(self, path: str | pathlib.Path) -> pathlib.Path:
+        """Write profiles to a JSON file and return its path."""
+        path = pathlib.Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(
+            json.dumps([profile.model_dump(mode="json") for profile in self.profiles], indent=2)
+        )
+        return path
@@ -0,0 +1,79 @@
+"""SQL queries over messages of robologs, run by DuckDB on cached Arrow files."""
+
+import threading
+
+import duckdb
+import pyarrow.dataset as ds
+from pydantic import BaseModel
+
+from src.command.run.engine import Engine
+from src.encoding import base64_encode_binary
+
+# Name of the view that queries read messages from
+MESSAGES_VIEW_NAME = "messages"
+
+
+class QueryTimeoutError(TimeoutError):
+    """Raised when a query runs longer than its time limit."""
+
+
+class QueryResult(BaseModel):
+    """Rows a query returned, up to a row limit."""
+
+    # Names of the result columns
+    columns: list[str]
+
+    # Rows of the result as JSON-serializable dictionaries, with binary values as base64 strings
+    rows: list[dict]
+
+    # Whether the result had more rows than the row limit
+    truncated: bool
+
+
+class QuerySession:
+    """A DuckDB database that queries of a client session run on.
+
+    The database is kept across queries of the session, so a client can, e.g., create a table in
+    one query and read it in the next. Queries cannot access files, so they only read messages
+    registered from the cache and what the session created.
+
+    """
+
+    def __init__(self) -> None:
+        """Initialize the QuerySession with an in-memory database."""
+        self._connection = Engine(database=None).connect()
+        self._connection.execute("SET enable_external_access = false")
+        self._connection.execute("SET lock_configuration = true")
+        self._lock = threading.Lock()
+
+    def query(
+        self, messages: ds.Dataset, sql: str, max_rows: int, timeout_seconds: float
+    ) -> QueryResult:
+        """Run an SQL query over messages registered as the "messages" view.
+
+        Raises:
+            QueryTimeoutError: If the query runs longer than `timeout_seconds`.
+
+        """
+        with self._lock:
+            cursor = self._connection.cursor()
+
+        timer = threading.Timer(timeout_seconds, cursor.interrupt)
+        try:
+            cursor.register(MESSAGES_VIEW_NAME, messages)
+            timer.start()
+            relation = cursor.sql(sql)
+            if relation is None:  # statements like CREATE TABLE return no rows
+                return QueryResult(columns=[], rows=[], truncated=False)
+            table = relation.limit(max_rows + 1).fetch_arrow_table()
+        except duckdb.InterruptException as e:
+            raise QueryTimeoutError(f"Query ran longer than {timeout_seconds} seconds.") from e
+        finally:
+            timer.cancel()
+            cursor.close()
+
+        return QueryResult(
+            columns=table.column_names,
+            rows=base64_encode_binary(table.slice(0, max_rows)).to_pylist(),
+            truncated=table.num_rows > max_rows,
+        )
@@ -5,6 +5,8 @@ import pathlib
 from settings import settings
 from src import robolog
 from src.reader.frequency import TopicFrequencyReader
+from src.reader.logging import LoggingMessageReader
+from src.reader.scan import ScanReader
 from src.reader.topic import TopicMessageReader
 from src.reader.type import TypeMessageReader
 
@@ -100,3 +102,63 @@ def make_topic_frequency_reader(
 
         case _:
             raise robolog.UnsupportedRobologTypeError(robolog_path)
+
+
+def make_logging_message_reader(
+    robolog_path: str | pathlib.Path, use_cache: bool | None = None
+) -> LoggingMessageReader:
+    """Create a LoggingMessageReader based on the robolog type."""
+    use_cache = use_cache if use_cache is not None else settings.USE_CACHE
+
+    match robolog.detect_robolog_type(robolog_path):
+        case robolog.RobologType.ROS1_BAG_FILE:
+            from src.reader.ros1.bag import logging
+
+            return logging.LoggingMessageReader(robolog_path, use_cache=use_cache)
+
+        case robolog.RobologType.ROS2_DB3_FILE | robolog.RobologType.ROS2_DB3_DIR:
+            from src.reader.ros2.db3 import logging
+
+            return logging.LoggingMessageReader(robolog_path, use_cache=use_cache)
+
+        case robolog.RobologType.ROS2_MCAP_FILE | robolog.RobologType.ROS2_MCAP_DIR:
+            from src.reader.ros2.mcap import logging
+
+            return logging.LoggingMessageReader(robolog_path, use_cache=use_cache)
+
+        case robolog.RobologType.PX4_ULG_FILE:
+            from src.reader.px4.ulg import logging
+
+            return logging.LoggingMessageReader(robolog_path, use_cache=use_cache)
+
+        case _:
+            raise robolog.UnsupportedRobologTypeError(robolog_path)
+
+
+def make_scan_reader(robolog_path: str | pathlib.Path, use_cache: bool | None = None) -> ScanReader:
+    """Create a ScanReader based on the robolog type."""
+    use_cache = use_cache if use_cache is not None else settings.USE_CACHE
+
+    match robolog.detect_robolog_type(robolog_path):
+        case robolog.RobologType.ROS1_BAG_FILE:
+            from src.reader.ros1.bag import scan
+
+            return scan.ScanReader(robolog_path, use_cache=use_cache)
+
+        case robolog.RobologType.ROS2_DB3_FILE | robolog.RobologType.ROS2_DB3_DIR:
+            from src.reader.ros2.db3 import scan
+
+            return scan.ScanReader(robolog_path, use_cache=use_cache)
+
+        case robolog.RobologType.ROS2_MCAP_FILE | robolog.RobologType.ROS2_MCAP_DIR:
+            from src.reader.ros2.mcap import scan
+
+            return scan.ScanReader(robolog_path, use_cache=use_cache)
+
+        case robolog.RobologType.PX4_ULG_FILE:
+            from src.reader.px4.ulg import scan
+
+            return scan.ScanReader(robolog_path, use_cache=use_cache)
+
+        case _:
+            raise robolog.UnsupportedRobologTypeError(robolog_path)
@@ -8,7 +8,7 @@ import pyarrow as pa
 import pyarrow.dataset as ds
 
 from settings import settings
-from src import artifacts
+from src import artifacts, cache, profiling
 from src.reader.reader import Reader
 
 logger = logging.getLogger(__name__)
@@ -53,24 +53,23 @@ class TopicFrequencyReader(Reader):
             start_seconds or self.start_seconds,
             end_seconds or self.end_seconds,
         )
-        if arrow_file.exists() and self._use_cache:
-            logger.debug("Return from cache %s", arrow_file)
-            return ds.dataset(arrow_file, format="arrow")
-        arrow_file.unlink(missing_ok=True)
-        arrow_file.parent.mkdir(parents=True, exist_ok=True)
-
-        schema = pa.schema(
-            [
-                pa.field(settings.ROBOLOG_ID_COLUMN_NAME, pa.string(), nullable=False),
-                pa.field(settings.TIMESTAMP_SECONDS_COLUMN_NAME, pa.float64(), nullable=False),
-            ]
-        )
-        for topic in topics:
-            schema = schema.append(pa.field(topic, pa.float64(), nullable=True))
+        with cache.single_flight(arrow_file):
+            if arrow_file.exists() and self._use_cache:  # possibly created by a concurrent read
+                logger.debug("Return from cache %s", arrow_file)
+                return profiling.record_read(ds.dataset(arrow_file, format="arrow"), cache_hit=True)
+
+            schema = pa.schema(
+                [
+                    pa.field(settings.ROBOLOG_ID_COLUMN_NAME, pa.string(), nullable=False),
+                    pa.field(settings.TIMESTAMP_SECONDS_COLUMN_NAME, pa.float64(), nullable=False),
+                ]
+            )
+            for topic in topics:
+                schema = schema.append(pa.field(topic, pa.float64(), nullable=True))
 
-        try:
             with (
-                pa.OSFile(str(arrow_file), "wb") as sink,
+                cache.write_atomically(arrow_file) as temporary_file,
+                pa.OSFile(str(temporary_file), "wb") as sink,
                 pa.RecordBatchFileWriter(sink, schema=schema) as writer,
             ):
                 for record_batch in self._iter_record_batches(
@@ -84,11 +83,7 @@ class TopicFrequencyReader(Reader):
                     )
 
             logger.debug("Created dataset and cached to %s", arrow_file)
-            return ds.dataset(arrow_file, format="arrow")
-
-        except Exception as e:
-            arrow_file.unlink(missing_ok=True)
-            raise e
+            return profiling.record_read(ds.dataset(arrow_file, format="arrow"), cache_hit=False)
 
     def _iter_record_batches(
         self,
@@ -0,0 +1,143 @@
+"""Base class for reading logging messages from a robolog."""
+
+import logging
+from collections.abc import Iterator
+
+import humanize
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+from settings import settings
+from src import artifacts, cache, profiling
+from src.reader.reader import Reader
+
+logger = logging.getLogger(__name__)
+logger.setLevel(settings.LOG_LEVEL)
+
+# Severity of logging levels across robolog types. Higher is more severe
+LEVEL_SEVERITIES = {
+    "DEBUG": 10,
+    "INFO": 20,
+    "NOTICE": 25,
+    "WARN": 30,
+    "WARNING": 30,
+    "ERROR": 40,
+    "CRITICAL": 50,
+    "FATAL": 50,
+    "ALERT": 60,
+    "EMERGENCY": 70,
+}
+
+
+class UnknownLoggingLevelError(ValueError):
+    """Raised when a logging level is not one of LEVEL_SEVERITIES."""
+
+
+class LoggingMessageReader(Reader):
+    """Base class for reading logging messages from a robolog."""
+
+    def read(
+        self,
+        start_seconds: float | None = None,
+        end_seconds: float | None = None,
+        min_level: str | None = None,
+        name_filter: str | None = None,
+    ) -> ds.Dataset:
+        """Return logging messages for the specified time range, level, and logger name.
+
+        Args:
+            start_seconds (float | None, optional): When to start reading messages.
+            end_seconds (float | None, optional): When to stop reading messages.
+            min_level (str | None, optional): Only keep messages at least as severe as this level,
+                e.g., "WARN". Messages with unrecognized levels are always kept.
+            name_filter (str | None, optional): Only keep messages whose logger name contains
+                this substring. Robologs without logger names (e.g., PX4 ULog) yield no messages.
+
+        Returns:
+            ds.Dataset: A PyArrow dataset containing the logging messages.
+
+        """
+        if min_level is not None and min_level.upper() not in LEVEL_SEVERITIES:
+            raise UnknownLoggingLevelError(min_level)
+
+        logger.debug(
+            "Reading logging messages from %s to %s with min_level=%s and name_filter=%s",
+            start_seconds or self.start_seconds,
+            end_seconds or self.end_seconds,
+            min_level,
+            name_filter,
+        )
+
+        arrow_file = artifacts.logging_arrow_file(
+            self.path,
+            start_seconds or self.start_seconds,
+            end_seconds or self.end_seconds,
+            min_level,
+            name_filter,
+        )
+        with cache.single_flight(arrow_file):
+            if arrow_file.exists() and self._use_cache:  # possibly created by a concurrent read
+                logger.debug("Return from cache %s", arrow_file)
+                return profiling.record_read(ds.dataset(arrow_file, format="arrow"), cache_hit=True)
+
+            schema = pa.schema(
+                [
+                    pa.field(settings.ROBOLOG_ID_COLUMN_NAME, pa.string(), nullable=False),
+                    pa.field(settings.TIMESTAMP_SECONDS_COLUMN_NAME, pa.float64(), nullable=False),
+                    pa.field("level", pa.string(), nullable=False),
+                    pa.field("message", pa.string(), nullable=False),
+                    *self._logging_fields(),
+                ]
+            )
+
+            with (
+                cache.write_atomically(arrow_file) as temporary_file,
+                pa.OSFile(str(temporary_file), "wb") as sink,
+                pa.RecordBatchFileWriter(sink, schema=schema) as writer,
+            ):
+                for record_batch in self._iter_record_batches(
+                    start_seconds, end_seconds, min_level, name_filter, schema
+                ):
+                    writer.write_batch(record_batch)
+                    logger.debug(
+                        "Appended record batch of size %d with %d rows",
+                        humanize.naturalsize(record_batch.nbytes),
+                        humanize.intcomma(record_batch.num_rows),
+                    )
+
+            logger.debug("Created dataset and cached to %s", arrow_file)
+            return profiling.record_read(ds.dataset(arrow_file, format="arrow"), cache_hit=False)
+
+    def _iter_record_batches(
+        self,
+        start_seconds: float | None,
+        end_seconds: float | None,
+        min_level: str | None,
+        name_filter: str | None,
+        schema: pa.Schema,
+    ) -> Iterator[pa.RecordBatch]:
+        """Iterate over record batches of logging messages that pass the filters."""
+        min_severity = LEVEL_SEVERITIES[min_level.upper()] if min_level is not None else None
+
+        batch_size = settings.MIN_ARROW_RECORD_BATCH_SIZE_COUNT
+        batch = {column: [] for column in schema.names}
+
+        for record in self._iter_logging_records(start_seconds, end_seconds):
+            if min_severity is not None and (
+                LEVEL_SEVERITIES.get(record["level"], min_severity) < min_severity
+            ):
+                continue
+            if name_filter is not None and name_filter not in (record.get("name") or ""):
+                continue
+
+            for column in schema.names:
+                batch[column].append(record.get(column))
+
+            if len(batch[settings.ROBOLOG_ID_COLUMN_NAME]) >= batch_size:
+                record_batch = pa.RecordBatch.from_pydict(batch, schema=schema)
+                batch_size = self._estimate_record_batch_size_count(record_batch)
+                batch = {column: [] for column in schema.names}
+                yield record_batch
+
+        if batch[settings.ROBOLOG_ID_COLUMN_NAME]:
+            yield pa.RecordBatch.from_pydict(batch, schema=schema)
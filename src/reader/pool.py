@@ -0,0 +1,112 @@
+"""A process-wide pool of open robolog readers, so repeated requests skip opening robologs."""
+
+import collections
+import logging
+import pathlib
+import threading
+from collections.abc import Callable
+from typing import TypeVar
+
+from settings import settings
+from src.reader.reader import Reader
+
+logger = logging.getLogger(__name__)
+logger.setLevel(settings.LOG_LEVEL)
+
+ReaderT = TypeVar("ReaderT", bound=Reader)
+
+
+# File that ROS2 recorders write last in a robolog directory, so it changes with the recording
+METADATA_FILE_NAME = "metadata.yaml"
+
+
+def _fingerprint(robolog_path: pathlib.Path) -> tuple[int, int]:
+    """Return modification time and size of a robolog file, or of the metadata of a directory.
+
+    It is checked on every request, so directories are not walked, which takes long for large
+    robologs.
+
+    """
+    metadata_path = robolog_path / METADATA_FILE_NAME
+    stat = (
+        metadata_path if robolog_path.is_dir() and metadata_path.exists() else robolog_path
+    ).stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _size_bytes(robolog_path: pathlib.Path) -> int:
+    """Return the total size of a robolog file or directory."""
+    if robolog_path.is_file():
+        return robolog_path.stat().st_size
+    return sum(path.stat().st_size for path in robolog_path.glob("**/*") if path.is_file())
+
+
+class ReaderPool:
+    """Open robolog readers, least recently used first, up to a count and a total robolog size.
+
+    Readers are keyed by the factory function that made them, the robolog path, and whether they
+    use the cache. A reader is made again if its robolog was modified since it was opened.
+
+    """
+
+    def __init__(self, max_count: int, max_bytes: int) -> None:
+        """Initialize the ReaderPool."""
+        self._max_count = max_count
+        self._max_bytes = max_bytes
+        self._readers: collections.OrderedDict[tuple, tuple[tuple[int, int], int, Reader]] = (
+            collections.OrderedDict()
+        )
+        self._key_locks: dict[tuple, threading.Lock] = collections.defaultdict(threading.Lock)
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        make_reader: Callable[[str | pathlib.Path, bool | None], ReaderT],
+        robolog_path: str | pathlib.Path,
+        use_cache: bool | None = None,
+    ) -> ReaderT:
+        """Return an open reader of a robolog, or make one with a factory function.
+
+        Threads asking for the same reader at the same time wait for the first to make it.
+
+        """
+        path = pathlib.Path(robolog_path).absolute()
+        key = (make_reader.__qualname__, str(path), use_cache)
+        fingerprint = _fingerprint(path)
+
+        with self._lock:
+            key_lock = self._key_locks[key]
+
+        with key_lock:
+            with self._lock:
+                if key in self._readers and self._readers[key][0] == fingerprint:
+                    self._readers.move_to_end(key)
+                    return self._readers[key][2]
+
+            logger.debug("Opening %s with %s", path, make_reader.__qualname__)
+            reader = make_reader(path, use_cache)
+            size_bytes = _size_bytes(path)
+            with self._lock:
+                self._readers[key] = (fingerprint, size_bytes, reader)
+                self._readers.move_to_end(key)
+                self._evict()
+            return reader
+
+    def clear(self) -> None:
+        """Drop all open readers."""
+        with self._lock:
+            self._readers.clear()
+
+    def _evict(self) -> None:
+        """Drop least recently used readers beyond the count and size limits, keeping the last."""
+        total_bytes = sum(size_bytes for _, size_bytes, _ in self._readers.values())
+        while len(self._readers) > 1 and (
+            len(self._readers) > self._max_count or total_bytes > self._max_bytes
+        ):
+            key, (_, size_bytes, _) = self._readers.popitem(last=False)
+            self._key_locks.pop(key, None)
+            total_bytes -= size_bytes
+
+
+# Readers shared by all MCP tools and webapp sessions of the process
+readers = ReaderPool(settings.READER_POOL_MAX_COUNT, settings.READER_POOL_MAX_BYTES)
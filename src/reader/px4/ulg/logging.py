@@ -0,0 +1,8 @@
+"""Read logging messages from a PX4 .ulg file."""
+
+from src.reader.logging import LoggingMessageReader
+from src.reader.px4.ulg.reader import ULogReader
+
+
+class LoggingMessageReader(LoggingMessageReader, ULogReader):
+    """Read logging messages from a PX4 .ulg file."""
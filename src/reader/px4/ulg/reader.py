@@ -5,30 +5,34 @@ import pathlib
 from collections.abc import Iterator
 from typing import Any
 
+import pyarrow as pa
 from pyulog import core
 
+from settings import settings
 from src.reader import reader
 from src.reader.metadata import find_primitives
 
+# Syslog severities used by PX4. Lower is more severe
+LOGGING_LEVELS = {
+    "DEBUG": 7,
+    "INFO": 6,
+    "NOTICE": 5,
+    "WARNING": 4,
+    "ERROR": 3,
+    "CRITICAL": 2,
+    "ALERT": 1,
+    "EMERGENCY": 0,
+}
+
 
 class LoggingMessage(reader.LoggingMessage):
     """Logging message in a PX4 .ulg."""
 
     def to_dict(self) -> dict[str, Any]:
         """Convert the logging message to a dictionary."""
-        numeric_level = {
-            "DEBUG": 7,
-            "INFO": 6,
-            "NOTICE": 5,
-            "WARNING": 4,
-            "ERROR": 3,
-            "CRITICAL": 2,
-            "ALERT": 1,
-            "EMERGENCY": 0,
-        }.get(self.level, None)
         return {
             **super().to_dict(),
-            "numeric_level": numeric_level,
+            "numeric_level": LOGGING_LEVELS.get(self.level, None),
         }
 
 
@@ -129,6 +133,30 @@ class ULogReader(reader.Reader):
                 message=message.message,
             )
 
+    def _logging_fields(self) -> list[pa.Field]:
+        """Return Arrow fields of logging messages beyond timestamp, level, and message."""
+        return [pa.field("numeric_level", pa.int64(), nullable=True)]
+
+    def _iter_logging_records(
+        self, start_seconds: float | None, end_seconds: float | None
+    ) -> Iterator[dict[str, Any]]:
+        """Iterate over logging messages in the time range as plain dictionaries."""
+        for message in self._ulog.logged_messages:
+            timestamp_seconds = message.timestamp / 1e6
+            if start_seconds is not None and timestamp_seconds < start_seconds:
+                continue
+            if end_seconds is not None and timestamp_seconds > end_seconds:
+                continue
+
+            level = message.log_level_str()
+            yield {
+                settings.ROBOLOG_ID_COLUMN_NAME: self.robolog_id,
+                settings.TIMESTAMP_SECONDS_COLUMN_NAME: timestamp_seconds,
+                "level": level,
+                "message": message.message,
+                "numeric_level": LOGGING_LEVELS.get(level, None),
+            }
+
     def _iter_messages(
         self,
         topics: list[str],
@@ -0,0 +1,8 @@
+"""Read several extractions from a PX4 .ulg file in a single pass."""
+
+from src.reader.px4.ulg.reader import ULogReader
+from src.reader.scan import ScanReader
+
+
+class ScanReader(ScanReader, ULogReader):
+    """Read several extractions from a PX4 .ulg file in a single pass."""
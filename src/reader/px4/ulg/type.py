@@ -32,17 +32,17 @@ class TypeMessageReader(TypeMessageReader, ULogReader):
                 settings.ROBOLOG_ID_COLUMN_NAME: self.robolog_id,
                 settings.TIMESTAMP_SECONDS_COLUMN_NAME: timestamp,
                 settings.TOPIC_COLUMN_NAME: topic,
-                settings.MESSAGE_COLUMN_NAME: converter.to_dict(message),
+                settings.MESSAGE_COLUMN_NAME: message,
             }
 
             for column, value in record.items():
                 batch[column].append(value)
 
             if len(batch[settings.ROBOLOG_ID_COLUMN_NAME]) >= batch_size:
-                record_batch = pa.RecordBatch.from_pydict(batch, schema=schema)
+                record_batch = self._to_record_batch(batch, schema, converter)
                 batch_size = self._estimate_record_batch_size_count(record_batch)
                 batch = {column: [] for column in schema.names}
                 yield record_batch
 
         if batch[settings.ROBOLOG_ID_COLUMN_NAME]:
-            yield pa.RecordBatch.from_pydict(batch, schema=schema)
+            yield self._to_record_batch(batch, schema, converter)
@@ -10,7 +10,7 @@ from pydantic import BaseModel
 from settings import settings
 from src import robolog
 from src.convert import factory
-from src.convert.converter import MessageConverter
+from src.convert.converter import FieldsNotFoundError, MessageConverter
 
 
 class TopicsNotFoundError(ValueError):
@@ -122,6 +122,36 @@ class Reader:
         """Iterate over logging messages in the robolog."""
         raise NotImplementedError()
 
+    def _logging_fields(self) -> list[pa.Field]:
+        """Return Arrow fields of logging messages beyond timestamp, level, and message."""
+        raise NotImplementedError()
+
+    def _iter_logging_records(
+        self, start_seconds: float | None, end_seconds: float | None
+    ) -> Iterator[dict[str, Any]]:
+        """Iterate over logging messages in the time range as plain dictionaries.
+
+        The dictionaries are keyed like `LoggingMessage.to_dict`, but skip pydantic validation.
+
+        """
+        raise NotImplementedError()
+
+    def _iter_messages(
+        self,
+        topics: list[str],
+        start_seconds: float | None,
+        end_seconds: float | None,
+        timestamps_only: bool,
+    ) -> Iterator[tuple[float, str, Any]]:
+        """Iterate over decoded messages for the specified topics and time range.
+
+        Yields:
+            Iterator[tuple[float, str, Any]]: Tuples of timestamp in seconds, topic name, and the
+                decoded message (or None if `timestamps_only` is True).
+
+        """
+        raise NotImplementedError()
+
     def _raise_if_missing_topics(self, topics: list[str]) -> None:
         """Raise if the specified topics are not found in the robolog."""
         missing = list(set(topics) - set(self.topics))
@@ -139,6 +169,34 @@ class Reader:
             topic: factory.make_converter(self.path, self.type_names[topic]) for topic in topics
         }
 
+    def _project_converters(
+        self, converters: dict[str, MessageConverter], fields: list[str]
+    ) -> dict[str, MessageConverter]:
+        """Return converters of only the fields at dotted paths that start with their topic.
+
+        For example, "/odom.pose.pose.position" keeps only the position of "/odom" messages.
+        Topics without paths keep all their fields.
+
+        Raises:
+            FieldsNotFoundError: If a path does not start with a topic or is not in its schema.
+
+        """
+        paths: dict[str, list[str]] = {}
+        for path in fields:
+            topic = max(
+                (t for t in converters if path == t or path.startswith(f"{t}.")),
+                key=len,
+                default=None,
+            )
+            if topic is None:
+                raise FieldsNotFoundError([path])
+            paths.setdefault(topic, []).append(path[len(topic) + 1 :])
+
+        return {
+            topic: converter.project(paths[topic]) if all(paths.get(topic, [""])) else converter
+            for topic, converter in converters.items()
+        }
+
     def _estimate_record_batch_size_count(self, record_batch: pa.RecordBatch) -> int:
         """Estimate the number of rows that can fit in a record batch."""
         estimate = int(
@@ -2,7 +2,6 @@
 
 from collections.abc import Iterator
 
-import genpy
 import pyarrow as pa
 
 from settings import settings
@@ -21,11 +20,7 @@ class TopicFrequencyReader(TopicFrequencyReader, BagReader):
         schema: pa.Schema,
     ) -> Iterator[pa.RecordBatch]:
         """Iterate over record batches for the specified topics and time range."""
-        messages = self._bag.read_messages(
-            topics,
-            genpy.Time.from_sec(start_seconds) if start_seconds else None,
-            genpy.Time.from_sec(end_seconds) if end_seconds else None,
-        )
+        messages = self._read_messages(topics, start_seconds, end_seconds)
 
         batch_size = settings.MIN_ARROW_RECORD_BATCH_SIZE_COUNT
         batch = {column: [] for column in schema.names}
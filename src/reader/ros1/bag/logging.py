@@ -0,0 +1,8 @@
+"""Read logging messages from a ROS1 .bag file."""
+
+from src.reader.logging import LoggingMessageReader
+from src.reader.ros1.bag.reader import BagReader
+
+
+class LoggingMessageReader(LoggingMessageReader, BagReader):
+    """Read logging messages from a ROS1 .bag file."""
@@ -4,13 +4,24 @@ import pathlib
 from collections.abc import Iterator
 from typing import Any
 
+import genpy
+import pyarrow as pa
 import rosbag
 import yaml
 
+from settings import settings
 from src.reader import reader
 
 LOGGING_MESSAGE_TYPE_NAME = "rosgraph_msgs/Log"
 
+LOGGING_LEVELS = {
+    1: "DEBUG",
+    2: "INFO",
+    4: "WARN",
+    8: "ERROR",
+    16: "FATAL",
+}
+
 
 class LoggingMessage(reader.LoggingMessage):
     """Logging message in a ROS1 .bag file."""
@@ -44,6 +55,7 @@ class BagReader(reader.Reader):
         """Initialize the BagReader."""
         super().__init__(robolog_path, use_cache)
 
+        self._allow_unindexed = allow_unindexed
         self._bag = rosbag.Bag(robolog_path, allow_unindexed=allow_unindexed)
         self._metadata = yaml.safe_load(self._bag._get_yaml_info())
 
@@ -82,6 +94,27 @@ class BagReader(reader.Reader):
         """Return a mapping of topic names to their message counts."""
         return {info["topic"]: info["messages"] for info in self.metadata["topics"]}
 
+    def _read_messages(
+        self,
+        topics: list[str],
+        start_seconds: float | None = None,
+        end_seconds: float | None = None,
+        raw: bool = False,
+    ) -> Iterator[tuple[str, Any, genpy.Time]]:
+        """Iterate over messages of topics in the time range, as `rosbag.Bag.read_messages` does.
+
+        Every read opens its own handle of the bag, since reading seeks the file, and readers may
+        be shared by threads, e.g., in the reader pool. `self._bag` is only used for its index.
+
+        """
+        with rosbag.Bag(self.path, allow_unindexed=self._allow_unindexed) as bag:
+            yield from bag.read_messages(
+                topics,
+                genpy.Time.from_sec(start_seconds) if start_seconds else None,
+                genpy.Time.from_sec(end_seconds) if end_seconds else None,
+                raw=raw,
+            )
+
     @property
     def logging_messages(self) -> Iterator[LoggingMessage]:
         """Iterate over logging messages in the robolog."""
@@ -94,14 +127,8 @@ class BagReader(reader.Reader):
         if not topics:
             return
 
-        for topic, message, timestamp in self._bag.read_messages(topics=topics):
-            level = {
-                1: "DEBUG",
-                2: "INFO",
-                4: "WARN",
-                8: "ERROR",
-                16: "FATAL",
-            }.get(message.level, "UNKNOWN")
+        for topic, message, timestamp in self._read_messages(topics):
+            level = LOGGING_LEVELS.get(message.level, "UNKNOWN")
 
             yield LoggingMessage(
                 robolog_id=self.robolog_id,
@@ -115,3 +142,54 @@ class BagReader(reader.Reader):
                 function=message.function,
                 line=message.line,
             )
+
+    def _logging_fields(self) -> list[pa.Field]:
+        """Return Arrow fields of logging messages beyond timestamp, level, and message."""
+        return [
+            pa.field("numeric_level", pa.int64(), nullable=False),
+            pa.field("topic", pa.string(), nullable=False),
+            pa.field("name", pa.string(), nullable=False),
+            pa.field("file", pa.string(), nullable=False),
+            pa.field("function", pa.string(), nullable=False),
+            pa.field("line", pa.int64(), nullable=False),
+        ]
+
+    def _iter_logging_records(
+        self, start_seconds: float | None, end_seconds: float | None
+    ) -> Iterator[dict[str, Any]]:
+        """Iterate over logging messages in the time range as plain dictionaries."""
+        topics = [
+            topic
+            for topic, type_name in self.type_names.items()
+            if type_name == LOGGING_MESSAGE_TYPE_NAME
+        ]
+
+        if not topics:
+            return
+
+        for topic, message, timestamp in self._read_messages(topics, start_seconds, end_seconds):
+            yield {
+                settings.ROBOLOG_ID_COLUMN_NAME: self.robolog_id,
+                settings.TIMESTAMP_SECONDS_COLUMN_NAME: timestamp.to_sec(),
+                "level": LOGGING_LEVELS.get(message.level, "UNKNOWN"),
+                "message": message.msg,
+                "numeric_level": message.level,
+                "topic": topic,
+                "name": message.name,
+                "file": message.file,
+                "function": message.function,
+                "line": message.line,
+            }
+
+    def _iter_messages(
+        self,
+        topics: list[str],
+        start_seconds: float | None,
+        end_seconds: float | None,
+        timestamps_only: bool,
+    ) -> Iterator[tuple[float, str, genpy.Message | None]]:
+        """Iterate over decoded messages for the specified topics and time range."""
+        messages = self._read_messages(topics, start_seconds, end_seconds, raw=timestamps_only)
+
+        for topic, message, timestamp in messages:
+            yield timestamp.to_sec(), topic, message if not timestamps_only else None
@@ -0,0 +1,8 @@
+"""Read several extractions from a ROS1 .bag file in a single pass."""
+
+from src.reader.ros1.bag.reader import BagReader
+from src.reader.scan import ScanReader
+
+
+class ScanReader(ScanReader, BagReader):
+    """Read several extractions from a ROS1 .bag file in a single pass."""
@@ -2,7 +2,6 @@
 
 from collections.abc import Iterator
 
-import genpy
 import pyarrow as pa
 
 from settings import settings
@@ -24,11 +23,7 @@ class TopicMessageReader(TopicMessageReader, BagReader):
         converters: dict[str, MessageConverter],
     ) -> Iterator[pa.RecordBatch]:
         """Iterate over record batches for the specified topics and time range."""
-        messages = self._bag.read_messages(
-            topics,
-            genpy.Time.from_sec(start_seconds) if start_seconds else None,
-            genpy.Time.from_sec(end_seconds) if end_seconds else None,
-        )
+        messages = self._read_messages(topics, start_seconds, end_seconds)
 
         batch_size = settings.MIN_ARROW_RECORD_BATCH_SIZE_COUNT
         batch = {column: [] for column in schema.names}
@@ -39,16 +34,16 @@ class TopicMessageReader(TopicMessageReader, BagReader):
                 record = {column: None for column in schema.names}
             record[settings.ROBOLOG_ID_COLUMN_NAME] = self.robolog_id
             record[settings.TIMESTAMP_SECONDS_COLUMN_NAME] = timestamp.to_sec()
-            record[topic] = converters[topic].to_dict(message)
+            record[topic] = message
 
             for column, value in record.items():
                 batch[column].append(value)
 
             if len(batch[settings.ROBOLOG_ID_COLUMN_NAME]) >= batch_size:
-                record_batch = pa.RecordBatch.from_pydict(batch, schema=schema)
+                record_batch = self._to_record_batch(batch, schema, converters)
                 batch_size = self._estimate_record_batch_size_count(record_batch)
                 batch = {column: [] for column in schema.names}
                 yield record_batch
 
         if batch[settings.ROBOLOG_ID_COLUMN_NAME]:
-            yield pa.RecordBatch.from_pydict(batch, schema=schema)
+            yield self._to_record_batch(batch, schema, converters)
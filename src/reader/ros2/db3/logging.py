@@ -0,0 +1,14 @@
+"""Read logging messages from a ROS2 .db3 bag."""
+
+import pathlib
+
+from src.reader.logging import LoggingMessageReader
+from src.reader.ros2.reader import Ros2Reader
+
+
+class LoggingMessageReader(LoggingMessageReader, Ros2Reader):
+    """Read logging messages from a ROS2 .db3 bag."""
+
+    def __init__(self, robolog_path: str | pathlib.Path, use_cache: bool = True) -> None:
+        """Initialize the LoggingMessageReader."""
+        super().__init__(robolog_path, storage_id="sqlite3", use_cache=use_cache)
@@ -0,0 +1,14 @@
+"""Read several extractions from a ROS2 .db3 bag in a single pass."""
+
+import pathlib
+
+from src.reader.ros2.reader import Ros2Reader
+from src.reader.scan import ScanReader
+
+
+class ScanReader(ScanReader, Ros2Reader):
+    """Read several extractions from a ROS2 .db3 bag in a single pass."""
+
+    def __init__(self, robolog_path: str | pathlib.Path, use_cache: bool = True) -> None:
+        """Initialize the ScanReader."""
+        super().__init__(robolog_path, storage_id="sqlite3", use_cache=use_cache)
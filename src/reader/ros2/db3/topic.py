@@ -51,15 +51,15 @@ class TopicMessageReader(TopicMessageReader, Ros2Reader):
                 record = {column: None for column in schema.names}
             record[settings.ROBOLOG_ID_COLUMN_NAME] = self.robolog_id
             record[settings.TIMESTAMP_SECONDS_COLUMN_NAME] = timestamp_seconds
-            record[topic] = converters[topic].to_dict(
-                deserialize_message(serialized_message, get_message(self.type_names[topic]))
+            record[topic] = deserialize_message(
+                serialized_message, get_message(self.type_names[topic])
             )
 
             for column, value in record.items():
                 batch[column].append(value)
 
             if len(batch[settings.ROBOLOG_ID_COLUMN_NAME]) >= batch_size:
-                record_batch = pa.RecordBatch.from_pydict(batch, schema=schema)
+                record_batch = self._to_record_batch(batch, schema, converters)
                 batch_size = self._estimate_record_batch_size_count(record_batch)
                 batch = {column: [] for column in schema.names}
                 yield record_batch
@@ -68,4 +68,4 @@ class TopicMessageReader(TopicMessageReader, Ros2Reader):
             reader.close()
 
         if batch[settings.ROBOLOG_ID_COLUMN_NAME]:
-            yield pa.RecordBatch.from_pydict(batch, schema=schema)
+            yield self._to_record_batch(batch, schema, converters)
@@ -49,8 +49,8 @@ class TypeMessageReader(TypeMessageReader, Ros2Reader):
                 settings.ROBOLOG_ID_COLUMN_NAME: self.robolog_id,
                 settings.TIMESTAMP_SECONDS_COLUMN_NAME: timestamp_seconds,
                 settings.TOPIC_COLUMN_NAME: topic,
-                settings.MESSAGE_COLUMN_NAME: converter.to_dict(
-                    deserialize_message(serialized_message, get_message(self.type_names[topic]))
+                settings.MESSAGE_COLUMN_NAME: deserialize_message(
+                    serialized_message, get_message(self.type_names[topic])
                 ),
             }
 
@@ -58,7 +58,7 @@ class TypeMessageReader(TypeMessageReader, Ros2Reader):
                 batch[column].append(value)
 
             if len(batch[settings.ROBOLOG_ID_COLUMN_NAME]) >= batch_size:
-                record_batch = pa.RecordBatch.from_pydict(batch, schema=schema)
+                record_batch = self._to_record_batch(batch, schema, converter)
                 batch_size = self._estimate_record_batch_size_count(record_batch)
                 batch = {column: [] for column in schema.names}
                 yield record_batch
@@ -67,4 +67,4 @@ class TypeMessageReader(TypeMessageReader, Ros2Reader):
             reader.close()
 
         if batch[settings.ROBOLOG_ID_COLUMN_NAME]:
-            yield pa.RecordBatch.from_pydict(batch, schema=schema)
+            yield self._to_record_batch(batch, schema, converter)
@@ -0,0 +1,61 @@
+"""Read several extractions from a ROS2 .mcap bag in a single pass."""
+
+import pathlib
+from collections.abc import Iterator
+from typing import Any
+
+from mcap import decoder
+from mcap.reader import make_reader
+
+from src.reader.ros2.reader import Ros2Reader
+from src.reader.scan import ScanReader
+
+
+class ScanReader(ScanReader, Ros2Reader):
+    """Read several extractions from a ROS2 .mcap bag in a single pass."""
+
+    def __init__(
+        self,
+        robolog_path: str | pathlib.Path,
+        use_cache: bool = True,
+        decoder_factories: list[decoder.DecoderFactory] | None = None,
+    ) -> None:
+        """Initialize the ScanReader."""
+        super().__init__(robolog_path, storage_id="mcap", use_cache=use_cache)
+
+        if decoder_factories is None:
+            from mcap_protobuf.decoder import DecoderFactory as ProtobufDecoderFactory
+            from mcap_ros1.decoder import DecoderFactory as Ros1DecoderFactory
+            from mcap_ros2.decoder import DecoderFactory as Ros2DecoderFactory
+            # ... more factories can be added here once available.
+
+            decoder_factories = [
+                Ros1DecoderFactory(),
+                Ros2DecoderFactory(),
+                ProtobufDecoderFactory(),
+            ]
+
+        self._decoder_factories = decoder_factories
+
+    def _iter_messages(
+        self,
+        topics: list[str],
+        start_seconds: float | None,
+        end_seconds: float | None,
+        timestamps_only: bool,
+    ) -> Iterator[tuple[float, str, Any]]:
+        """Iterate over decoded messages for the specified topics and time range."""
+        for mcap_file in self.metadata["relative_file_paths"]:
+            with open(self.path / mcap_file, "rb") as stream:
+                reader = make_reader(stream, decoder_factories=self._decoder_factories)
+                start_time = start_seconds * 1e9 if start_seconds else None
+                end_time = end_seconds * 1e9 if end_seconds else None
+
+                if timestamps_only:
+                    for _, channel, message in reader.iter_messages(topics, start_time, end_time):
+                        yield message.log_time / 1e9, channel.topic, None
+                    continue
+
+                messages = reader.iter_decoded_messages(topics, start_time, end_time)
+                for _, channel, message, decoded_message in messages:
+                    yield message.log_time / 1e9, channel.topic, decoded_message
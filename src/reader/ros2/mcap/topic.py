@@ -67,16 +67,16 @@ class TopicMessageReader(TopicMessageReader, Ros2Reader):
                         record = {column: None for column in schema.names}
                     record[settings.ROBOLOG_ID_COLUMN_NAME] = self.robolog_id
                     record[settings.TIMESTAMP_SECONDS_COLUMN_NAME] = message.log_time / 1e9
-                    record[channel.topic] = converters[channel.topic].to_dict(decoded_message)
+                    record[channel.topic] = decoded_message
 
                     for column, value in record.items():
                         batch[column].append(value)
 
                     if len(batch[settings.ROBOLOG_ID_COLUMN_NAME]) >= batch_size:
-                        record_batch = pa.RecordBatch.from_pydict(batch, schema=schema)
+                        record_batch = self._to_record_batch(batch, schema, converters)
                         batch_size = self._estimate_record_batch_size_count(record_batch)
                         batch = {column: [] for column in schema.names}
                         yield record_batch
 
         if batch[settings.ROBOLOG_ID_COLUMN_NAME]:
-            yield pa.RecordBatch.from_pydict(batch, schema=schema)
+            yield self._to_record_batch(batch, schema, converters)
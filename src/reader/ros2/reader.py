@@ -4,15 +4,25 @@ import pathlib
 from collections.abc import Iterator
 from typing import Any
 
+import pyarrow as pa
 import rosbag2_py
 from rclpy.serialization import deserialize_message
 from rosidl_runtime_py.utilities import get_message
 
+from settings import settings
 from src.reader import reader
 from src.reader.ros2 import metadata
 
 LOGGING_MESSAGE_TYPE_NAME = "rcl_interfaces/msg/Log"
 
+LOGGING_LEVELS = {
+    10: "DEBUG",
+    20: "INFO",
+    30: "WARN",
+    40: "ERROR",
+    50: "FATAL",
+}
+
 
 class LoggingMessage(reader.LoggingMessage):
     """Logging message in a ROS2 bag."""
@@ -111,13 +121,7 @@ class Ros2Reader(reader.Reader):
                 serialized_message, get_message(LOGGING_MESSAGE_TYPE_NAME)
             )
 
-            level = {
-                10: "DEBUG",
-                20: "INFO",
-                30: "WARN",
-                40: "ERROR",
-                50: "FATAL",
-            }.get(message.level, "UNKNOWN")
+            level = LOGGING_LEVELS.get(message.level, "UNKNOWN")
 
             yield LoggingMessage(
                 robolog_id=self.robolog_id,
@@ -131,3 +135,88 @@ class Ros2Reader(reader.Reader):
                 function=message.function,
                 line=message.line,
             )
+
+    def _logging_fields(self) -> list[pa.Field]:
+        """Return Arrow fields of logging messages beyond timestamp, level, and message."""
+        return [
+            pa.field("numeric_level", pa.int64(), nullable=False),
+            pa.field("topic", pa.string(), nullable=False),
+            pa.field("name", pa.string(), nullable=False),
+            pa.field("file", pa.string(), nullable=False),
+            pa.field("function", pa.string(), nullable=False),
+            pa.field("line", pa.int64(), nullable=False),
+        ]
+
+    def _iter_logging_records(
+        self, start_seconds: float | None, end_seconds: float | None
+    ) -> Iterator[dict[str, Any]]:
+        """Iterate over logging messages in the time range as plain dictionaries."""
+        topics = [
+            topic
+            for topic, type_name in self.type_names.items()
+            if type_name == LOGGING_MESSAGE_TYPE_NAME
+        ]
+
+        if not topics:
+            return
+
+        reader = rosbag2_py.SequentialReader()
+        reader.open(self._storage_options, rosbag2_py.ConverterOptions("", ""))
+        reader.set_filter(rosbag2_py.StorageFilter(topics))
+        if start_seconds is not None:
+            reader.seek(int(start_seconds * 1e9))
+
+        message_type = get_message(LOGGING_MESSAGE_TYPE_NAME)
+
+        while reader.has_next():
+            topic, serialized_message, nanoseconds = reader.read_next()
+            timestamp_seconds = nanoseconds / 1e9
+            if end_seconds is not None and timestamp_seconds > end_seconds:
+                break
+
+            message = deserialize_message(serialized_message, message_type)
+            yield {
+                settings.ROBOLOG_ID_COLUMN_NAME: self.robolog_id,
+                settings.TIMESTAMP_SECONDS_COLUMN_NAME: timestamp_seconds,
+                "level": LOGGING_LEVELS.get(message.level, "UNKNOWN"),
+                "message": message.msg,
+                "numeric_level": message.level,
+                "topic": topic,
+                "name": message.name,
+                "file": message.file,
+                "function": message.function,
+                "line": message.line,
+            }
+
+        if hasattr(reader, "close"):  # The `close` method was added since Jazzy
+            reader.close()
+
+    def _iter_messages(
+        self,
+        topics: list[str],
+        start_seconds: float | None,
+        end_seconds: float | None,
+        timestamps_only: bool,
+    ) -> Iterator[tuple[float, str, Any]]:
+        """Iterate over decoded messages for the specified topics and time range."""
+        reader = rosbag2_py.SequentialReader()
+        reader.open(self._storage_options, rosbag2_py.ConverterOptions("", ""))
+        reader.set_filter(rosbag2_py.StorageFilter(topics))
+        if start_seconds is not None:
+            reader.seek(int(start_seconds * 1e9))
+
+        message_types = {topic: get_message(self.type_names[topic]) for topic in topics}
+
+        while reader.has_next():
+            topic, serialized_message, nanoseconds = reader.read_next()
+            timestamp_seconds = nanoseconds / 1e9
+            if end_seconds is not None and timestamp_seconds > end_seconds:
+                break
+
+            message = None
+            if not timestamps_only:
+                message = deserialize_message(serialized_message, message_types[topic])
+            yield timestamp_seconds, topic, message
+
+        if hasattr(reader, "close"):  # The `close` method was added since Jazzy
+            reader.close()
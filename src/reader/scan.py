@@ -0,0 +1,394 @@
+"""Base class for reading several extractions from a robolog in a single pass."""
+
+import contextlib
+import logging
+import os
+import pathlib
+from typing import Any
+
+import humanize
+import pyarrow as pa
+import pyarrow.dataset as ds
+from pydantic import BaseModel
+
+from settings import settings
+from src import artifacts, cache, predicate, profiling
+from src.convert import factory
+from src.convert.converter import MessageConverter
+from src.reader.reader import Reader
+
+logger = logging.getLogger(__name__)
+logger.setLevel(settings.LOG_LEVEL)
+
+
+class TopicScan(BaseModel):
+    """Messages from specific topics, as returned by `TopicMessageReader.read`."""
+
+    # Topics to read messages from
+    topics: list[str]
+
+    # Whether to perform a forward fill on the topics
+    ffill: bool = False
+
+    # Dotted paths of fields to read, starting with their topic. If None, all fields are read
+    fields: list[str] | None = None
+
+    # SQL expression that messages must satisfy. If None, all messages are read
+    filter: str | None = None
+
+
+class TypeScan(BaseModel):
+    """Messages of a specific message type, as returned by `TypeMessageReader.read`."""
+
+    # Message type to read messages of
+    type_name: str
+
+    # Topics to exclude from the extraction
+    exclude_topics: list[str] = []
+
+    # Dotted paths of message fields to read. If None, all fields are read
+    fields: list[str] | None = None
+
+    # SQL expression that messages must satisfy. If None, all messages are read
+    filter: str | None = None
+
+
+class FrequencyScan(BaseModel):
+    """Message frequencies of specific topics, as returned by `TopicFrequencyReader.read`."""
+
+    # Topics to calculate message frequencies of
+    topics: list[str]
+
+
+Scan = TopicScan | TypeScan | FrequencyScan
+
+
+class _Output:
+    """Rows of one scan, converted to record batches and written to its Arrow file."""
+
+    def __init__(  # noqa: PLR0913
+        self,
+        reader: Reader,
+        topics: list[str],
+        arrow_file: pathlib.Path,
+        schema: pa.Schema,
+        converters: dict[str, MessageConverter],
+        message_filter: predicate.MessageFilter | None = None,
+    ) -> None:
+        self.topics = topics
+        self.arrow_file = arrow_file
+        self._reader = reader
+        self._schema = schema
+        self._converters = converters
+        self._message_filter = message_filter
+        self._batch_size = settings.MIN_ARROW_RECORD_BATCH_SIZE_COUNT
+        self._batch = {column: [] for column in schema.names}
+        self._temporary_file = None
+        self._sink = None
+        self._writer = None
+
+    @property
+    def decodes_messages(self) -> bool:
+        """Return whether the output needs decoded messages rather than timestamps only."""
+        return bool(self._converters)
+
+    def open(self) -> None:
+        """Open a temporary file for writing, which replaces the Arrow file once closed."""
+        self._temporary_file = cache.temporary_path(self.arrow_file)
+        self._sink = pa.OSFile(str(self._temporary_file), "wb")
+        self._writer = pa.RecordBatchFileWriter(self._sink, schema=self._schema)
+
+    def append(self, timestamp_seconds: float, topic: str, message: Any) -> None:  # noqa: ANN401
+        """Append a message to the output."""
+        raise NotImplementedError()
+
+    def close(self) -> None:
+        """Write remaining rows and close the Arrow file."""
+        if self._batch[settings.ROBOLOG_ID_COLUMN_NAME]:
+            self._write_batch()
+        self._writer.close()
+        self._sink.close()
+        os.replace(self._temporary_file, self.arrow_file)
+
+    def discard(self) -> None:
+        """Close and delete the temporary file, e.g., after a failed read."""
+        if self._sink is not None and not self._sink.closed:
+            self._sink.close()
+        if self._temporary_file is not None:
+            self._temporary_file.unlink(missing_ok=True)
+
+    def _append_row(self, row: dict[str, Any]) -> None:
+        for column, value in row.items():
+            self._batch[column].append(value)
+
+        if len(self._batch[settings.ROBOLOG_ID_COLUMN_NAME]) >= self._batch_size:
+            record_batch = self._write_batch()
+            self._batch_size = self._reader._estimate_record_batch_size_count(record_batch)
+
+    def _write_batch(self) -> pa.RecordBatch:
+        arrays = []
+        for field in self._schema:
+            if field.name in self._converters:
+                arrays.append(self._converters[field.name].to_arrow(self._batch[field.name]))
+            else:
+                arrays.append(pa.array(self._batch[field.name], type=field.type))
+
+        record_batch = pa.RecordBatch.from_arrays(arrays, schema=self._schema)
+        self._batch = {column: [] for column in self._schema.names}
+        filtered_batch = (
+            self._message_filter.apply(record_batch) if self._message_filter else record_batch
+        )
+        if filtered_batch.num_rows > 0:
+            self._writer.write_batch(filtered_batch)
+            logger.debug(
+                "Appended record batch of size %s with %s rows to %s",
+                humanize.naturalsize(filtered_batch.nbytes),
+                humanize.intcomma(filtered_batch.num_rows),
+                self.arrow_file.name,
+            )
+        return record_batch
+
+
+class _TopicOutput(_Output):
+    def __init__(  # noqa: PLR0913
+        self,
+        reader: Reader,
+        topics: list[str],
+        arrow_file: pathlib.Path,
+        schema: pa.Schema,
+        converters: dict[str, MessageConverter],
+        ffill: bool,
+        message_filter: predicate.MessageFilter | None = None,
+    ) -> None:
+        super().__init__(reader, topics, arrow_file, schema, converters, message_filter)
+        self._ffill = ffill
+        self._record = {column: None for column in self._schema.names}
+
+    def append(self, timestamp_seconds: float, topic: str, message: Any) -> None:  # noqa: ANN401
+        """Append a message to its topic column, forward filling other topics if enabled."""
+        if not self._ffill:
+            self._record = {column: None for column in self._schema.names}
+        self._record[settings.ROBOLOG_ID_COLUMN_NAME] = self._reader.robolog_id
+        self._record[settings.TIMESTAMP_SECONDS_COLUMN_NAME] = timestamp_seconds
+        self._record[topic] = message
+        self._append_row(self._record)
+
+
+class _TypeOutput(_Output):
+    def append(self, timestamp_seconds: float, topic: str, message: Any) -> None:  # noqa: ANN401
+        """Append a message along with its topic name."""
+        self._append_row(
+            {
+                settings.ROBOLOG_ID_COLUMN_NAME: self._reader.robolog_id,
+                settings.TIMESTAMP_SECONDS_COLUMN_NAME: timestamp_seconds,
+                settings.TOPIC_COLUMN_NAME: topic,
+                settings.MESSAGE_COLUMN_NAME: message,
+            }
+        )
+
+
+class _FrequencyOutput(_Output):
+    def __init__(self, reader: Reader, topics: list[str], arrow_file: pathlib.Path) -> None:
+        schema = pa.schema(
+            [
+                pa.field(settings.ROBOLOG_ID_COLUMN_NAME, pa.string(), nullable=False),
+                pa.field(settings.TIMESTAMP_SECONDS_COLUMN_NAME, pa.float64(), nullable=False),
+                *[pa.field(topic, pa.float64(), nullable=True) for topic in topics],
+            ]
+        )
+        super().__init__(reader, topics, arrow_file, schema, converters={})
+        self._latest = {topic: None for topic in self.topics}
+
+    def append(self, timestamp_seconds: float, topic: str, _: Any) -> None:  # noqa: ANN401
+        """Append the time elapsed since the previous message of the same topic."""
+        record = {column: None for column in self._schema.names}
+        record[settings.ROBOLOG_ID_COLUMN_NAME] = self._reader.robolog_id
+        record[settings.TIMESTAMP_SECONDS_COLUMN_NAME] = timestamp_seconds
+        if self._latest[topic] is not None:
+            record[topic] = timestamp_seconds - self._latest[topic]
+        self._latest[topic] = timestamp_seconds
+        self._append_row(record)
+
+
+class ScanReader(Reader):
+    """Base class for reading several extractions from a robolog in a single pass.
+
+    Each extraction yields the same dataset, cached to the same Arrow file, as its dedicated
+    reader. Extractions that are not cached yet share one pass over the union of their topics,
+    so I/O and decompression are paid once.
+
+    """
+
+    def read(
+        self,
+        scans: list[Scan],
+        start_seconds: float | None = None,
+        end_seconds: float | None = None,
+    ) -> list[ds.Dataset]:
+        """Return a dataset for each scan for the specified time range.
+
+        Args:
+            scans (list[Scan]): Extractions to read.
+            start_seconds (float | None, optional): When to start reading messages.
+            end_seconds (float | None, optional): When to stop reading messages.
+
+        Returns:
+            list[ds.Dataset]: PyArrow datasets, in the same order as `scans`.
+
+        """
+        outputs = [
+            self._make_output(
+                scan, start_seconds or self.start_seconds, end_seconds or self.end_seconds
+            )
+            for scan in scans
+        ]
+
+        pending, arrow_files, cache_hits = [], set(), []
+        for output in outputs:
+            cache_hits.append(output.arrow_file.exists() and self._use_cache)
+            if cache_hits[-1]:
+                logger.debug("Return from cache %s", output.arrow_file)
+            elif output.arrow_file not in arrow_files:  # identical scans share one output
+                pending.append(output)
+            arrow_files.add(output.arrow_file)
+
+        with contextlib.ExitStack() as stack:
+            for arrow_file in sorted(output.arrow_file for output in pending):  # avoids deadlocks
+                stack.enter_context(cache.single_flight(arrow_file))
+            pending = [  # skip outputs created by concurrent reads in the meantime
+                output for output in pending if not (output.arrow_file.exists() and self._use_cache)
+            ]
+            if pending:
+                self._write_outputs(pending, start_seconds, end_seconds)
+
+        return [
+            profiling.record_read(ds.dataset(output.arrow_file, format="arrow"), cache_hit)
+            for output, cache_hit in zip(outputs, cache_hits, strict=True)
+        ]
+
+    def _write_outputs(
+        self, outputs: list[_Output], start_seconds: float | None, end_seconds: float | None
+    ) -> None:
+        """Read the union of topics of the outputs once and route each message to its outputs."""
+        topics = sorted({topic for output in outputs for topic in output.topics})
+        logger.debug(
+            "Reading %d scans over topics %s from %s to %s in a single pass",
+            len(outputs),
+            topics,
+            start_seconds or self.start_seconds,
+            end_seconds or self.end_seconds,
+        )
+
+        routes = {topic: [] for topic in topics}
+        for output in outputs:
+            for topic in output.topics:
+                routes[topic].append(output)
+
+        try:
+            for output in outputs:
+                output.open()
+
+            messages = self._iter_messages(
+                topics,
+                start_seconds,
+                end_seconds,
+                timestamps_only=not any(output.decodes_messages for output in outputs),
+            )
+            for timestamp_seconds, topic, message in messages:
+                for output in routes[topic]:
+                    output.append(timestamp_seconds, topic, message)
+
+            for output in outputs:
+                output.close()
+                logger.debug("Created dataset and cached to %s", output.arrow_file)
+
+        except Exception as e:
+            for output in outputs:
+                output.discard()
+            raise e
+
+    def _make_output(self, scan: Scan, start_seconds: float, end_seconds: float) -> _Output:
+        """Return the output of a scan, laid out like the dataset of its dedicated reader."""
+        index_fields = [
+            pa.field(settings.ROBOLOG_ID_COLUMN_NAME, pa.string(), nullable=False),
+            pa.field(settings.TIMESTAMP_SECONDS_COLUMN_NAME, pa.float64(), nullable=False),
+        ]
+
+        match scan:
+            case TopicScan(topics=topics, ffill=ffill, fields=fields, filter=filter_):
+                self._raise_if_missing_topics(topics)
+                if not topics:
+                    raise ValueError("No topics specified for reading messages.")
+                converters = self._converters(topics)
+                if fields:
+                    converters = self._project_converters(converters, fields)
+                schema = pa.schema(
+                    [
+                        *index_fields,
+                        *[pa.field(t, converters[t].pa_struct, nullable=True) for t in topics],
+                    ]
+                )
+                arrow_file = artifacts.topic_arrow_file(
+                    self.path,
+                    topics,
+                    start_seconds,
+                    end_seconds,
+                    ffill,
+                    peek=False,
+                    fields=fields,
+                    filter=filter_,
+                )
+                return _TopicOutput(
+                    self,
+                    topics,
+                    arrow_file,
+                    schema,
+                    converters,
+                    ffill,
+                    predicate.MessageFilter(filter_) if filter_ else None,
+                )
+
+            case TypeScan(
+                type_name=type_name, exclude_topics=exclude_topics, fields=fields, filter=filter_
+            ):
+                self._raise_if_missing_type(type_name)
+                topics = [
+                    topic
+                    for topic, type_name_ in self.type_names.items()
+                    if type_name_ == type_name and topic not in exclude_topics
+                ]
+                if not topics:
+                    raise ValueError(f"No topics found for type: {type_name}")
+                converter = factory.make_converter(self.path, type_name)
+                if fields:
+                    converter = converter.project(fields)
+                schema = pa.schema(
+                    [
+                        *index_fields,
+                        pa.field(settings.TOPIC_COLUMN_NAME, pa.string(), nullable=False),
+                        pa.field(settings.MESSAGE_COLUMN_NAME, converter.pa_struct, nullable=False),
+                    ]
+                )
+                arrow_file = artifacts.type_arrow_file(
+                    self.path, type_name, start_seconds, end_seconds, fields, filter_
+                )
+                return _TypeOutput(
+                    self,
+                    topics,
+                    arrow_file,
+                    schema,
+                    {settings.MESSAGE_COLUMN_NAME: converter},
+                    predicate.MessageFilter(filter_) if filter_ else None,
+                )
+
+            case FrequencyScan(topics=topics):
+                self._raise_if_missing_topics(topics)
+                if not topics:
+                    raise ValueError("No topics specified for reading messages.")
+                arrow_file = artifacts.frequency_arrow_file(
+                    self.path, topics, start_seconds, end_seconds
+                )
+                return _FrequencyOutput(self, topics, arrow_file)
+
+            case _:
+                raise ValueError(f"Unsupported scan: {scan}")
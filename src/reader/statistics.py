@@ -0,0 +1,129 @@
+"""Statistics of numeric fields of a topic, computed from its cached messages."""
+
+import logging
+from collections.abc import Iterator
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+
+from settings import settings
+from src import artifacts, cache, profiling
+from src.reader.topic import TopicMessageReader
+
+logger = logging.getLogger(__name__)
+logger.setLevel(settings.LOG_LEVEL)
+
+# Maximum size of fixed-size lists whose elements get statistics of their own, e.g., "xyz[2]".
+# Elements of larger or variable-size lists are pooled, e.g., "ranges[*]"
+MAX_INDEXED_LIST_SIZE = 16
+
+# Quantiles of every field, approximated with t-digest
+QUANTILES = (0.01, 0.25, 0.5, 0.75, 0.99)
+
+SCHEMA = pa.schema(
+    [
+        pa.field("field", pa.string(), nullable=False),
+        pa.field("type", pa.string(), nullable=False),
+        pa.field("count", pa.int64(), nullable=False),
+        pa.field("null_count", pa.int64(), nullable=False),
+        pa.field("nan_count", pa.int64(), nullable=False),
+        pa.field("min", pa.float64()),
+        pa.field("max", pa.float64()),
+        pa.field("mean", pa.float64()),
+        pa.field("std", pa.float64()),
+        *[pa.field(f"p{round(q * 100):02d}", pa.float64()) for q in QUANTILES],
+    ]
+)
+
+
+def numeric_leaves(name: str, values: pa.ChunkedArray) -> Iterator[tuple[str, pa.ChunkedArray]]:
+    """Iterate over numeric leaves of a column, named by their path like "topic.field[2]"."""
+    match values.type:
+        case pa.StructType():
+            for field in values.type:
+                yield from numeric_leaves(
+                    f"{name}.{field.name}", pc.struct_field(values, field.name)
+                )
+        case pa.FixedSizeListType() if values.type.list_size <= MAX_INDEXED_LIST_SIZE:
+            for i in range(values.type.list_size):
+                yield from numeric_leaves(f"{name}[{i}]", pc.list_element(values, i))
+        case pa.ListType() | pa.LargeListType() | pa.FixedSizeListType():
+            yield from numeric_leaves(f"{name}[*]", pc.list_flatten(values))
+        case t if pa.types.is_integer(t) or pa.types.is_floating(t):
+            yield name, values
+
+
+def describe(name: str, values: pa.ChunkedArray) -> dict:
+    """Return statistics of numeric values, ignoring nulls and NaNs, as a row of `SCHEMA`."""
+    null_count, nan_count = values.null_count, 0
+    if pa.types.is_floating(values.type):
+        nan_count = pc.sum(pc.is_nan(values)).as_py() or 0
+        values = values.filter(pc.invert(pc.is_nan(values)))
+    min_max = pc.min_max(values)
+    quantiles = pc.tdigest(values, q=list(QUANTILES)).to_pylist()
+    return {
+        "field": name,
+        "type": str(values.type),
+        "count": pc.count(values).as_py(),
+        "null_count": null_count,
+        "nan_count": nan_count,
+        "min": min_max["min"].as_py(),
+        "max": min_max["max"].as_py(),
+        "mean": pc.mean(values).as_py(),
+        "std": pc.stddev(values).as_py(),
+        **{
+            f"p{round(q * 100):02d}": quantile
+            for q, quantile in zip(QUANTILES, quantiles or [None] * len(QUANTILES), strict=True)
+        },
+    }
+
+
+def read(
+    reader: TopicMessageReader,
+    topic: str,
+    start_seconds: float | None = None,
+    end_seconds: float | None = None,
+) -> ds.Dataset:
+    """Return statistics of every numeric field of a topic over a time range.
+
+    Struct fields are flattened into leaves named like "topic.field.subfield", and lists into
+    "topic.field[i]" per element or "topic.field[*]" for all elements. Each row holds the count,
+    null and NaN counts, min, max, mean, standard deviation, and approximate quantiles of a leaf.
+    Statistics are cached next to the topic messages they were computed from.
+
+    Args:
+        reader (TopicMessageReader): Reader of the robolog.
+        topic (str): Topic to compute statistics of.
+        start_seconds (float | None, optional): When to start reading messages.
+        end_seconds (float | None, optional): When to stop reading messages.
+
+    Returns:
+        ds.Dataset: A PyArrow dataset with one row per numeric field.
+
+    """
+    arrow_file = artifacts.statistics_arrow_file(
+        reader.path,
+        topic,
+        start_seconds or reader.start_seconds,
+        end_seconds or reader.end_seconds,
+    )
+    with cache.single_flight(arrow_file):
+        if arrow_file.exists() and reader._use_cache:
+            logger.debug("Return from cache %s", arrow_file)
+            return profiling.record_read(ds.dataset(arrow_file, format="arrow"), cache_hit=True)
+
+        messages = reader.read([topic], start_seconds, end_seconds).to_table(columns=[topic])
+        table = pa.Table.from_pylist(
+            [describe(name, values) for name, values in numeric_leaves(topic, messages[topic])],
+            schema=SCHEMA,
+        )
+        with (
+            cache.write_atomically(arrow_file) as temporary_file,
+            pa.OSFile(str(temporary_file), "wb") as sink,
+            pa.RecordBatchFileWriter(sink, schema=SCHEMA) as writer,
+        ):
+            writer.write_table(table)
+
+        logger.debug("Created dataset and cached to %s", arrow_file)
+        return profiling.record_read(ds.dataset(arrow_file, format="arrow"), cache_hit=False)
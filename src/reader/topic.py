@@ -8,7 +8,7 @@ import pyarrow as pa
 import pyarrow.dataset as ds
 
 from settings import settings
-from src import artifacts
+from src import artifacts, cache, predicate, profiling
 from src.convert.converter import MessageConverter
 from src.reader.reader import Reader
 
@@ -27,6 +27,8 @@ class TopicMessageReader(Reader):
         ffill: bool = False,
         converters: dict[str, MessageConverter] | None = None,
         peek: bool = False,
+        fields: list[str] | None = None,
+        filter: str | None = None,  # noqa: A002
     ) -> ds.Dataset:
         """Return messages for the specified topics and time range.
 
@@ -39,6 +41,12 @@ class TopicMessageReader(Reader):
                 names to their corresponding message converters. If provided, they will take
                 precedence over the default converters.
             peek (bool, optional): If True, only return the first record batch.
+            fields (list[str] | None, optional): Dotted paths of fields to read, starting with
+                their topic, e.g., "/odom.pose.pose.position". Topics without paths are read in
+                full. If None, all fields are read.
+            filter (str | None, optional): SQL expression that messages must satisfy, over the
+                columns of the dataset, e.g., `"/battery".percentage < 0.2`. It is evaluated on
+                each record batch before it is cached, so only projected fields can be used.
 
         Returns:
             ds.Dataset: A PyArrow dataset containing the topic messages.
@@ -64,32 +72,39 @@ class TopicMessageReader(Reader):
             end_seconds or self.end_seconds,
             ffill,
             peek,
+            fields,
+            filter,
         )
-        if arrow_file.exists() and self._use_cache:
-            logger.debug("Return from cache %s", arrow_file)
-            return ds.dataset(arrow_file, format="arrow")
-        arrow_file.unlink(missing_ok=True)
-        arrow_file.parent.mkdir(parents=True, exist_ok=True)
-
-        converters = {**self._converters(topics), **(converters or {})}
-
-        schema = pa.schema(
-            [
-                pa.field(settings.ROBOLOG_ID_COLUMN_NAME, pa.string(), nullable=False),
-                pa.field(settings.TIMESTAMP_SECONDS_COLUMN_NAME, pa.float64(), nullable=False),
-            ]
-        )
-        for topic in topics:
-            schema = schema.append(pa.field(topic, converters[topic].pa_struct, nullable=True))
+        with cache.single_flight(arrow_file):
+            if arrow_file.exists() and self._use_cache:  # possibly created by a concurrent read
+                logger.debug("Return from cache %s", arrow_file)
+                return profiling.record_read(ds.dataset(arrow_file, format="arrow"), cache_hit=True)
+
+            converters = {**self._converters(topics), **(converters or {})}
+            if fields:
+                converters = self._project_converters(converters, fields)
+
+            schema = pa.schema(
+                [
+                    pa.field(settings.ROBOLOG_ID_COLUMN_NAME, pa.string(), nullable=False),
+                    pa.field(settings.TIMESTAMP_SECONDS_COLUMN_NAME, pa.float64(), nullable=False),
+                ]
+            )
+            for topic in topics:
+                schema = schema.append(pa.field(topic, converters[topic].pa_struct, nullable=True))
+
+            record_batches = self._iter_record_batches(
+                topics, start_seconds, end_seconds, ffill, schema, converters
+            )
+            if filter:
+                record_batches = predicate.MessageFilter(filter).apply_all(record_batches)
 
-        try:
             with (
-                pa.OSFile(str(arrow_file), "wb") as sink,
+                cache.write_atomically(arrow_file) as temporary_file,
+                pa.OSFile(str(temporary_file), "wb") as sink,
                 pa.RecordBatchFileWriter(sink, schema=schema) as writer,
             ):
-                for record_batch in self._iter_record_batches(
-                    topics, start_seconds, end_seconds, ffill, schema, converters
-                ):
+                for record_batch in record_batches:
                     writer.write_batch(record_batch)
                     logger.debug(
                         "Appended record batch of size %d with %d rows",
@@ -101,11 +116,22 @@ class TopicMessageReader(Reader):
                         break
 
             logger.debug("Created dataset and cached to %s", arrow_file)
-            return ds.dataset(arrow_file, format="arrow")
+            return profiling.record_read(ds.dataset(arrow_file, format="arrow"), cache_hit=False)
 
-        except Exception as e:
-            arrow_file.unlink(missing_ok=True)
-            raise e
+    def _to_record_batch(
+        self,
+        batch: dict[str, list],
+        schema: pa.Schema,
+        converters: dict[str, MessageConverter],
+    ) -> pa.RecordBatch:
+        """Convert columns of raw messages into a record batch, one topic at a time."""
+        arrays = []
+        for field in schema:
+            if field.name in converters:
+                arrays.append(converters[field.name].to_arrow(batch[field.name]))
+            else:
+                arrays.append(pa.array(batch[field.name], type=field.type))
+        return pa.RecordBatch.from_arrays(arrays, schema=schema)
 
     def _iter_record_batches(  # noqa: PLR0913
         self,
@@ -116,5 +142,10 @@ class TopicMessageReader(Reader):
         schema: pa.Schema,
         converters: dict[str, MessageConverter],
     ) -> Iterator[pa.RecordBatch]:
-        """Iterate over record batches for the specified topics and time range."""
+        """Iterate over record batches for the specified topics and time range.
+
+        Implementations collect raw messages per topic column and hand them to
+        `_to_record_batch`, so that each converter builds its Arrow column in one go.
+
+        """
         raise NotImplementedError()
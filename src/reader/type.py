@@ -8,7 +8,7 @@ import pyarrow as pa
 import pyarrow.dataset as ds
 
 from settings import settings
-from src import artifacts
+from src import artifacts, cache, predicate, profiling
 from src.convert import factory
 from src.convert.converter import MessageConverter
 from src.reader.reader import Reader
@@ -20,13 +20,15 @@ logger.setLevel(settings.LOG_LEVEL)
 class TypeMessageReader(Reader):
     """Base class for reading messages of a specific message type."""
 
-    def read(
+    def read(  # noqa: PLR0913
         self,
         type_name: str,
         start_seconds: float | None = None,
         end_seconds: float | None = None,
         converter: MessageConverter | None = None,
         exclude_topics: list[str] | None = None,
+        fields: list[str] | None = None,
+        filter: str | None = None,  # noqa: A002
     ) -> ds.Dataset:
         """Return messages of a specific message type and time range.
 
@@ -38,6 +40,11 @@ class TypeMessageReader(Reader):
                 If provided, it will take precedence over the default converter for the type.
             exclude_topics (list[str] | None, optional): A list of topics to exclude from the
                 dataset. If None, no topics will be excluded.
+            fields (list[str] | None, optional): Dotted paths of message fields to read, e.g.,
+                "pose.position". If None, all fields are read.
+            filter (str | None, optional): SQL expression that messages must satisfy, over the
+                columns of the dataset, e.g., `message.percentage < 0.2`. It is evaluated on each
+                record batch before it is cached, so only projected fields can be used.
 
         Returns:
             ds.Dataset: A PyArrow dataset containing messages of the specified type.
@@ -65,32 +72,39 @@ class TypeMessageReader(Reader):
             type_name,
             start_seconds or self.start_seconds,
             end_seconds or self.end_seconds,
+            fields,
+            filter,
         )
-        if arrow_file.exists() and self._use_cache:
-            logger.debug("Return from cache %s", arrow_file)
-            return ds.dataset(arrow_file, format="arrow")
-        arrow_file.unlink(missing_ok=True)
-        arrow_file.parent.mkdir(parents=True, exist_ok=True)
-
-        converter = converter or factory.make_converter(self.path, type_name)
-
-        schema = pa.schema(
-            [
-                pa.field(settings.ROBOLOG_ID_COLUMN_NAME, pa.string(), nullable=False),
-                pa.field(settings.TIMESTAMP_SECONDS_COLUMN_NAME, pa.float64(), nullable=False),
-                pa.field(settings.TOPIC_COLUMN_NAME, pa.string(), nullable=False),
-                pa.field(settings.MESSAGE_COLUMN_NAME, converter.pa_struct, nullable=False),
-            ]
-        )
+        with cache.single_flight(arrow_file):
+            if arrow_file.exists() and self._use_cache:  # possibly created by a concurrent read
+                logger.debug("Return from cache %s", arrow_file)
+                return profiling.record_read(ds.dataset(arrow_file, format="arrow"), cache_hit=True)
+
+            converter = converter or factory.make_converter(self.path, type_name)
+            if fields:
+                converter = converter.project(fields)
+
+            schema = pa.schema(
+                [
+                    pa.field(settings.ROBOLOG_ID_COLUMN_NAME, pa.string(), nullable=False),
+                    pa.field(settings.TIMESTAMP_SECONDS_COLUMN_NAME, pa.float64(), nullable=False),
+                    pa.field(settings.TOPIC_COLUMN_NAME, pa.string(), nullable=False),
+                    pa.field(settings.MESSAGE_COLUMN_NAME, converter.pa_struct, nullable=False),
+                ]
+            )
+
+            record_batches = self._iter_record_batches(
+                topics, start_seconds, end_seconds, schema, converter
+            )
+            if filter:
+                record_batches = predicate.MessageFilter(filter).apply_all(record_batches)
 
-        try:
             with (
-                pa.OSFile(str(arrow_file), "wb") as sink,
+                cache.write_atomically(arrow_file) as temporary_file,
+                pa.OSFile(str(temporary_file), "wb") as sink,
                 pa.RecordBatchFileWriter(sink, schema=schema) as writer,
             ):
-                for record_batch in self._iter_record_batches(
-                    topics, start_seconds, end_seconds, schema, converter
-                ):
+                for record_batch in record_batches:
                     writer.write_batch(record_batch)
                     logger.debug(
                         "Appended record batch of size %d with %d rows",
@@ -99,11 +113,19 @@ class TypeMessageReader(Reader):
                     )
 
             logger.debug("Created dataset and cached to %s", arrow_file)
-            return ds.dataset(arrow_file, format="arrow")
-
-        except Exception as e:
-            arrow_file.unlink(missing_ok=True)
-            raise e
+            return profiling.record_read(ds.dataset(arrow_file, format="arrow"), cache_hit=False)
+
+    def _to_record_batch(
+        self, batch: dict[str, list], schema: pa.Schema, converter: MessageConverter
+    ) -> pa.RecordBatch:
+        """Convert a column of raw messages into a record batch."""
+        arrays = []
+        for field in schema:
+            if field.name == settings.MESSAGE_COLUMN_NAME:
+                arrays.append(converter.to_arrow(batch[field.name]))
+            else:
+                arrays.append(pa.array(batch[field.name], type=field.type))
+        return pa.RecordBatch.from_arrays(arrays, schema=schema)
 
     def _iter_record_batches(
         self,
@@ -113,5 +135,10 @@ class TypeMessageReader(Reader):
         schema: pa.Schema,
         converter: MessageConverter,
     ) -> Iterator[pa.RecordBatch]:
-        """Iterate over record batches for the specified topics and time range."""
+        """Iterate over record batches for the specified topics and time range.
+
+        Implementations collect raw messages in the message column and hand them to
+        `_to_record_batch`, so that the converter builds the Arrow column in one go.
+
+        """
         raise NotImplementedError()
@@ -1,7 +1,9 @@
 """Utility functions with respect to robologs."""
 
 import functools
+import glob
 import hashlib
+import os
 import pathlib
 import uuid
 from enum import Enum
@@ -61,6 +63,74 @@ def detect_robolog_type(robolog_path: str | pathlib.Path) -> RobologType:  # noq
     raise UnsupportedRobologTypeError(robolog_path)
 
 
+# File extensions of robologs, used to find them in directories
+ROBOLOG_FILE_SUFFIXES = (".bag", ".db3", ".mcap", ".ulg")
+
+
+def _find_robologs_in_directory(directory: pathlib.Path) -> list[pathlib.Path]:
+    """Find robologs in a directory recursively, treating ROS2 bag directories as robologs."""
+    robologs = []
+    for root, dirnames, filenames in os.walk(directory):
+        if "metadata.yaml" in filenames:  # ROS2 bag directory
+            robologs.append(pathlib.Path(root))
+            dirnames.clear()
+            continue
+        robologs += [
+            pathlib.Path(root) / filename
+            for filename in filenames
+            if filename.endswith(ROBOLOG_FILE_SUFFIXES)
+        ]
+    return robologs
+
+
+def find_robologs(specs: list[str | pathlib.Path]) -> list[pathlib.Path]:
+    """Return absolute paths of robologs matching paths, directories, globs, or manifest files.
+
+    Args:
+        specs (list[str | pathlib.Path]): Each is one of
+            - a robolog, i.e., a file or a ROS2 bag directory,
+            - a directory, which is searched recursively for robologs,
+            - a manifest file, which lists one spec per line, relative to the manifest, or
+            - a glob pattern, e.g., "logs/**/*.bag".
+
+    Returns:
+        list[pathlib.Path]: Sorted absolute paths of robologs, without duplicates.
+
+    """
+    robologs = set()
+    for spec in specs:
+        path = pathlib.Path(spec).expanduser()
+
+        if path.is_dir():
+            if (path / "metadata.yaml").exists():
+                robologs.add(path.absolute())
+            else:
+                robologs.update(p.absolute() for p in _find_robologs_in_directory(path))
+
+        elif path.is_file() and path.suffix not in ROBOLOG_FILE_SUFFIXES:  # manifest file
+            lines = [line.strip() for line in path.read_text().splitlines()]
+            robologs.update(
+                find_robologs(
+                    [path.parent / line for line in lines if line and not line.startswith("#")]
+                )
+            )
+
+        elif path.is_file():
+            robologs.add(path.absolute())
+
+        else:
+            matches = [pathlib.Path(match) for match in glob.glob(str(path), recursive=True)]
+            if not matches:
+                raise FileNotFoundError(spec)
+            robologs.update(
+                find_robologs(
+                    [m for m in matches if m.is_dir() or m.suffix in ROBOLOG_FILE_SUFFIXES]
+                )
+            )
+
+    return sorted(robologs)
+
+
 def _md5_first_64mb(file: str | pathlib.Path) -> str:
     """Calculate the MD5 hash of a file based on the first 64 MB of its content."""
     hash_func = hashlib.new("md5")  # noqa: S324
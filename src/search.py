@@ -0,0 +1,166 @@
+"""Full-text search over logging messages of robologs, backed by SQLite FTS5."""
+
+import contextlib
+import logging
+import pathlib
+import sqlite3
+import time
+from collections.abc import Iterator
+from typing import Any
+
+from settings import settings
+from src import robolog
+from src.reader import factory
+
+logger = logging.getLogger(__name__)
+logger.setLevel(settings.LOG_LEVEL)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS robologs (
+    robolog_id TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    message_count INTEGER NOT NULL,
+    indexed_at REAL NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS logs USING fts5(
+    message,
+    name,
+    level UNINDEXED,
+    robolog_id UNINDEXED,
+    timestamp_seconds UNINDEXED
+);
+"""
+
+
+@contextlib.contextmanager
+def _connect() -> Iterator[sqlite3.Connection]:
+    """Open the search index, creating it if needed. Transactions are managed explicitly."""
+    path = pathlib.Path(settings.LOG_SEARCH_INDEX_FILE)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(path, timeout=60, isolation_level=None)
+    try:
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.executescript(SCHEMA)
+        yield connection
+    finally:
+        connection.close()
+
+
+def _is_indexed(connection: sqlite3.Connection, robolog_id: str) -> bool:
+    query = "SELECT 1 FROM robologs WHERE robolog_id = ?"
+    return connection.execute(query, (robolog_id,)).fetchone() is not None
+
+
+def index_robolog(robolog_path: str | pathlib.Path) -> tuple[str, int]:
+    """Add logging messages of a robolog to the search index.
+
+    Robologs are identified by their content, so a robolog that is already indexed is skipped.
+
+    Returns:
+        tuple[str, int]: Robolog ID, which takes hashing the robolog to compute, and number of
+            logging messages that were added.
+
+    """
+    robolog_id = robolog.generate_id(robolog_path)
+    with _connect() as connection:
+        if _is_indexed(connection, robolog_id):
+            return robolog_id, 0
+
+        dataset = factory.make_logging_message_reader(robolog_path).read()
+        has_name = "name" in dataset.schema.names
+        columns = ["message", "level", settings.TIMESTAMP_SECONDS_COLUMN_NAME]
+        columns += ["name"] if has_name else []
+
+        connection.execute("BEGIN IMMEDIATE")  # lock out concurrent indexers of the same robolog
+        try:
+            if _is_indexed(connection, robolog_id):
+                connection.execute("ROLLBACK")
+                return robolog_id, 0
+
+            message_count = 0
+            for batch in dataset.to_batches(columns=columns):
+                data = batch.to_pydict()
+                names = data["name"] if has_name else [None] * batch.num_rows
+                connection.executemany(
+                    "INSERT INTO logs (message, name, level, robolog_id, timestamp_seconds) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    zip(
+                        data["message"],
+                        names,
+                        data["level"],
+                        [robolog_id] * batch.num_rows,
+                        data[settings.TIMESTAMP_SECONDS_COLUMN_NAME],
+                        strict=True,
+                    ),
+                )
+                message_count += batch.num_rows
+
+            connection.execute(
+                "INSERT INTO robologs (robolog_id, path, message_count, indexed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (
+                    robolog_id,
+                    str(pathlib.Path(robolog_path).absolute()),
+                    message_count,
+                    time.time(),
+                ),
+            )
+            connection.execute("COMMIT")
+
+        except Exception as e:
+            connection.execute("ROLLBACK")
+            raise e
+
+    logger.debug("Indexed %d logging messages of %s", message_count, robolog_path)
+    return robolog_id, message_count
+
+
+def search_logs(
+    query: str,
+    robolog_paths: list[str | pathlib.Path] | None = None,
+    limit: int = 100,
+) -> list[dict[str, Any]]:
+    """Return logging messages that match a full-text query, best matches first.
+
+    Args:
+        query (str): An SQLite FTS5 query over message text and logger names. Wrap words in
+            double quotes to match a phrase, e.g., '"EKF2 IMU stopped"'.
+        robolog_paths (list[str | pathlib.Path] | None, optional): Robologs to search. They are
+            indexed first if needed. If None, all previously indexed robologs are searched.
+        limit (int, optional): Maximum number of hits to return.
+
+    Returns:
+        list[dict[str, Any]]: Hits with robolog ID and path, timestamp in milliseconds, level,
+            logger name, and message.
+
+    """
+    sql = (
+        "SELECT robologs.robolog_id, robologs.path, logs.timestamp_seconds, logs.level, "
+        "logs.name, logs.message "
+        "FROM logs JOIN robologs ON logs.robolog_id = robologs.robolog_id "
+        "WHERE logs MATCH ?"
+    )
+    parameters: list[Any] = [query]
+
+    if robolog_paths is not None:
+        robolog_ids = [index_robolog(robolog_path)[0] for robolog_path in robolog_paths]
+        sql += f" AND logs.robolog_id IN ({', '.join('?' * len(robolog_ids))})"
+        parameters += robolog_ids
+
+    sql += " ORDER BY rank LIMIT ?"
+    parameters.append(limit)
+
+    with _connect() as connection:
+        rows = connection.execute(sql, parameters).fetchall()
+
+    return [
+        {
+            settings.ROBOLOG_ID_COLUMN_NAME: robolog_id,
+            "path": path,
+            "timestamp_milliseconds": round(timestamp_seconds * 1e3),
+            "level": level,
+            "name": name,
+            "message": message,
+        }
+        for robolog_id, path, timestamp_seconds, level, name, message in rows
+    ]
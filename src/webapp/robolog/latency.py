@@ -5,7 +5,7 @@ import plotly.graph_objects as go
 import streamlit as st
 
 from settings import settings
-from src.reader import factory
+from src.reader import factory, pool
 
 if not st.session_state.get("robolog_path") or not st.session_state.get("topic_reader"):
     st.info("Select a robolog file in the summary page first.")
@@ -33,7 +33,9 @@ if not topic:
 
 
 with st.spinner(f"Calculating latency for {topic}...", show_time=True):
-    freq_reader = factory.make_topic_frequency_reader(st.session_state.robolog_path)
+    freq_reader = pool.readers.get(
+        factory.make_topic_frequency_reader, st.session_state.robolog_path
+    )
     df_latency = freq_reader.read([topic]).to_table().to_pandas()
 
 
@@ -1,9 +1,11 @@
 """Content of the Robolog/logging page."""
 
-import pandas as pd
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
 import streamlit as st
 
 from settings import settings
+from src.reader import factory, pool
 
 robolog_path = st.session_state.get("robolog_path", None)
 topic_reader = st.session_state.get("topic_reader", None)
@@ -22,17 +24,17 @@ with st.container():
 
 
 with st.spinner("Retrieving logging messages...", show_time=True):
-    messages = [message.to_dict() for message in topic_reader.logging_messages]
+    dataset = pool.readers.get(factory.make_logging_message_reader, robolog_path).read()
+    summary = dataset.to_table(columns=["level", settings.TIMESTAMP_SECONDS_COLUMN_NAME])
 
 
 with st.container():
-    if not messages:
+    if not summary.num_rows:
         st.warning("No logging messages found in this robolog.")
         st.stop()
 
-    df_logging = pd.DataFrame(messages).drop(settings.ROBOLOG_ID_COLUMN_NAME, axis=1)
-
-    all_log_levels = df_logging["level"].unique().tolist()
+    all_log_levels = pc.unique(summary["level"]).to_pylist()
+    timestamp_range = pc.min_max(summary[settings.TIMESTAMP_SECONDS_COLUMN_NAME])
 
     col1, col2 = st.columns(2)
     log_levels = col1.multiselect(
@@ -42,19 +44,19 @@ with st.container():
     )
     min_timestamp_seconds, max_timestamp_seconds = col2.slider(
         "Select time range (seconds)",
-        min_value=float(df_logging["timestamp_seconds"].min()),
-        max_value=float(df_logging["timestamp_seconds"].max()),
-        value=(
-            float(df_logging["timestamp_seconds"].min()),
-            float(df_logging["timestamp_seconds"].max()),
-        ),
+        min_value=timestamp_range["min"].as_py(),
+        max_value=timestamp_range["max"].as_py(),
+        value=(timestamp_range["min"].as_py(), timestamp_range["max"].as_py()),
         step=1.0,
     )
 
-    df_logging = df_logging[df_logging["level"].isin(log_levels)]
-    df_logging = df_logging[
-        (df_logging["timestamp_seconds"] >= min_timestamp_seconds)
-        & (df_logging["timestamp_seconds"] <= max_timestamp_seconds)
-    ]
+    df_logging = dataset.to_table(
+        columns=[name for name in dataset.schema.names if name != settings.ROBOLOG_ID_COLUMN_NAME],
+        filter=(
+            ds.field("level").isin(log_levels)
+            & (ds.field(settings.TIMESTAMP_SECONDS_COLUMN_NAME) >= min_timestamp_seconds)
+            & (ds.field(settings.TIMESTAMP_SECONDS_COLUMN_NAME) <= max_timestamp_seconds)
+        ),
+    ).to_pandas()
 
     st.dataframe(df_logging, hide_index=True, height=800)
@@ -7,7 +7,7 @@ import humanize
 import pandas as pd
 import streamlit as st
 
-from src.reader import factory
+from src.reader import factory, pool, statistics
 from src.webapp.utils import stream
 
 input_container = st.empty()
@@ -26,8 +26,8 @@ if not st.session_state.get("robolog_path"):
 
 if not st.session_state.get("topic_reader"):
     with st.spinner("Creating robolog reader...", show_time=True):
-        st.session_state.topic_reader = factory.make_topic_message_reader(
-            st.session_state.robolog_path
+        st.session_state.topic_reader = pool.readers.get(
+            factory.make_topic_message_reader, st.session_state.robolog_path
         )
         input_container.empty()
 
@@ -68,5 +68,14 @@ with st.container():
     st.markdown("<br>", unsafe_allow_html=True)
 
 
+with st.container():
+    topic = st.selectbox("Select a topic to profile", st.session_state.topic_reader.topics)
+    if topic:
+        with st.spinner(f"Profiling numeric fields of {topic}...", show_time=True):
+            dataset = statistics.read(st.session_state.topic_reader, topic)
+            st.dataframe(dataset.to_table().to_pandas(), hide_index=True)
+    st.markdown("<br>", unsafe_allow_html=True)
+
+
 with st.expander("View all metadata", expanded=False):
     st.json(st.session_state.topic_reader.metadata)
@@ -0,0 +1,22 @@
+import pyarrow as pa
+import pytest
+
+from src.command.run.catalog import Catalog
+
+
+@pytest.mark.parametrize(("max_arrow_bytes", "source_type"), [(1 << 20, pa.Table), (0, str)])
+def test_should_materialize_views_in_memory_or_as_tables(
+    max_arrow_bytes: int, source_type: type
+) -> None:
+    # GIVEN
+    with Catalog() as catalog:
+        catalog.register("raw", pa.table({"value": [1, 2, 3]}))
+        catalog.register("doubled", "SELECT value * 2 AS value FROM raw")
+
+        # WHEN
+        catalog.materialize("doubled", max_arrow_bytes)
+        catalog.register("raw", pa.table({"value": [100]}))
+
+        # THEN
+        assert isinstance(catalog.source("doubled"), source_type)
+        assert catalog.view("doubled").order("value").fetchall() == [(2,), (4,), (6,)]
@@ -0,0 +1,126 @@
+import threading
+from collections.abc import Callable
+
+import pyarrow as pa
+import pytest
+
+from src.command.run import dag, operator
+from src.command.run.catalog import Catalog
+from src.command.run.operator.base import Operator
+
+
+def make_nodes(barrier: threading.Barrier, results: dict[str, list]) -> list[dag.Node]:
+    def extract(name: str, values: list[int]) -> tuple[Operator, Callable[[Catalog], None]]:
+        op = operator.ExtractTopic(name=name, topics=[], ffill=False)
+
+        def task(catalog: Catalog) -> None:
+            barrier.wait(timeout=5)  # both extracts must run at the same time
+            catalog.register(name, pa.table({"value": values}))
+
+        return op, task
+
+    def save(name: str) -> tuple[Operator, Callable[[Catalog], None]]:
+        op = operator.SaveDataFrame.from_name(name)
+
+        def task(catalog: Catalog) -> None:
+            results[name] = catalog.view(name).fetchall()
+
+        return op, task
+
+    sql = "SELECT SUM(value) AS value FROM (FROM left_side UNION ALL FROM right_side)"
+    total = operator.TransformDataFrame.from_dict({"name": "total", "sql": sql})
+    doubled = operator.TransformDataFrame.from_dict(
+        {"name": "doubled", "sql": "SELECT value * 2 AS value FROM total"}
+    )
+    return dag.compile_graph(
+        [
+            save("doubled"),
+            (doubled, doubled.register),
+            (total, total.register),
+            extract("left_side", [1, 2]),
+            extract("right_side", [3]),
+        ]
+    )
+
+
+def test_should_compile_dependencies_from_sql_and_saved_views() -> None:
+    # GIVEN
+    barrier = threading.Barrier(2)
+
+    # WHEN
+    nodes = make_nodes(barrier, {})
+
+    # THEN
+    assert [node.dependencies for node in nodes] == [
+        frozenset({1}),
+        frozenset({2}),
+        frozenset({3, 4}),
+        frozenset(),
+        frozenset(),
+    ]
+
+
+def test_should_run_independent_operators_in_parallel_on_separate_cursors() -> None:
+    # GIVEN
+    results = {}
+    nodes = make_nodes(threading.Barrier(2), results)
+    finished = []
+
+    # WHEN
+    with Catalog() as catalog:
+        dag.execute(nodes, catalog, max_workers=2, on_finish=lambda op: finished.append(op.name))
+
+    # THEN
+    assert results == {"doubled": [(12,)]}
+    assert finished[2:] == ["total", "doubled", "doubled"]
+
+
+def test_should_raise_on_cyclic_dependencies() -> None:
+    # GIVEN
+    ping = operator.TransformDataFrame.from_dict({"name": "ping", "sql": "SELECT * FROM pong"})
+    pong = operator.TransformDataFrame.from_dict({"name": "pong", "sql": "SELECT * FROM ping"})
+
+    # WHEN / THEN
+    with pytest.raises(dag.CyclicDependencyError, match="ping, pong"):
+        dag.compile_graph([(ping, ping.register), (pong, pong.register)])
+
+
+def test_should_raise_on_saving_undefined_dataframe() -> None:
+    # GIVEN
+    save = operator.SaveDataFrame.from_name("missing")
+
+    # WHEN / THEN
+    with pytest.raises(dag.UndefinedDataFrameError, match="missing"):
+        dag.compile_graph([(save, save.write)])
+
+
+def test_should_find_views_referenced_by_asof_joins() -> None:
+    # GIVEN
+    sql = "SELECT * FROM imu ASOF JOIN gps ON imu.timestamp_seconds >= gps.timestamp_seconds"
+
+    # WHEN
+    op = operator.TransformDataFrame.from_dict({"name": "fused", "sql": sql})
+
+    # THEN
+    assert op.inputs({"imu", "gps", "battery"}) == {"imu", "gps"}
+
+
+def test_should_prune_operators_that_no_save_uses() -> None:
+    # GIVEN
+    def noop(catalog: Catalog) -> None:
+        pass
+
+    used = operator.ExtractTopic(name="used", topics=["/imu"], ffill=False)
+    unused = operator.ExtractTopic(name="unused", topics=["/camera"], ffill=False)
+    derived = operator.TransformDataFrame.from_dict({"name": "derived", "sql": "FROM used"})
+    dangling = operator.TransformDataFrame.from_dict({"name": "dangling", "sql": "FROM unused"})
+    save = operator.SaveDataFrame.from_name("derived")
+
+    # WHEN
+    kept, pruned = dag.prune(
+        [(used, noop), (unused, noop), (derived, noop), (dangling, noop), (save, noop)]
+    )
+
+    # THEN
+    assert [op.name for op, _ in kept] == ["used", "derived", "derived"]
+    assert [op.name for op in pruned] == ["unused", "dangling"]
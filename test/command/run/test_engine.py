@@ -0,0 +1,49 @@
+import pathlib
+
+import duckdb
+import pyarrow as pa
+
+from src.command.run.engine import Engine
+
+
+def test_should_configure_duckdb_connection(tmp_path: pathlib.Path) -> None:
+    # GIVEN
+    engine = Engine.from_dict(
+        {"memory_limit": "1GB", "threads": 2, "temp_directory": str(tmp_path / "spill")}
+    )
+
+    # WHEN
+    with engine.connect() as connection:
+        settings = dict(
+            connection.sql(
+                "SELECT name, value FROM duckdb_settings() WHERE name IN "
+                "('threads', 'temp_directory', 'preserve_insertion_order')"
+            ).fetchall()
+        )
+
+    # THEN
+    assert settings == {
+        "threads": "2",
+        "temp_directory": str(tmp_path / "spill"),
+        "preserve_insertion_order": "false",
+    }
+
+
+def test_should_keep_materialized_views_in_database_file(tmp_path: pathlib.Path) -> None:
+    # GIVEN
+    database = tmp_path / "pipeline.duckdb"
+    engine = Engine.from_dict({"database": str(database), "temp_directory": str(tmp_path)})
+
+    with engine.open_catalog() as catalog:
+        catalog.register("raw", pa.table({"value": [1, 2]}))
+        catalog.register("doubled", "SELECT value * 2 AS value FROM raw")
+        catalog.register("tripled", "SELECT value * 3 AS value FROM raw")
+
+        # WHEN
+        catalog.materialize("doubled", max_arrow_bytes=0)
+
+    # THEN
+    with duckdb.connect(str(database)) as connection:
+        assert connection.sql("FROM doubled ORDER BY value").fetchall() == [(2,), (4,)]
+        view_names = connection.sql("SELECT view_name FROM duckdb_views()").fetchall()
+        assert ("tripled",) not in view_names
@@ -0,0 +1,58 @@
+import os
+import pathlib
+
+import pyarrow as pa
+
+from src.command.run import fleet
+from src.command.run.catalog import Catalog
+
+
+def write_arrow_file(path: pathlib.Path, table: pa.Table) -> str:
+    with pa.OSFile(str(path), "wb") as sink, pa.RecordBatchFileWriter(sink, table.schema) as writer:
+        writer.write_table(table)
+    return str(path)
+
+
+def test_should_union_views_of_all_robologs(tmp_path: pathlib.Path) -> None:
+    # GIVEN
+    extracted = [
+        fleet.ExtractedRobolog(
+            robolog_path=tmp_path / "a.bag",
+            robolog_id="a",
+            start_seconds=0.0,
+            sources={"imu": [write_arrow_file(tmp_path / "a.arrow", pa.table({"x": [1, 2]}))]},
+        ),
+        fleet.ExtractedRobolog(
+            robolog_path=tmp_path / "b.bag",
+            robolog_id="b",
+            start_seconds=0.0,
+            sources={"imu": pa.table({"x": [3], "y": [4.0]})},
+        ),
+    ]
+
+    # WHEN
+    with Catalog() as catalog:
+        fleet.register_union("imu", extracted, catalog)
+        rows = catalog.view("imu").order("x").fetchall()
+
+    # THEN
+    assert rows == [("a", 1, None), ("a", 2, None), ("b", 3, 4.0)]
+
+
+def exit_on_crash_robolog(robolog_path: pathlib.Path) -> fleet.RobologResult:
+    if robolog_path.name == "crash.bag":
+        os._exit(1)
+    return fleet.RobologResult(robolog_path=robolog_path)
+
+
+def test_map_should_fail_only_robologs_that_crash_their_process() -> None:
+    # GIVEN
+    robolog_paths = [pathlib.Path(f"{name}.bag") for name in ["a", "crash", "b", "c"]]
+
+    # WHEN
+    results = fleet._map(exit_on_crash_robolog, robolog_paths, jobs=2)
+
+    # THEN
+    failed = {result.robolog_path.name for result in results if not result.succeeded}
+    assert failed == {"crash.bag"}
+    assert len(results) == len(robolog_paths)
@@ -0,0 +1,95 @@
+import pathlib
+from collections.abc import Callable
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+import pytest
+
+from settings import settings
+from src.command.run import dag, ledger, operator
+from src.command.run.catalog import Catalog
+from src.command.run.operator.base import Operator
+
+
+@pytest.fixture(autouse=True)
+def ledger_file(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "RUN_LEDGER_FILE", str(tmp_path / "ledger.sqlite3"))
+
+
+def make_pipeline(
+    tmp_path: pathlib.Path, sql: str, calls: list[str]
+) -> list[tuple[Operator, Callable[[Catalog], object]]]:
+    extract = operator.ExtractTopic(name="raw", topics=["/imu"], ffill=False)
+    transform = operator.TransformDataFrame.from_dict({"name": "scaled", "sql": sql})
+    save = operator.SaveDataFrame.from_name("scaled")
+
+    def extract_task(catalog: Catalog) -> None:
+        calls.append("raw")
+        arrow_file = tmp_path / "raw.arrow"
+        with pa.OSFile(str(arrow_file), "wb") as sink:
+            table = pa.table({"value": [1, 2, 3]})
+            with pa.RecordBatchFileWriter(sink, table.schema) as writer:
+                writer.write_table(table)
+        catalog.register("raw", ds.dataset(arrow_file, format="arrow"))
+
+    def transform_task(catalog: Catalog) -> None:
+        calls.append("transform")
+        transform.register(catalog)
+
+    def save_task(catalog: Catalog) -> list[pathlib.Path]:
+        calls.append("save")
+        file_path = tmp_path / "scaled.parquet"
+        catalog.view("scaled").write_parquet(str(file_path))
+        return [file_path]
+
+    return [(extract, extract_task), (transform, transform_task), (save, save_task)]
+
+
+def run(pipeline: list[tuple[Operator, Callable[[Catalog], object]]]) -> list[str]:
+    operators_and_tasks, skipped = ledger.plan_incremental(dag.compile_graph(pipeline), ["seed"])
+    with Catalog() as catalog:
+        dag.execute(dag.compile_graph(operators_and_tasks), catalog, max_workers=2)
+    return [op.name for op in skipped]
+
+
+def test_should_skip_operators_that_are_up_to_date(tmp_path: pathlib.Path) -> None:
+    # GIVEN
+    calls = []
+    run(make_pipeline(tmp_path, "SELECT value * 2 AS value FROM raw", calls))
+
+    # WHEN
+    skipped = run(make_pipeline(tmp_path, "SELECT value * 2 AS value FROM raw", calls))
+
+    # THEN
+    assert calls == ["raw", "transform", "save"]
+    assert skipped == ["raw", "scaled", "scaled"]
+
+
+def test_should_reuse_extracted_data_when_transform_changes(tmp_path: pathlib.Path) -> None:
+    # GIVEN
+    calls = []
+    run(make_pipeline(tmp_path, "SELECT value * 2 AS value FROM raw", calls))
+    calls.clear()
+
+    # WHEN
+    skipped = run(make_pipeline(tmp_path, "SELECT value * 3 AS value FROM raw", calls))
+
+    # THEN
+    assert calls == ["transform", "save"]
+    assert skipped == []
+    assert pq.read_table(tmp_path / "scaled.parquet")["value"].to_pylist() == [3, 6, 9]
+
+
+def test_should_run_again_when_outputs_are_gone(tmp_path: pathlib.Path) -> None:
+    # GIVEN
+    calls = []
+    run(make_pipeline(tmp_path, "SELECT value * 2 AS value FROM raw", calls))
+    (tmp_path / "scaled.parquet").unlink()
+    calls.clear()
+
+    # WHEN
+    run(make_pipeline(tmp_path, "SELECT value * 2 AS value FROM raw", calls))
+
+    # THEN
+    assert calls == ["transform", "save"]
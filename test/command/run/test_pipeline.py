@@ -0,0 +1,29 @@
+from src.command.run import operator, pipeline
+from src.command.run.catalog import Catalog
+
+
+def test_should_materialize_views_read_more_than_once() -> None:
+    # GIVEN
+    def noop(catalog: Catalog) -> None:
+        pass
+
+    extract = operator.ExtractTopic(name="raw", topics=["/imu"], ffill=False)
+    shared = operator.TransformDataFrame.from_dict({"name": "shared", "sql": "FROM raw"})
+    single = operator.TransformDataFrame.from_dict({"name": "single", "sql": "FROM shared"})
+    forced = operator.TransformDataFrame.from_dict(
+        {"name": "forced", "sql": "FROM shared", "materialize": True}
+    )
+    save = operator.SaveDataFrame.from_name("single")
+
+    # WHEN
+    operators_and_tasks = pipeline.materialize_shared_views(
+        [(extract, noop), (shared, noop), (single, noop), (forced, noop), (save, noop)]
+    )
+
+    # THEN
+    materialized = [
+        op.name
+        for op, task in operators_and_tasks
+        if getattr(task, "keywords", {}).get("materialize")
+    ]
+    assert materialized == ["shared", "forced"]
@@ -0,0 +1,57 @@
+import pyarrow as pa
+import pyarrow.compute as pc
+import pytest
+
+from src.command.run import operator
+from src.command.run.catalog import Catalog
+
+
+def double(batch: pa.RecordBatch) -> pa.RecordBatch:
+    return pa.RecordBatch.from_arrays([pc.multiply(batch["x"], 2)], names=["doubled"])
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_python_transform_should_apply_function_to_every_batch(processes: int) -> None:
+    # GIVEN
+    transform = operator.TransformDataFrame.from_dict(
+        {
+            "name": "doubled",
+            "input": "raw",
+            "function": f"{__name__}:double",
+            "processes": processes,
+        }
+    )
+
+    # WHEN
+    with Catalog() as catalog:
+        catalog.register("raw", pa.table({"x": range(100_000)}))
+        transform.register(catalog)
+        result = catalog.view("doubled").fetch_arrow_table()
+
+    # THEN
+    assert result.column_names == ["doubled"]
+    assert result["doubled"].to_pylist() == [2 * x for x in range(100_000)]
+
+
+def test_python_transform_should_take_output_schema_from_empty_batch() -> None:
+    # GIVEN
+    transform = operator.TransformDataFrame.from_dict(
+        {"name": "doubled", "input": "raw", "function": f"{__name__}:double"}
+    )
+
+    # WHEN
+    with Catalog() as catalog:
+        catalog.register("raw", pa.table({"x": pa.array([], pa.int64())}))
+        transform.register(catalog)
+        result = catalog.view("doubled").fetch_arrow_table()
+
+    # THEN
+    assert result.column_names == ["doubled"]
+    assert result.num_rows == 0
+
+
+def test_python_transform_should_reject_invalid_function_path() -> None:
+    with pytest.raises(ValueError, match="module:function"):
+        operator.TransformDataFrame.from_dict(
+            {"name": "doubled", "input": "raw", "function": "not a function"}
+        )
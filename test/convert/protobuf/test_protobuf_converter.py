@@ -0,0 +1,147 @@
+import pyarrow as pa
+from google.protobuf import descriptor_pb2, duration_pb2, timestamp_pb2
+from google.protobuf.descriptor_pool import DescriptorPool
+from google.protobuf.message_factory import GetMessageClass
+
+from src.convert.protobuf import MessageConverter
+
+FieldProto = descriptor_pb2.FieldDescriptorProto
+
+
+def _file_descriptor_set() -> bytes:
+    file_descriptor_set = descriptor_pb2.FileDescriptorSet()
+    timestamp_pb2.DESCRIPTOR.CopyToProto(file_descriptor_set.file.add())
+    duration_pb2.DESCRIPTOR.CopyToProto(file_descriptor_set.file.add())
+
+    file = file_descriptor_set.file.add(
+        name="sample.proto",
+        package="sample",
+        syntax="proto3",
+        dependency=["google/protobuf/timestamp.proto", "google/protobuf/duration.proto"],
+    )
+    point = file.message_type.add(name="Point")
+    point.field.add(
+        name="x", number=1, type=FieldProto.TYPE_DOUBLE, label=FieldProto.LABEL_OPTIONAL
+    )
+
+    scene = file.message_type.add(name="Scene")
+    scene.field.add(
+        name="timestamp",
+        number=1,
+        type=FieldProto.TYPE_MESSAGE,
+        type_name=".google.protobuf.Timestamp",
+        label=FieldProto.LABEL_OPTIONAL,
+    )
+    scene.field.add(
+        name="id", number=2, type=FieldProto.TYPE_INT64, label=FieldProto.LABEL_OPTIONAL
+    )
+    scene.field.add(
+        name="data", number=3, type=FieldProto.TYPE_BYTES, label=FieldProto.LABEL_OPTIONAL
+    )
+    scene.field.add(
+        name="points",
+        number=4,
+        type=FieldProto.TYPE_MESSAGE,
+        type_name=".sample.Point",
+        label=FieldProto.LABEL_REPEATED,
+    )
+    scene.field.add(
+        name="origin",
+        number=5,
+        type=FieldProto.TYPE_MESSAGE,
+        type_name=".sample.Point",
+        label=FieldProto.LABEL_OPTIONAL,
+    )
+    scene.field.add(
+        name="elapsed",
+        number=6,
+        type=FieldProto.TYPE_MESSAGE,
+        type_name=".google.protobuf.Duration",
+        label=FieldProto.LABEL_OPTIONAL,
+    )
+    return file_descriptor_set.SerializeToString()
+
+
+def _message_class(file_descriptor_set_bytes: bytes) -> type:
+    pool = DescriptorPool()
+    for file in descriptor_pb2.FileDescriptorSet.FromString(file_descriptor_set_bytes).file:
+        pool.Add(file)
+    return GetMessageClass(pool.FindMessageTypeByName("sample.Scene"))
+
+
+def test_to_arrow_should_read_fields_natively() -> None:
+    # GIVEN
+    schema = _file_descriptor_set()
+    converter = MessageConverter("sample.Scene", schema)
+    scene = _message_class(schema)
+    message = scene(id=2**40, data=b"\x00\xff", points=[{"x": 1.0}, {"x": 2.0}])
+    message.timestamp.FromSeconds(1)
+
+    # WHEN
+    array = converter.to_arrow([message, None, scene()])
+
+    # THEN
+    assert array.type.equals(converter.pa_struct)
+    rows = array.to_pylist()
+    assert rows[0]["id"] == 2**40
+    assert rows[0]["data"] == b"\x00\xff"
+    assert rows[0]["points"] == [{"x": 1.0}, {"x": 2.0}]
+    assert rows[0]["origin"] is None
+    assert rows[1] is None
+    assert rows[2]["points"] == []
+
+
+def test_should_cast_well_known_types_to_temporal_types() -> None:
+    # GIVEN
+    schema = _file_descriptor_set()
+    converter = MessageConverter("sample.Scene", schema)
+    message = _message_class(schema)()
+    message.timestamp.FromNanoseconds(1_500_000_000)
+    message.elapsed.FromMilliseconds(250)
+
+    # WHEN
+    array = converter.to_arrow([message])
+    row = converter.to_dict(message)
+
+    # THEN
+    assert converter.pa_struct.field("timestamp").type == pa.timestamp("ns", tz="UTC")
+    assert converter.pa_struct.field("elapsed").type == pa.duration("ns")
+    assert array.field("timestamp").cast(pa.int64()).to_pylist() == [1_500_000_000]
+    assert array.field("elapsed").cast(pa.int64()).to_pylist() == [250_000_000]
+    assert row["timestamp"] == 1_500_000_000
+    assert row["elapsed"] == 250_000_000
+
+
+def test_to_dict_should_round_trip_through_pa_struct() -> None:
+    # GIVEN
+    schema = _file_descriptor_set()
+    converter = MessageConverter("sample.Scene", schema)
+    scene = _message_class(schema)
+    message = scene(id=2**40, data=b"\x00\xff", points=[{"x": 1.0}], origin={"x": 2.0})
+    message.timestamp.FromNanoseconds(1_500_000_001)
+    message.elapsed.FromNanoseconds(-250_000_001)
+    messages = [message, scene()]
+
+    # WHEN
+    array = pa.array([converter.to_dict(m) for m in messages], type=converter.pa_struct)
+
+    # THEN
+    assert array.equals(converter.to_arrow(messages))
+    assert array.field("timestamp").cast(pa.int64()).to_pylist() == [1_500_000_001, None]
+    assert array.field("elapsed").cast(pa.int64()).to_pylist() == [-250_000_001, None]
+
+
+def test_project_should_read_only_projected_fields() -> None:
+    # GIVEN
+    schema = _file_descriptor_set()
+    converter = MessageConverter("sample.Scene", schema).project(["origin.x", "id"])
+    scene = _message_class(schema)
+    message = scene(id=7, data=b"\x00", origin={"x": 1.5})
+
+    # WHEN
+    array = converter.to_arrow([message, None])
+
+    # THEN
+    assert array.type.equals(converter.pa_struct)
+    assert array.to_pylist() == [{"id": 7, "origin": {"x": 1.5}}, None]
+    assert converter.to_dict(message) == {"id": 7, "origin": {"x": 1.5}}
@@ -0,0 +1,52 @@
+import textwrap
+from types import SimpleNamespace
+
+import pyarrow as pa
+
+from src.convert.ros1msg import MessageConverter
+
+FULL_TEXT = """
+Header header
+time[] stamps
+uint8[] data
+================================================================================
+MSG: std_msgs/Header
+uint32 seq
+time stamp
+string frame_id
+"""
+
+
+def _time(secs: int, nsecs: int) -> SimpleNamespace:
+    return SimpleNamespace(secs=secs, nsecs=nsecs)
+
+
+def _message(seq: int) -> SimpleNamespace:
+    return SimpleNamespace(
+        header=SimpleNamespace(seq=seq, stamp=_time(seq, 10), frame_id="map"),
+        stamps=[_time(1, 2), _time(3, 4)],
+        data=b"\x01\x02",
+    )
+
+
+def test_to_arrow_should_match_to_dict() -> None:
+    # GIVEN
+    converter = MessageConverter("pkg/Stamped", textwrap.dedent(FULL_TEXT))
+    messages = [_message(0), None, _message(2)]
+
+    # WHEN
+    array = converter.to_arrow(messages)
+
+    # THEN
+    assert array.type.equals(converter.pa_struct)
+    assert array.equals(
+        pa.array(
+            [converter.to_dict(m) if m is not None else None for m in messages],
+            type=converter.pa_struct,
+        )
+    )
+    assert array.to_pylist()[2] == {
+        "header": {"seq": 2, "stamp": {"secs": 2, "nsec": 10}, "frame_id": "map"},
+        "stamps": [{"secs": 1, "nsec": 2}, {"secs": 3, "nsec": 4}],
+        "data": [1, 2],
+    }
@@ -0,0 +1,102 @@
+import textwrap
+from types import SimpleNamespace
+
+import pyarrow as pa
+import pytest
+
+from src.convert.converter import FieldsNotFoundError, field_tree
+from src.convert.ros2msg import MessageConverter
+
+FULL_TEXT = """
+uint8 LEVEL=3
+string name
+float64[3] position
+Point[] points
+================================================================================
+MSG: pkg/Point
+int32 x
+int32 y
+"""
+
+
+def _message(name: str, points: list[tuple[int, int]]) -> SimpleNamespace:
+    return SimpleNamespace(
+        name=name,
+        position=[1.0, 2.0, 3.0],
+        points=[SimpleNamespace(x=x, y=y) for x, y in points],
+    )
+
+
+def test_to_arrow_should_match_to_dict() -> None:
+    # GIVEN
+    converter = MessageConverter("pkg/Shape", textwrap.dedent(FULL_TEXT))
+    messages = [_message("a", [(1, 2), (3, 4)]), None, _message("b", [])]
+
+    # WHEN
+    array = converter.to_arrow(messages)
+
+    # THEN
+    assert array.type.equals(converter.pa_struct)
+    assert array.equals(
+        pa.array(
+            [converter.to_dict(m) if m is not None else None for m in messages],
+            type=converter.pa_struct,
+        )
+    )
+    assert array.to_pylist()[0] == {
+        "LEVEL": 3,
+        "name": "a",
+        "position": [1.0, 2.0, 3.0],
+        "points": [{"x": 1, "y": 2}, {"x": 3, "y": 4}],
+    }
+    assert array.to_pylist()[1] is None
+
+
+def test_to_arrow_should_handle_empty_batches() -> None:
+    # GIVEN
+    converter = MessageConverter("pkg/Shape", textwrap.dedent(FULL_TEXT))
+
+    # WHEN
+    array = converter.to_arrow([])
+
+    # THEN
+    assert len(array) == 0
+    assert array.type.equals(converter.pa_struct)
+
+
+def test_field_tree_should_keep_shortest_paths() -> None:
+    # GIVEN
+    fields = ["pose.position.x", "header", "pose.position", "pose.orientation.w"]
+
+    # WHEN
+    tree = field_tree(fields)
+
+    # THEN
+    assert tree == {"header": None, "pose": {"position": None, "orientation": {"w": None}}}
+
+
+def test_project_should_convert_only_projected_fields() -> None:
+    # GIVEN
+    converter = MessageConverter("pkg/Shape", textwrap.dedent(FULL_TEXT))
+    messages = [_message("a", [(1, 2), (3, 4)]), None]
+
+    # WHEN
+    projected = converter.project(["points.y", "name"])
+    array = projected.to_arrow(messages)
+
+    # THEN
+    assert array.type.equals(projected.pa_struct)
+    assert [field.name for field in projected.pa_struct] == ["name", "points"]
+    assert array.to_pylist() == [{"name": "a", "points": [{"y": 2}, {"y": 4}]}, None]
+    assert len(converter.pa_struct) == 4
+
+
+def test_project_should_raise_if_fields_are_not_found() -> None:
+    # GIVEN
+    converter = MessageConverter("pkg/Shape", textwrap.dedent(FULL_TEXT))
+
+    # WHEN / THEN
+    with pytest.raises(FieldsNotFoundError, match=r"points\.z"):
+        converter.project(["points.z"])
+    with pytest.raises(FieldsNotFoundError, match=r"name\.length"):
+        converter.project(["name.length"])
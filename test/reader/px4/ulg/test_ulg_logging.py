@@ -0,0 +1,59 @@
+import pathlib
+import struct
+
+import pytest
+
+from settings import settings
+from src.reader.px4.ulg.logging import LoggingMessageReader
+
+# (log level as an ASCII digit, timestamp in microseconds, message)
+LOGGED_MESSAGES = [
+    (b"6", 1_000_000, "Takeoff detected"),
+    (b"4", 2_000_000, "Low battery"),
+    (b"3", 3_000_000, "EKF2 IMU stopped"),
+]
+
+
+@pytest.fixture
+def robolog_path(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> pathlib.Path:
+    monkeypatch.setattr(settings, "CACHE_DIRECTORY", str(tmp_path / "cache"))
+    robolog_path = tmp_path / "flight.ulg"
+    with robolog_path.open("wb") as f:
+        f.write(b"ULog\x01\x12\x35\x01" + struct.pack("<Q", 0))
+        for level, timestamp, message in LOGGED_MESSAGES:
+            payload = struct.pack("<BQ", ord(level), timestamp) + message.encode()
+            f.write(struct.pack("<HB", len(payload), ord("L")) + payload)
+    return robolog_path
+
+
+def test_can_read_logging_messages(robolog_path: pathlib.Path) -> None:
+    # GIVEN
+    reader = LoggingMessageReader(robolog_path)
+
+    # WHEN
+    table = reader.read().to_table()
+
+    # THEN
+    assert table.column_names == [
+        settings.ROBOLOG_ID_COLUMN_NAME,
+        settings.TIMESTAMP_SECONDS_COLUMN_NAME,
+        "level",
+        "message",
+        "numeric_level",
+    ]
+    assert table["level"].to_pylist() == ["INFO", "WARNING", "ERROR"]
+    assert table["numeric_level"].to_pylist() == [6, 4, 3]
+
+
+def test_can_filter_logging_messages(robolog_path: pathlib.Path) -> None:
+    # GIVEN
+    reader = LoggingMessageReader(robolog_path)
+
+    # WHEN / THEN
+    assert reader.read(min_level="WARN").to_table()["message"].to_pylist() == [
+        "Low battery",
+        "EKF2 IMU stopped",
+    ]
+    assert reader.read(min_level="ERROR").to_table().num_rows == 1
+    assert reader.read(name_filter="ekf2").to_table().num_rows == 0
+    assert reader.read(start_seconds=1.5, end_seconds=2.5).to_table().num_rows == 1
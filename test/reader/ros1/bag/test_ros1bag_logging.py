@@ -0,0 +1,43 @@
+import pathlib
+
+from settings import settings
+from src.reader.ros1.bag.logging import LoggingMessageReader
+
+
+def test_can_read_logging_messages() -> None:
+    # GIVEN
+    robolog_path = pathlib.Path(__file__).parent / "data" / "turtle.bag"
+    reader = LoggingMessageReader(robolog_path)
+
+    # WHEN
+    table = reader.read().to_table()
+
+    # THEN
+    assert table.num_rows == 1
+    assert table.column_names == [
+        settings.ROBOLOG_ID_COLUMN_NAME,
+        settings.TIMESTAMP_SECONDS_COLUMN_NAME,
+        "level",
+        "message",
+        "numeric_level",
+        "topic",
+        "name",
+        "file",
+        "function",
+        "line",
+    ]
+    assert table["level"].to_pylist() == ["INFO"]
+    assert table["message"].to_pylist() == ["Subscribing to /turtle1/cmd_vel"]
+
+
+def test_can_filter_logging_messages() -> None:
+    # GIVEN
+    robolog_path = pathlib.Path(__file__).parent / "data" / "turtle.bag"
+    reader = LoggingMessageReader(robolog_path)
+
+    # WHEN / THEN
+    assert reader.read(min_level="INFO").to_table().num_rows == 1
+    assert reader.read(min_level="WARN").to_table().num_rows == 0
+    assert reader.read(name_filter="/record").to_table().num_rows == 1
+    assert reader.read(name_filter="/turtlesim").to_table().num_rows == 0
+    assert reader.read(start_seconds=1660676080.0).to_table().num_rows == 0
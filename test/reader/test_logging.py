@@ -0,0 +1,120 @@
+import pathlib
+from collections.abc import Iterator
+from typing import Any
+
+import pyarrow as pa
+import pytest
+
+from settings import settings
+from src.command.run import operator
+from src.command.run.catalog import Catalog
+from src.reader import factory, logging
+
+RECORDS = [
+    (1.0, "DEBUG", "/planner", "Planning route"),
+    (2.0, "INFO", "/controller/pid", "Controller started"),
+    (3.0, "WARN", "/controller/pid", "Saturated output"),
+    (4.0, "ERROR", "/planner", "No route found"),
+    (5.0, "CUSTOM", "/driver", "Vendor-specific message"),
+]
+
+
+class FakeLoggingMessageReader(logging.LoggingMessageReader):
+    @property
+    def start_seconds(self) -> float:
+        return 0.0
+
+    @property
+    def end_seconds(self) -> float:
+        return 6.0
+
+    def _logging_fields(self) -> list[pa.Field]:
+        return [pa.field("name", pa.string(), nullable=True)]
+
+    def _iter_logging_records(
+        self, start_seconds: float | None, end_seconds: float | None
+    ) -> Iterator[dict[str, Any]]:
+        for timestamp, level, name, message in RECORDS:
+            if start_seconds is not None and timestamp < start_seconds:
+                continue
+            if end_seconds is not None and timestamp > end_seconds:
+                continue
+            yield {
+                settings.ROBOLOG_ID_COLUMN_NAME: self.robolog_id,
+                settings.TIMESTAMP_SECONDS_COLUMN_NAME: timestamp,
+                "level": level,
+                "message": message,
+                "name": name,
+            }
+
+
+@pytest.fixture
+def reader(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> FakeLoggingMessageReader:
+    monkeypatch.setattr(settings, "CACHE_DIRECTORY", str(tmp_path / "cache"))
+    robolog_path = tmp_path / "robolog.bag"
+    robolog_path.write_bytes(b"robolog")
+    return FakeLoggingMessageReader(robolog_path, use_cache=True)
+
+
+def test_should_keep_messages_at_least_as_severe_as_min_level(
+    reader: FakeLoggingMessageReader,
+) -> None:
+    # WHEN
+    table = reader.read(min_level="warn").to_table()
+
+    # THEN
+    assert table["level"].to_pylist() == ["WARN", "ERROR", "CUSTOM"]
+
+
+def test_should_keep_messages_whose_logger_name_contains_name_filter(
+    reader: FakeLoggingMessageReader,
+) -> None:
+    # WHEN
+    table = reader.read(min_level="INFO", name_filter="/controller").to_table()
+
+    # THEN
+    assert table["message"].to_pylist() == ["Controller started", "Saturated output"]
+
+
+def test_should_keep_messages_in_time_range(reader: FakeLoggingMessageReader) -> None:
+    # WHEN
+    table = reader.read(start_seconds=2.0, end_seconds=4.0, name_filter="/planner").to_table()
+
+    # THEN
+    assert table[settings.TIMESTAMP_SECONDS_COLUMN_NAME].to_pylist() == [4.0]
+
+
+def test_should_cache_filtered_messages_separately(reader: FakeLoggingMessageReader) -> None:
+    # WHEN
+    counts = [
+        reader.read(min_level="ERROR").count_rows(),
+        reader.read().count_rows(),
+        reader.read(min_level="ERROR").count_rows(),
+    ]
+
+    # THEN
+    assert counts == [2, 5, 2]
+
+
+def test_should_raise_if_min_level_is_unknown(reader: FakeLoggingMessageReader) -> None:
+    # WHEN / THEN
+    with pytest.raises(logging.UnknownLoggingLevelError):
+        reader.read(min_level="CUSTOM")
+
+
+def test_extract_logging_should_register_filtered_messages(
+    reader: FakeLoggingMessageReader, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # GIVEN
+    monkeypatch.setattr(factory, "make_logging_message_reader", lambda _: reader)
+    extract = operator.ExtractLogging.from_dict(
+        {"name": "warnings", "min_level": "WARN", "name_filter": "/controller"}
+    )
+
+    # WHEN
+    with Catalog() as catalog:
+        extract.register(catalog, reader.path, start_seconds=None, end_seconds=None)
+        rows = catalog.view("warnings").project("level, message").fetchall()
+
+    # THEN
+    assert rows == [("WARN", "Saturated output")]
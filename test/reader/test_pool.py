@@ -0,0 +1,113 @@
+import os
+import pathlib
+import threading
+
+import pytest
+
+from src.reader.pool import ReaderPool
+
+
+class FakeReader:
+    instances = 0
+
+    def __init__(self, robolog_path: pathlib.Path, use_cache: bool | None) -> None:
+        FakeReader.instances += 1
+        self.path = robolog_path
+
+
+def make_fake_reader(robolog_path: pathlib.Path, use_cache: bool | None) -> FakeReader:
+    return FakeReader(robolog_path, use_cache)
+
+
+@pytest.fixture
+def robologs(tmp_path: pathlib.Path) -> list[pathlib.Path]:
+    FakeReader.instances = 0
+    paths = [tmp_path / f"flight_{i}.ulg" for i in range(3)]
+    for path in paths:
+        path.write_bytes(b"0" * 10)
+    return paths
+
+
+def test_pool_should_reuse_reader_until_robolog_changes(robologs: list[pathlib.Path]) -> None:
+    # GIVEN
+    pool = ReaderPool(max_count=4, max_bytes=100)
+
+    # WHEN
+    first = pool.get(make_fake_reader, robologs[0])
+    second = pool.get(make_fake_reader, robologs[0])
+    os.utime(robologs[0], ns=(0, 0))
+    third = pool.get(make_fake_reader, robologs[0])
+
+    # THEN
+    assert first is second
+    assert third is not first
+
+
+def test_pool_should_evict_least_recently_used_readers(robologs: list[pathlib.Path]) -> None:
+    # GIVEN
+    pool = ReaderPool(max_count=2, max_bytes=100)
+
+    # WHEN
+    first = pool.get(make_fake_reader, robologs[0])
+    pool.get(make_fake_reader, robologs[1])
+    pool.get(make_fake_reader, robologs[0])
+    pool.get(make_fake_reader, robologs[2])  # evicts robologs[1]
+
+    # THEN
+    assert pool.get(make_fake_reader, robologs[0]) is first
+    assert FakeReader.instances == 3
+    pool.get(make_fake_reader, robologs[1])
+    assert FakeReader.instances == 4
+
+
+def test_pool_should_evict_readers_beyond_total_size(robologs: list[pathlib.Path]) -> None:
+    # GIVEN
+    pool = ReaderPool(max_count=4, max_bytes=15)
+
+    # WHEN
+    pool.get(make_fake_reader, robologs[0])
+    pool.get(make_fake_reader, robologs[1])
+    pool.get(make_fake_reader, robologs[0])
+
+    # THEN
+    assert FakeReader.instances == 3
+
+
+def test_pool_should_make_reader_once_for_concurrent_requests(
+    robologs: list[pathlib.Path],
+) -> None:
+    # GIVEN
+    pool = ReaderPool(max_count=4, max_bytes=100)
+
+    # WHEN
+    threads = [
+        threading.Thread(target=pool.get, args=(make_fake_reader, robologs[0])) for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # THEN
+    assert FakeReader.instances == 1
+
+
+def test_pool_should_only_check_metadata_of_robolog_directories(tmp_path: pathlib.Path) -> None:
+    # GIVEN
+    FakeReader.instances = 0
+    robolog_path = tmp_path / "flight"
+    robolog_path.mkdir()
+    (robolog_path / "metadata.yaml").write_text("rosbag2_bagfile_information: {}")
+    (robolog_path / "flight_0.mcap").write_bytes(b"0" * 20)
+    pool = ReaderPool(max_count=4, max_bytes=100)
+
+    # WHEN
+    first = pool.get(make_fake_reader, robolog_path)
+    os.utime(robolog_path / "flight_0.mcap", ns=(0, 0))
+    second = pool.get(make_fake_reader, robolog_path)
+    os.utime(robolog_path / "metadata.yaml", ns=(0, 0))
+    third = pool.get(make_fake_reader, robolog_path)
+
+    # THEN
+    assert first is second
+    assert third is not first
@@ -0,0 +1,157 @@
+import pathlib
+from collections.abc import Iterator
+from typing import Any
+
+import pyarrow as pa
+import pytest
+
+from settings import settings
+from src.convert.converter import FieldsNotFoundError, MessageConverter
+from src.reader import scan
+
+MESSAGES = [
+    (1.0, "/imu", 10),
+    (1.5, "/gps", 20),
+    (2.0, "/imu", 11),
+    (2.5, "/battery", 30),
+]
+
+
+class FakeConverter(MessageConverter):
+    @property
+    def pa_struct(self) -> pa.StructType:
+        return pa.struct([pa.field("value", pa.int64())])
+
+    def to_dict(self, message: int) -> dict[str, Any]:
+        return {"value": message}
+
+
+class FakeScanReader(scan.ScanReader):
+    def __init__(self, robolog_path: pathlib.Path) -> None:
+        super().__init__(robolog_path, use_cache=True)
+        self.passes = []
+
+    @property
+    def start_seconds(self) -> float:
+        return 0.0
+
+    @property
+    def end_seconds(self) -> float:
+        return 3.0
+
+    @property
+    def type_names(self) -> dict[str, str]:
+        return {"/imu": "Sensor", "/gps": "Sensor", "/battery": "Battery"}
+
+    @property
+    def topics(self) -> list[str]:
+        return list(self.type_names)
+
+    def _converters(self, topics: list[str]) -> dict[str, MessageConverter]:
+        return {topic: FakeConverter() for topic in topics}
+
+    def _iter_messages(
+        self,
+        topics: list[str],
+        start_seconds: float | None,
+        end_seconds: float | None,
+        timestamps_only: bool,
+    ) -> Iterator[tuple[float, str, int | None]]:
+        self.passes.append((topics, timestamps_only))
+        for timestamp, topic, message in MESSAGES:
+            if topic in topics:
+                yield timestamp, topic, None if timestamps_only else message
+
+
+@pytest.fixture
+def reader(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> FakeScanReader:
+    monkeypatch.setattr(settings, "CACHE_DIRECTORY", str(tmp_path / "cache"))
+    monkeypatch.setattr(scan.factory, "make_converter", lambda *_: FakeConverter())
+    robolog_path = tmp_path / "robolog.bag"
+    robolog_path.write_bytes(b"robolog")
+    return FakeScanReader(robolog_path)
+
+
+def test_should_read_all_scans_in_a_single_pass(reader: FakeScanReader) -> None:
+    # WHEN
+    topic, type_, frequency = reader.read(
+        [
+            scan.TopicScan(topics=["/imu", "/gps"], ffill=True),
+            scan.TypeScan(type_name="Sensor", exclude_topics=["/gps"]),
+            scan.FrequencyScan(topics=["/imu", "/battery"]),
+        ]
+    )
+
+    # THEN
+    assert reader.passes == [(["/battery", "/gps", "/imu"], False)]
+    assert topic.to_table(columns=["/imu", "/gps"]).to_pylist() == [
+        {"/imu": {"value": 10}, "/gps": None},
+        {"/imu": {"value": 10}, "/gps": {"value": 20}},
+        {"/imu": {"value": 11}, "/gps": {"value": 20}},
+    ]
+    assert type_.to_table(columns=["topic", "message"]).to_pylist() == [
+        {"topic": "/imu", "message": {"value": 10}},
+        {"topic": "/imu", "message": {"value": 11}},
+    ]
+    assert frequency.to_table(columns=["/imu", "/battery"]).to_pylist() == [
+        {"/imu": None, "/battery": None},
+        {"/imu": 1.0, "/battery": None},
+        {"/imu": None, "/battery": None},
+    ]
+
+
+def test_should_skip_pass_when_all_scans_are_cached(reader: FakeScanReader) -> None:
+    # GIVEN
+    scans = [scan.TopicScan(topics=["/gps"]), scan.FrequencyScan(topics=["/gps"])]
+    reader.read(scans)
+
+    # WHEN
+    datasets = reader.read(scans)
+
+    # THEN
+    assert len(reader.passes) == 1
+    assert [dataset.count_rows() for dataset in datasets] == [1, 1]
+
+
+def test_should_only_read_timestamps_for_frequency_scans(reader: FakeScanReader) -> None:
+    # WHEN
+    reader.read([scan.FrequencyScan(topics=["/imu"]), scan.FrequencyScan(topics=["/gps"])])
+
+    # THEN
+    assert reader.passes == [(["/gps", "/imu"], True)]
+
+
+def test_should_cache_projected_scans_separately(reader: FakeScanReader) -> None:
+    # WHEN
+    full, projected = reader.read(
+        [
+            scan.TopicScan(topics=["/imu", "/gps"]),
+            scan.TopicScan(topics=["/imu", "/gps"], fields=["/imu.value"]),
+        ]
+    )
+
+    # THEN
+    assert full.files != projected.files
+    assert len(reader.passes) == 1
+
+
+def test_should_raise_if_projected_fields_are_not_found(reader: FakeScanReader) -> None:
+    # WHEN / THEN
+    with pytest.raises(FieldsNotFoundError):
+        reader.read([scan.TopicScan(topics=["/imu"], fields=["/imu.missing"])])
+    with pytest.raises(FieldsNotFoundError):
+        reader.read([scan.TopicScan(topics=["/imu"], fields=["/gps.value"])])
+
+
+def test_should_filter_messages_before_caching(reader: FakeScanReader) -> None:
+    # WHEN
+    full, filtered = reader.read(
+        [
+            scan.TopicScan(topics=["/imu", "/gps"]),
+            scan.TopicScan(topics=["/imu", "/gps"], filter='"/imu".value > 10'),
+        ]
+    )
+
+    # THEN
+    assert full.files != filtered.files
+    assert filtered.to_table().column(settings.TIMESTAMP_SECONDS_COLUMN_NAME).to_pylist() == [2.0]
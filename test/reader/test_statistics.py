@@ -0,0 +1,67 @@
+import pathlib
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pytest
+
+from settings import settings
+from src.reader import statistics
+
+
+class FakeTopicMessageReader:
+    path = pathlib.Path("flight.ulg")
+    start_seconds = 0.0
+    end_seconds = 3.0
+    _use_cache = True
+
+    def __init__(self, table: pa.Table) -> None:
+        self.table = table
+        self.reads = 0
+
+    def read(
+        self, topics: list[str], start_seconds: float | None, end_seconds: float | None
+    ) -> ds.Dataset:
+        self.reads += 1
+        return ds.dataset(self.table)
+
+
+@pytest.fixture
+def reader(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> FakeTopicMessageReader:
+    monkeypatch.setattr(settings, "CACHE_DIRECTORY", str(tmp_path))
+    monkeypatch.setattr("src.robolog.generate_id", lambda path: "flight")
+    imu = pa.StructArray.from_arrays(
+        [
+            pa.array([1.0, float("nan"), 3.0, None]),
+            pa.array([[0, 1], [2, 3], [4, 5], [6, 7]], pa.list_(pa.int32(), 2)),
+            pa.array([[1.0], [2.0, 3.0], [], [4.0]]),
+            pa.array(["a", "b", "c", "d"]),
+        ],
+        ["z", "xy", "ranges", "frame_id"],
+    )
+    return FakeTopicMessageReader(pa.table({"/imu": imu}))
+
+
+def test_statistics_should_describe_every_numeric_leaf(reader: FakeTopicMessageReader) -> None:
+    # WHEN
+    rows = {row["field"]: row for row in statistics.read(reader, "/imu").to_table().to_pylist()}
+
+    # THEN
+    assert list(rows) == ["/imu.z", "/imu.xy[0]", "/imu.xy[1]", "/imu.ranges[*]"]
+    assert rows["/imu.z"]["count"] == 2
+    assert rows["/imu.z"]["null_count"] == 1
+    assert rows["/imu.z"]["nan_count"] == 1
+    assert rows["/imu.z"]["mean"] == 2.0
+    assert rows["/imu.xy[1]"]["min"] == 1
+    assert rows["/imu.xy[1]"]["max"] == 7
+    assert rows["/imu.ranges[*]"]["count"] == 4
+    assert rows["/imu.ranges[*]"]["p50"] == pytest.approx(2.5)
+
+
+def test_statistics_should_be_cached(reader: FakeTopicMessageReader) -> None:
+    # WHEN
+    first = statistics.read(reader, "/imu").to_table()
+    second = statistics.read(reader, "/imu").to_table()
+
+    # THEN
+    assert first.equals(second)
+    assert reader.reads == 1
@@ -0,0 +1,60 @@
+import concurrent.futures
+import multiprocessing
+import pathlib
+import time
+
+import pytest
+
+from src import cache
+
+
+def create_once(artifact: pathlib.Path) -> bool:
+    """Create an artifact unless it exists, and return whether this call created it."""
+    with cache.single_flight(artifact):
+        if artifact.exists():
+            return False
+        time.sleep(0.1)  # let concurrent callers pile up
+        with cache.write_atomically(artifact) as temporary_file:
+            temporary_file.write_text("decoded")
+        return True
+
+
+@pytest.mark.parametrize(
+    "executor_class",
+    [concurrent.futures.ThreadPoolExecutor, concurrent.futures.ProcessPoolExecutor],
+)
+def test_single_flight_should_create_artifact_once(
+    tmp_path: pathlib.Path, executor_class: type[concurrent.futures.Executor]
+) -> None:
+    # GIVEN
+    artifact = tmp_path / "topic.arrow"
+    kwargs = (
+        {"mp_context": multiprocessing.get_context("spawn")}
+        if executor_class is concurrent.futures.ProcessPoolExecutor
+        else {}
+    )
+
+    # WHEN
+    with executor_class(4, **kwargs) as executor:
+        created = list(executor.map(create_once, [artifact] * 8))
+
+    # THEN
+    assert sum(created) == 1
+    assert artifact.read_text() == "decoded"
+
+
+def test_write_atomically_should_leave_artifact_untouched_on_failure(
+    tmp_path: pathlib.Path,
+) -> None:
+    # GIVEN
+    artifact = tmp_path / "topic.arrow"
+    artifact.write_text("cached")
+
+    # WHEN
+    with pytest.raises(RuntimeError), cache.write_atomically(artifact) as temporary_file:
+        temporary_file.write_text("partial")
+        raise RuntimeError()
+
+    # THEN
+    assert artifact.read_text() == "cached"
+    assert list(tmp_path.iterdir()) == [artifact]
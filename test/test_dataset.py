@@ -0,0 +1,170 @@
+import os
+import pathlib
+
+import duckdb
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+import pytest
+
+from src import dataset
+
+
+@pytest.fixture
+def relation() -> duckdb.DuckDBPyRelation:
+    return duckdb.sql(
+        "SELECT * FROM (VALUES (3.0, '/gps', 30), (1.0, '/imu', 10), (2.0, '/imu', 20)) "
+        "AS t(timestamp_seconds, topic, value)"
+    )
+
+
+def test_should_write_sorted_partitions(
+    relation: duckdb.DuckDBPyRelation, tmp_path: pathlib.Path
+) -> None:
+    # WHEN
+    files = dataset.write_parquet_dataset(
+        relation, tmp_path, "snippet", partition_by=["topic"], sort_by=["timestamp_seconds"]
+    )
+
+    # THEN
+    assert [file.relative_to(tmp_path).as_posix() for file in files] == [
+        "topic=%2Fgps/snippet-0.parquet",
+        "topic=%2Fimu/snippet-0.parquet",
+    ]
+    assert pq.read_table(files[1]).column("value").to_pylist() == [10, 20]
+    assert pq.read_metadata(files[1]).row_group(0).column(0).compression == "ZSTD"
+    assert not list(tmp_path.glob(".tmp-*"))
+
+
+def test_should_replace_files_of_previous_write(
+    relation: duckdb.DuckDBPyRelation, tmp_path: pathlib.Path
+) -> None:
+    # GIVEN
+    dataset.write_parquet_dataset(relation, tmp_path, "snippet", row_group_size_bytes=1)
+    other_files = dataset.write_parquet_dataset(relation, tmp_path, "other")
+
+    # WHEN
+    files = dataset.write_parquet_dataset(relation.limit(1), tmp_path, "snippet")
+
+    # THEN
+    assert ds.dataset(files + other_files).count_rows() == 4
+    assert sorted(tmp_path.rglob("*.parquet")) == sorted(files + other_files)
+
+
+def test_should_keep_files_of_previous_write_until_new_files_are_moved_in(
+    relation: duckdb.DuckDBPyRelation, tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # GIVEN
+    previous_files = dataset.write_parquet_dataset(
+        relation, tmp_path, "snippet", row_group_size_bytes=1, file_size_bytes=1
+    )
+    seen = []
+    replace = os.replace
+
+    def record_replace(source: pathlib.Path, destination: pathlib.Path) -> None:
+        seen.append(sorted(tmp_path.glob("*.parquet")))
+        replace(source, destination)
+
+    monkeypatch.setattr(dataset.os, "replace", record_replace)
+
+    # WHEN
+    files = dataset.write_parquet_dataset(relation.limit(1), tmp_path, "snippet")
+
+    # THEN
+    assert seen == [sorted(previous_files)]
+    assert sorted(tmp_path.glob("*.parquet")) == files
+
+
+def test_should_raise_when_partition_column_is_missing(
+    relation: duckdb.DuckDBPyRelation, tmp_path: pathlib.Path
+) -> None:
+    # WHEN / THEN
+    with pytest.raises(ValueError, match="robolog_id"):
+        dataset.write_parquet_dataset(relation, tmp_path, "snippet", partition_by=["robolog_id"])
+
+
+def test_should_compact_small_files_and_convert_other_formats(tmp_path: pathlib.Path) -> None:
+    # GIVEN
+    partition = tmp_path / "datestr=2024-01-01"
+    partition.mkdir()
+    duckdb.sql("SELECT 2.0 AS timestamp_seconds, 20 AS value").write_parquet(
+        str(partition / "snippet-1.parquet")
+    )
+    duckdb.sql("SELECT 1.0 AS timestamp_seconds, 10 AS value").write_parquet(
+        str(partition / "snippet-0.parquet")
+    )
+    (partition / "snippet.csv").write_text("timestamp_seconds,value\n3.0,30\n")
+    duckdb.sql("SELECT 4.0 AS timestamp_seconds, 40 AS value").write_parquet(
+        str(partition / "other-0.parquet")
+    )
+
+    # WHEN
+    compaction = dataset.compact_partition(partition, sort_by=["timestamp_seconds"], convert=True)
+
+    # THEN
+    assert compaction.inputs == [
+        "other-0.parquet",
+        "snippet-0.parquet",
+        "snippet-1.parquet",
+        "snippet.csv",
+    ]
+    assert compaction.basenames == ["other", "snippet"]
+    assert sorted(file.name for file in partition.glob("*.parquet")) == compaction.outputs
+    table = pq.read_table(partition / compaction.outputs[0])
+    assert table.column("value").to_pylist() == [10, 20, 30, 40]
+    assert table.column(dataset.BASENAME_COLUMN_NAME).to_pylist() == [
+        "snippet",
+        "snippet",
+        "snippet",
+        "other",
+    ]
+    assert dataset.is_compacted(partition / "snippet-0.parquet")
+    assert not dataset.is_compacted(partition / "d.parquet")
+
+
+def test_should_replace_compacted_rows_when_saving_a_snippet_again(
+    relation: duckdb.DuckDBPyRelation, tmp_path: pathlib.Path
+) -> None:
+    # GIVEN
+    for i in range(50):
+        dataset.write_parquet_dataset(relation, tmp_path, f"snippet_{i}")
+    compaction = dataset.compact_partition(tmp_path)
+
+    # WHEN
+    files = dataset.write_parquet_dataset(relation.limit(1), tmp_path, "snippet_7")
+
+    # THEN
+    assert len(compaction.inputs) == 50
+    assert sorted(tmp_path.glob("*.parquet")) == sorted(
+        [*files, *(tmp_path / output for output in compaction.outputs)]
+    )
+    assert ds.dataset(tmp_path, format="parquet").count_rows() == 49 * 3 + 1
+    assert dataset.is_compacted(tmp_path / "snippet_0-0.parquet")
+
+
+def test_should_compact_compacted_files_again(
+    relation: duckdb.DuckDBPyRelation, tmp_path: pathlib.Path
+) -> None:
+    # GIVEN
+    for basename in ["a", "b", "c"]:
+        dataset.write_parquet_dataset(relation, tmp_path, basename)
+        dataset.compact_partition(tmp_path)
+
+    # WHEN
+    dataset.write_parquet_dataset(relation.limit(1), tmp_path, "a")
+
+    # THEN
+    assert ds.dataset(tmp_path, format="parquet").count_rows() == 2 * 3 + 1
+    assert dataset.is_compacted(tmp_path / "b-0.parquet")
+
+
+def test_should_not_compact_recently_changed_partitions(tmp_path: pathlib.Path) -> None:
+    # GIVEN
+    for name in ["a", "b"]:
+        duckdb.sql("SELECT 1 AS value").write_parquet(str(tmp_path / f"{name}.parquet"))
+
+    # WHEN
+    compaction = dataset.compact_partition(tmp_path, min_age_seconds=3600)
+
+    # THEN
+    assert compaction is None
+    assert dataset.find_partitions(tmp_path) == [tmp_path]
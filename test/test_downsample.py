@@ -0,0 +1,85 @@
+import numpy as np
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pytest
+
+from settings import settings
+from src import downsample
+
+TOPICS = ["vehicle_acceleration_0", "/imu", "/imu.raw"]
+
+
+class FakeTopicMessageReader:
+    topics = TOPICS
+
+    def __init__(self, table: pa.Table) -> None:
+        self.table = table
+
+    def read(
+        self, topics: list[str], start_seconds: float | None, end_seconds: float | None
+    ) -> ds.Dataset:
+        return ds.dataset(self.table.select([settings.TIMESTAMP_SECONDS_COLUMN_NAME, *topics]))
+
+
+@pytest.fixture
+def reader() -> FakeTopicMessageReader:
+    timestamps = np.arange(10_000) / 1000
+    z = np.sin(timestamps * 2 * np.pi)
+    z[5_000] = 10.0  # a spike that downsampling must keep
+    xyz = pa.array([[0.0, 0.0, value] for value in z], pa.list_(pa.float32()))
+    return FakeTopicMessageReader(
+        pa.table(
+            {
+                settings.TIMESTAMP_SECONDS_COLUMN_NAME: timestamps,
+                "vehicle_acceleration_0": pa.StructArray.from_arrays([xyz], ["xyz"]),
+                "/imu": pa.nulls(len(z), pa.struct([("x", pa.float64())])),
+                "/imu.raw": pa.nulls(len(z), pa.struct([("x", pa.float64())])),
+            }
+        )
+    )
+
+
+@pytest.mark.parametrize(
+    ("field_path", "expected"),
+    [
+        ("vehicle_acceleration_0.xyz[2]", ("vehicle_acceleration_0", ["xyz", 2])),
+        ("/imu.raw.x", ("/imu.raw", ["x"])),
+        ("/imu.x", ("/imu", ["x"])),
+    ],
+)
+def test_split_field_path_should_prefer_longest_topic(
+    field_path: str, expected: tuple[str, list]
+) -> None:
+    assert downsample.split_field_path(field_path, TOPICS) == expected
+
+
+@pytest.mark.parametrize("field_path", ["/gps.x", "/imu.x[", "vehicle_acceleration_0.xyz"])
+def test_downsample_should_reject_invalid_field_paths(
+    reader: FakeTopicMessageReader, field_path: str
+) -> None:
+    with pytest.raises(downsample.InvalidFieldPathError):
+        downsample.downsample(reader, field_path, 100)
+
+
+def test_lttb_should_keep_endpoints_and_spikes(reader: FakeTopicMessageReader) -> None:
+    # WHEN
+    table = downsample.downsample(reader, "vehicle_acceleration_0.xyz[2]", 100, "lttb")
+
+    # THEN
+    timestamps = table[settings.TIMESTAMP_SECONDS_COLUMN_NAME].to_pylist()
+    assert table.num_rows == 100
+    assert timestamps[0] == 0.0
+    assert timestamps[-1] == 9.999
+    assert timestamps == sorted(timestamps)
+    assert max(table["value"].to_pylist()) == 10.0
+
+
+def test_minmax_should_summarize_equal_time_buckets(reader: FakeTopicMessageReader) -> None:
+    # WHEN
+    table = downsample.downsample(reader, "vehicle_acceleration_0.xyz[2]", 10, "minmax")
+
+    # THEN
+    assert table.num_rows == 10
+    assert sum(table["count"].to_pylist()) == 10_000
+    assert table["max"][5].as_py() == 10.0
+    assert table["min"][0].as_py() == pytest.approx(-1.0, abs=1e-3)
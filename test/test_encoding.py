@@ -0,0 +1,96 @@
+import json
+
+import pyarrow as pa
+import pydantic_core
+import pytest
+
+from src.encoding import Encoding
+
+
+def make_table() -> pa.Table:
+    return pa.table(
+        {
+            "robolog_id": ["3f6c"] * 4,
+            "timestamp_seconds": [0.0, 0.1, 0.2, 0.3],
+            "/imu": pa.array(
+                [{"accel": {"z": 9.8}}, {"accel": {"z": 9.7}}, None, {"accel": {"z": 9.9}}]
+            ),
+            "frame_id": ["a", "b", "c", None],
+        }
+    )
+
+
+def test_rows_should_match_to_pylist() -> None:
+    assert Encoding().encode(make_table()) == make_table().to_pylist()
+
+
+def test_columns_should_dictionary_encode_repeated_strings() -> None:
+    # WHEN
+    encoded = Encoding(format="columns").encode(make_table())
+
+    # THEN
+    assert encoded["robolog_id"] == {"dictionary": ["3f6c"], "indices": [0, 0, 0, 0]}
+    assert encoded["timestamp_seconds"] == [0.0, 0.1, 0.2, 0.3]
+    assert encoded["frame_id"] == ["a", "b", "c", None]
+    assert encoded["/imu"][2] is None
+    assert len(json.dumps(encoded)) < len(json.dumps(make_table().to_pylist()))
+
+
+def test_columns_should_flatten_nested_structs_into_dotted_paths() -> None:
+    # WHEN
+    encoded = Encoding(format="columns", flatten=True).encode(make_table())
+
+    # THEN
+    assert "/imu" not in encoded
+    assert encoded["/imu.accel.z"] == [9.8, 9.7, None, 9.9]
+
+
+@pytest.mark.parametrize(
+    ("format", "expected"),
+    [
+        (
+            "rows",
+            [
+                {"/camera": None, "checksum": None},
+                {
+                    "/camera": {"format": "png", "data": "iVA=", "chunks": ["AA==", None]},
+                    "checksum": "Ag==",
+                },
+            ],
+        ),
+        (
+            "columns",
+            {
+                "/camera": [None, {"format": "png", "data": "iVA=", "chunks": ["AA==", None]}],
+                "checksum": {"dictionary": ["Ag=="], "indices": [None, 0]},
+            },
+        ),
+    ],
+)
+def test_should_encode_binary_values_as_base64(format: str, expected: object) -> None:  # noqa: A002
+    # GIVEN
+    table = pa.table(
+        {
+            "/camera": pa.array(
+                [
+                    {"format": "jpeg", "data": b"\xff\xd8", "chunks": []},
+                    None,
+                    {"format": "png", "data": b"\x89P", "chunks": [b"\x00", None]},
+                ],
+                pa.struct(
+                    [
+                        ("format", pa.string()),
+                        ("data", pa.binary()),
+                        ("chunks", pa.list_(pa.large_binary())),
+                    ]
+                ),
+            ),
+            "checksum": pa.array([b"\x01", None, b"\x02"], pa.binary(1)),
+        }
+    ).slice(1)
+
+    # WHEN
+    encoded = Encoding(format=format).encode(table)
+
+    # THEN
+    assert json.loads(pydantic_core.to_json(encoded)) == expected
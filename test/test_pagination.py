@@ -0,0 +1,100 @@
+import pathlib
+
+import pyarrow as pa
+import pytest
+
+from settings import settings
+from src import pagination
+from src.encoding import Encoding
+
+
+@pytest.fixture
+def arrow_file(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> pathlib.Path:
+    monkeypatch.setattr(settings, "CACHE_DIRECTORY", str(tmp_path))
+    path = tmp_path / "topic.arrow"
+    schema = pa.schema([pa.field("x", pa.int64())])
+    with pa.OSFile(str(path), "wb") as sink, pa.RecordBatchFileWriter(sink, schema) as writer:
+        for start in range(0, 25, 10):  # batches of 10, 10, and 5 rows
+            writer.write_batch(
+                pa.record_batch([pa.array(range(start, min(start + 10, 25)))], schema)
+            )
+    return path
+
+
+def test_paginator_should_page_through_batches_in_order(arrow_file: pathlib.Path) -> None:
+    # GIVEN
+    paginator = pagination.Paginator()
+
+    # WHEN
+    pages = [paginator.first_page(arrow_file, 7, Encoding())]
+    while pages[-1].next_cursor is not None:
+        pages.append(paginator.page(pages[-1].next_cursor, 7, Encoding()))
+
+    # THEN
+    assert [len(page.data) for page in pages] == [7, 7, 7, 4]
+    assert [row["x"] for page in pages for row in page.data] == list(range(25))
+    assert all(page.total_row_count == 25 for page in pages)
+
+
+def test_cursor_should_be_rejected_outside_of_cache(
+    arrow_file: pathlib.Path, tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # GIVEN
+    cursor = pagination.Cursor(arrow_file=str(arrow_file)).encode()
+    monkeypatch.setattr(settings, "CACHE_DIRECTORY", str(tmp_path / "elsewhere"))
+
+    # WHEN / THEN
+    with pytest.raises(pagination.InvalidCursorError):
+        pagination.Cursor.decode(cursor)
+    with pytest.raises(pagination.InvalidCursorError):
+        pagination.Cursor.decode("not a cursor")
+
+
+def test_read_page_should_count_rows_only_on_first_page(
+    arrow_file: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # GIVEN
+    read_batches = []
+    get_batch = pa.ipc.RecordBatchFileReader.get_batch
+
+    def record_get_batch(reader: pa.ipc.RecordBatchFileReader, i: int) -> pa.RecordBatch:
+        read_batches.append(i)
+        return get_batch(reader, i)
+
+    monkeypatch.setattr(pa.ipc.RecordBatchFileReader, "get_batch", record_get_batch)
+    first_page = pagination.read_page(pagination.Cursor(arrow_file=str(arrow_file)), 7, Encoding())
+    read_batches.clear()
+
+    # WHEN
+    second_page = pagination.read_page(
+        pagination.Cursor.decode(first_page.next_cursor), 7, Encoding()
+    )
+
+    # THEN
+    assert read_batches == [0, 1]
+    assert second_page.total_row_count == 25
+
+
+@pytest.mark.parametrize("row_count", [0, -1])
+def test_paginator_should_reject_pages_without_rows(
+    arrow_file: pathlib.Path, row_count: int
+) -> None:
+    # WHEN / THEN
+    with pytest.raises(pagination.InvalidRowCountError):
+        pagination.Paginator().first_page(arrow_file, row_count, Encoding())
+    with pytest.raises(pagination.InvalidRowCountError):
+        pagination.read_page(pagination.Cursor(arrow_file=str(arrow_file)), row_count, Encoding())
+
+
+def test_paginator_should_cap_pages_at_maximum_row_count(
+    arrow_file: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # GIVEN
+    monkeypatch.setattr(settings, "MCP_MAX_PAGE_ROW_COUNT", 10)
+
+    # WHEN
+    page = pagination.Paginator().first_page(arrow_file, 1000, Encoding())
+
+    # THEN
+    assert len(page.data) == 10
+    assert page.next_cursor is not None
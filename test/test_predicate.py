@@ -0,0 +1,54 @@
+import pyarrow as pa
+import pytest
+
+from src import predicate
+
+
+@pytest.fixture
+def record_batch() -> pa.RecordBatch:
+    return pa.RecordBatch.from_pylist(
+        [
+            {"timestamp_seconds": 0.0, "/battery": {"percentage": 0.9}},
+            {"timestamp_seconds": 1.0, "/battery": {"percentage": 0.1}},
+            {"timestamp_seconds": 2.0, "/battery": None},
+            {"timestamp_seconds": 3.0, "/battery": {"percentage": 0.15}},
+        ]
+    )
+
+
+def test_apply_should_keep_matching_rows_in_order(record_batch: pa.RecordBatch) -> None:
+    # GIVEN
+    message_filter = predicate.MessageFilter('"/battery".percentage < 0.2')
+
+    # WHEN
+    filtered_batch = message_filter.apply(record_batch)
+
+    # THEN
+    assert filtered_batch.schema.equals(record_batch.schema)
+    assert filtered_batch.column("timestamp_seconds").to_pylist() == [1.0, 3.0]
+
+
+def test_apply_all_should_skip_empty_batches(record_batch: pa.RecordBatch) -> None:
+    # GIVEN
+    message_filter = predicate.MessageFilter("timestamp_seconds >= 3")
+
+    # WHEN
+    filtered_batches = list(message_filter.apply_all([record_batch, record_batch.slice(0, 2)]))
+
+    # THEN
+    assert [batch.num_rows for batch in filtered_batches] == [1]
+
+
+def test_should_raise_if_filter_is_not_a_single_expression() -> None:
+    # WHEN / THEN
+    with pytest.raises(predicate.InvalidFilterError):
+        predicate.MessageFilter("true) FROM batch; DROP TABLE batch; SELECT (true")
+
+
+def test_apply_should_raise_if_columns_are_not_found(record_batch: pa.RecordBatch) -> None:
+    # GIVEN
+    message_filter = predicate.MessageFilter('"/imu".z > 0')
+
+    # WHEN / THEN
+    with pytest.raises(predicate.InvalidFilterError):
+        message_filter.apply(record_batch)
@@ -0,0 +1,77 @@
+import pathlib
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pytest
+
+from settings import settings
+from src import profiling
+from src.command.run import operator
+from src.command.run.catalog import Catalog
+
+
+def test_should_profile_operators_through_their_base_class(tmp_path: pathlib.Path) -> None:
+    # GIVEN
+    arrow_file = tmp_path / "raw.arrow"
+    with pa.OSFile(str(arrow_file), "wb") as sink:
+        table = pa.table({"value": [1, 2, 3]})
+        with pa.RecordBatchFileWriter(sink, table.schema) as writer:
+            writer.write_table(table)
+
+    extract = operator.ExtractTopic(name="raw", topics=["/imu"], ffill=False)
+    transform = operator.TransformDataFrame.from_dict(
+        {"name": "large", "sql": "SELECT value FROM raw WHERE value > 1"}
+    )
+
+    def extract_task(catalog: Catalog) -> None:
+        dataset = profiling.record_read(ds.dataset(arrow_file, format="arrow"), cache_hit=True)
+        catalog.register("raw", dataset)
+
+    profiler = profiling.Profiler()
+
+    # WHEN
+    with Catalog() as catalog:
+        extract.profiled(extract_task, profiler)(catalog)
+        transform.profiled(transform.register, profiler)(catalog)
+
+    # THEN
+    raw, large = profiler.profiles
+    assert (raw.rows_in, raw.rows_out, raw.cache_hits, raw.cache_misses) == (3, 3, 1, 0)
+    assert raw.bytes_out == arrow_file.stat().st_size
+    assert (large.inputs, large.rows_in, large.rows_out) == (["raw"], 3, 2)
+    assert "TABLE_SCAN" in large.explain_analyze
+    assert large.wall_seconds >= 0
+    assert large.process_cpu_seconds >= 0
+    assert large.process_peak_rss_bytes > 0
+
+
+@pytest.mark.parametrize(("max_arrow_bytes", "in_memory"), [(1 << 20, True), (0, False)])
+def test_should_not_run_materialized_transforms_again(
+    max_arrow_bytes: int, in_memory: bool, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # GIVEN
+    monkeypatch.setattr(settings, "MATERIALIZE_MAX_ARROW_BYTES", max_arrow_bytes)
+    transform = operator.TransformDataFrame.from_dict(
+        {"name": "shared", "sql": "SELECT * FROM range(2) AS t(value)", "materialize": True}
+    )
+    profiler = profiling.Profiler()
+
+    # WHEN
+    with Catalog() as catalog:
+        transform.profiled(lambda catalog: transform.register(catalog, materialize=True), profiler)(
+            catalog
+        )
+
+    # THEN
+    (shared,) = profiler.profiles
+    assert shared.rows_out == 2
+    assert (shared.bytes_out is not None) == in_memory
+    assert shared.explain_analyze is None
+
+
+def test_should_not_record_reads_outside_of_operators(tmp_path: pathlib.Path) -> None:
+    # GIVEN
+    dataset = ds.dataset(pa.table({"value": [1]}))
+
+    # WHEN / THEN
+    assert profiling.record_read(dataset, cache_hit=False) is dataset
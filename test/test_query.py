@@ -0,0 +1,70 @@
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pydantic_core
+import pytest
+
+from src import query
+
+
+@pytest.fixture
+def messages() -> ds.Dataset:
+    return ds.dataset(pa.table({"timestamp_seconds": [0.0, 1.0, 2.0], "z": [9.8, 12.5, 9.6]}))
+
+
+def test_query_should_return_only_the_result(messages: ds.Dataset) -> None:
+    # GIVEN
+    session = query.QuerySession()
+
+    # WHEN
+    result = session.query(messages, "SELECT MAX(z) AS max_z FROM messages", 10, 10.0)
+
+    # THEN
+    assert result.columns == ["max_z"]
+    assert result.rows == [{"max_z": 12.5}]
+    assert not result.truncated
+
+
+def test_query_should_return_binary_values_as_base64(messages: ds.Dataset) -> None:
+    # GIVEN
+    session = query.QuerySession()
+
+    # WHEN
+    result = session.query(messages, "SELECT '\\xFF\\xD8'::BLOB AS data", 10, 10.0)
+
+    # THEN
+    assert result.rows == [{"data": "/9g="}]
+    assert pydantic_core.to_json(result)
+
+
+def test_query_should_truncate_rows_beyond_limit(messages: ds.Dataset) -> None:
+    # GIVEN
+    session = query.QuerySession()
+
+    # WHEN
+    result = session.query(messages, "SELECT * FROM messages", 2, 10.0)
+
+    # THEN
+    assert len(result.rows) == 2
+    assert result.truncated
+
+
+def test_query_should_keep_tables_across_queries_of_a_session(messages: ds.Dataset) -> None:
+    # GIVEN
+    session = query.QuerySession()
+
+    # WHEN
+    session.query(messages, "CREATE TABLE peaks AS SELECT * FROM messages WHERE z > 10", 10, 10.0)
+    result = session.query(messages, "SELECT COUNT(*) AS n FROM peaks", 10, 10.0)
+
+    # THEN
+    assert result.rows == [{"n": 1}]
+
+
+def test_query_should_not_access_files(messages: ds.Dataset) -> None:
+    with pytest.raises(Exception, match="disabled by configuration"):
+        query.QuerySession().query(messages, "SELECT * FROM read_csv('/etc/hosts')", 10, 10.0)
+
+
+def test_query_should_be_interrupted_after_timeout(messages: ds.Dataset) -> None:
+    with pytest.raises(query.QueryTimeoutError):
+        query.QuerySession().query(messages, "SELECT COUNT(*) FROM range(1e12::BIGINT)", 10, 0.1)
@@ -0,0 +1,51 @@
+import pathlib
+
+import pytest
+
+from src import robolog
+
+
+@pytest.fixture
+def fleet_directory(tmp_path: pathlib.Path) -> pathlib.Path:
+    (tmp_path / "day1").mkdir()
+    (tmp_path / "day1" / "a.bag").write_bytes(b"")
+    (tmp_path / "day1" / "notes.txt").write_text("")
+    (tmp_path / "day2" / "b").mkdir(parents=True)
+    (tmp_path / "day2" / "b" / "metadata.yaml").write_text("")
+    (tmp_path / "day2" / "b" / "b_0.db3").write_bytes(b"")
+    (tmp_path / "c.mcap").write_bytes(b"")
+    return tmp_path
+
+
+def test_should_find_robologs_in_directories(fleet_directory: pathlib.Path) -> None:
+    # WHEN
+    robologs = robolog.find_robologs([fleet_directory])
+
+    # THEN
+    assert robologs == [
+        fleet_directory / "c.mcap",
+        fleet_directory / "day1" / "a.bag",
+        fleet_directory / "day2" / "b",
+    ]
+
+
+def test_should_find_robologs_from_globs_and_manifests(fleet_directory: pathlib.Path) -> None:
+    # GIVEN
+    manifest = fleet_directory / "manifest.txt"
+    manifest.write_text("# robologs of day 2\nday2/b\n\nc.mcap\n")
+
+    # WHEN
+    robologs = robolog.find_robologs([str(fleet_directory / "day*" / "*.bag"), manifest])
+
+    # THEN
+    assert robologs == [
+        fleet_directory / "c.mcap",
+        fleet_directory / "day1" / "a.bag",
+        fleet_directory / "day2" / "b",
+    ]
+
+
+def test_should_raise_when_nothing_matches(tmp_path: pathlib.Path) -> None:
+    # WHEN / THEN
+    with pytest.raises(FileNotFoundError):
+        robolog.find_robologs([str(tmp_path / "*.bag")])
@@ -0,0 +1,87 @@
+import pathlib
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pytest
+
+from settings import settings
+from src import robolog, search
+from src.reader import factory
+
+
+class FakeLoggingMessageReader:
+    def __init__(self, messages: list[tuple[float, str, str, str]]) -> None:
+        self.messages = messages
+        self.reads = 0
+
+    def read(self) -> ds.Dataset:
+        self.reads += 1
+        timestamps, levels, names, messages = zip(*self.messages, strict=True)
+        return ds.dataset(
+            pa.table(
+                {
+                    settings.TIMESTAMP_SECONDS_COLUMN_NAME: timestamps,
+                    "level": levels,
+                    "name": names,
+                    "message": messages,
+                }
+            )
+        )
+
+
+@pytest.fixture
+def readers(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> dict:
+    readers = {
+        "flight_a.ulg": FakeLoggingMessageReader(
+            [(1.0, "INFO", "ekf2", "EKF2 IMU stopped"), (2.5, "WARN", "nav", "Low battery")]
+        ),
+        "flight_b.ulg": FakeLoggingMessageReader([(3.25, "ERROR", "ekf2", "EKF2 IMU stopped")]),
+    }
+    monkeypatch.setattr(settings, "LOG_SEARCH_INDEX_FILE", str(tmp_path / "logs.sqlite3"))
+    monkeypatch.setattr(robolog, "generate_id", lambda path: pathlib.Path(path).stem)
+    monkeypatch.setattr(
+        factory, "make_logging_message_reader", lambda path: readers[pathlib.Path(path).name]
+    )
+    return readers
+
+
+def test_should_index_robologs_once(readers: dict) -> None:
+    # WHEN
+    added = [search.index_robolog("flight_a.ulg"), search.index_robolog("flight_a.ulg")]
+
+    # THEN
+    assert added == [("flight_a", 2), ("flight_a", 0)]
+    assert readers["flight_a.ulg"].reads == 1
+
+
+def test_should_search_selected_or_all_robologs(readers: dict) -> None:
+    # WHEN
+    hits = search.search_logs('"IMU stopped"', ["flight_a.ulg"])
+
+    # THEN
+    assert len(hits) == 1
+    assert hits[0]["timestamp_milliseconds"] == 1000
+    assert hits[0]["name"] == "ekf2"
+
+    # WHEN
+    search.index_robolog("flight_b.ulg")
+    hits = search.search_logs("ekf2")
+
+    # THEN
+    assert sorted(hit["timestamp_milliseconds"] for hit in hits) == [1000, 3250]
+
+
+def test_should_hash_each_searched_robolog_once(
+    readers: dict, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # GIVEN
+    hashed = []
+    monkeypatch.setattr(
+        robolog, "generate_id", lambda path: hashed.append(path) or pathlib.Path(path).stem
+    )
+
+    # WHEN
+    search.search_logs("ekf2", ["flight_a.ulg", "flight_b.ulg"])
+
+    # THEN
+    assert hashed == ["flight_a.ulg", "flight_b.ulg"]